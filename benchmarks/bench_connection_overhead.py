@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Compare the connection overhead of the stdio, streamable HTTP and SSE transports.
+
+For each transport, opens --sessions client sessions one after another. Each
+session connects, initializes, makes --calls validate_script calls and
+closes. Over stdio every session starts a new server process, as an agent
+would. Over HTTP all sessions connect to one long-running server started
+once beforehand. Prints the median and p95 of:
+
+- connect + initialize,
+- the first call,
+- later (warm) calls,
+- the whole session.
+
+Usage:
+    python benchmarks/bench_connection_overhead.py --sessions 20 --calls 10
+    python benchmarks/bench_connection_overhead.py --transports stdio http --output overhead.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcp import ClientSession  # noqa: E402
+from mcp.client.sse import sse_client  # noqa: E402
+from mcp.client.stdio import StdioServerParameters, stdio_client  # noqa: E402
+from mcp.client.streamable_http import streamablehttp_client  # noqa: E402
+
+from benchmarks.bench_tools import CORPUS_DIR, git_commit  # noqa: E402
+from src.render_stats import percentile  # noqa: E402
+
+
+async def run_sessions(
+    open_transport: Callable[[AsyncExitStack], Any], sessions: int, calls: int, code: str
+) -> Dict[str, List[float]]:
+    """Open ``sessions`` sessions in turn and time their phases."""
+    timings: Dict[str, List[float]] = {"connect": [], "first_call": [], "warm_call": [], "session": []}
+    for _ in range(sessions):
+        started = time.perf_counter()
+        async with AsyncExitStack() as stack:
+            read, write = await open_transport(stack)
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+            connected = time.perf_counter()
+            timings["connect"].append(connected - started)
+            for index in range(calls):
+                call_started = time.perf_counter()
+                result = await session.call_tool("validate_script", {"code": code})
+                if result.content[0].text.startswith("❌"):
+                    raise RuntimeError(result.content[0].text)
+                key = "first_call" if index == 0 else "warm_call"
+                timings[key].append(time.perf_counter() - call_started)
+        timings["session"].append(time.perf_counter() - started)
+    return timings
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_until_healthy(url: str, process: subprocess.Popen, timeout: float = 30) -> float:
+    """Wait for the HTTP server to answer and return its start-up time."""
+    started = time.perf_counter()
+    async with httpx.AsyncClient() as client:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"HTTP server exited with status {process.returncode}")
+            try:
+                if (await client.get(url)).status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.05)
+    raise RuntimeError(f"HTTP server did not answer {url} within {timeout}s")
+
+
+def summarize(timings: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        phase: {
+            "count": len(values),
+            "p50_ms": 1000 * percentile(values, 0.5),
+            "p95_ms": 1000 * percentile(values, 0.95),
+        }
+        for phase, values in timings.items() if values
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transports", nargs="+", choices=["stdio", "http", "sse"],
+                        default=["stdio", "http", "sse"])
+    parser.add_argument("--sessions", type=int, default=10, help="sessions per transport (default: 10)")
+    parser.add_argument("--calls", type=int, default=5, help="validate_script calls per session (default: 5)")
+    parser.add_argument("--output", type=Path, default=None, help="write the results as JSON")
+    args = parser.parse_args()
+
+    code = (CORPUS_DIR / "shapes.py").read_text(encoding="utf-8")
+    results: Dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory(prefix="manim_overhead_") as tmp:
+        env = {**os.environ, "MANIM_MEDIA_DIR": str(Path(tmp) / "media")}
+
+        if "stdio" in args.transports:
+            params = StdioServerParameters(command=sys.executable, args=["-m", "src"], env=env, cwd=str(ROOT))
+
+            async def open_stdio(stack: AsyncExitStack) -> Any:
+                errlog = stack.enter_context(open(os.devnull, "w"))
+                return await stack.enter_async_context(stdio_client(params, errlog=errlog))
+
+            print(f"stdio: {args.sessions} sessions, one server process each")
+            results["stdio"] = summarize(await run_sessions(open_stdio, args.sessions, args.calls, code))
+
+        http_transports = [t for t in args.transports if t != "stdio"]
+        if http_transports:
+            port = free_port()
+            process = subprocess.Popen(
+                [sys.executable, "-m", "src"],
+                cwd=ROOT,
+                env={**env, "MANIM_MCP_TRANSPORT": "http", "MANIM_MCP_PORT": str(port)},
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                startup = await wait_until_healthy(f"http://127.0.0.1:{port}/healthz", process)
+                print(f"HTTP server started in {startup * 1000:.0f} ms")
+
+                async def open_http(stack: AsyncExitStack) -> Any:
+                    read, write, _ = await stack.enter_async_context(
+                        streamablehttp_client(f"http://127.0.0.1:{port}/mcp")
+                    )
+                    return read, write
+
+                async def open_sse(stack: AsyncExitStack) -> Any:
+                    return await stack.enter_async_context(sse_client(f"http://127.0.0.1:{port}/sse"))
+
+                for transport in http_transports:
+                    print(f"{transport}: {args.sessions} sessions on one server process")
+                    opener = open_http if transport == "http" else open_sse
+                    results[transport] = summarize(await run_sessions(opener, args.sessions, args.calls, code))
+                    results[transport]["server_startup_ms"] = startup * 1000
+            finally:
+                process.terminate()
+                process.wait()
+
+    print(f"\n{'transport':<10} {'phase':<12} {'p50':>10} {'p95':>10}")
+    for transport, phases in results.items():
+        for phase in ("connect", "first_call", "warm_call", "session"):
+            if phase in phases:
+                values = phases[phase]
+                print(f"{transport:<10} {phase:<12} {values['p50_ms']:>8.1f}ms {values['p95_ms']:>8.1f}ms")
+
+    if args.output:
+        report = {
+            "benchmark": "connection_overhead",
+            "meta": {"commit": git_commit()[0], "sessions": args.sessions, "calls": args.calls},
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
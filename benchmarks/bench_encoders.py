@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measure encode time and output size for each encoder profile.
+
+Re-encodes one rendered video (e.g. a Manim MP4) with every encoder profile,
+or the ones given with --profiles, and prints the encode time, output size and
+size relative to the source. Use it to pick a profile that trades CPU for
+bandwidth acceptably for a given client.
+
+Usage:
+    python benchmarks/bench_encoders.py media/videos/scene/1080p60/Demo.mp4
+    python benchmarks/bench_encoders.py Demo.mp4 --profiles h264_fast h264_small vp9 --repeat 3
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.encoding import ENCODER_PROFILES, encode_video, output_path_for  # noqa: E402
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("video", type=Path)
+    parser.add_argument("--profiles", nargs="+", choices=list(ENCODER_PROFILES),
+                        default=list(ENCODER_PROFILES))
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="encodes per profile; the median time is reported")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="ffmpeg -threads value (default: ffmpeg decides)")
+    parser.add_argument("--ffmpeg", default=os.getenv("FFMPEG_EXECUTABLE", "ffmpeg"))
+    args = parser.parse_args()
+
+    source = args.video.resolve()
+    source_bytes = source.stat().st_size
+    print(f"source: {source} ({source_bytes / 1024:.1f} KB)\n")
+    print(f"{'profile':<15} {'format':<6} {'encode':>9} {'size':>12} {'vs source':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.profiles:
+            profile = ENCODER_PROFILES[name]
+            output = Path(tmp) / output_path_for(source, profile).relative_to(source.parent)
+            try:
+                results = [
+                    await encode_video(
+                        source, profile, args.ffmpeg, output=output, threads=args.threads
+                    )
+                    for _ in range(args.repeat)
+                ]
+            except (OSError, RuntimeError) as e:
+                print(f"{name:<15} {profile.output_format:<6} failed: {str(e).splitlines()[0]}")
+                continue
+            seconds = statistics.median(result.seconds for result in results)
+            size = results[-1].bytes
+            print(
+                f"{name:<15} {profile.output_format:<6} {seconds:>8.2f}s "
+                f"{size / 1024:>9.1f} KB {size / source_bytes:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compare single-process and sharded rendering of one long scene.
+
+Renders the scene once through the regular single-process path and once split
+into animation-range shards, and prints the wall-clock time of each. The
+render cache is bypassed so both runs do the full work.
+
+Usage:
+    python benchmarks/bench_sharded_render.py path/to/long_scene.py LongScene --shards 4
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import server  # noqa: E402
+
+
+async def timed_render(arguments: dict) -> float:
+    started = time.perf_counter()
+    result = await server._handle_render_animation(arguments)
+    elapsed = time.perf_counter() - started
+    print(result[0].text.splitlines()[0])
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("script", type=Path)
+    parser.add_argument("scene")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--quality", default="high",
+                        choices=["low", "medium", "high", "production"])
+    args = parser.parse_args()
+
+    base = {
+        "script_path": str(args.script.resolve()),
+        "scenes": [args.scene],
+        "quality": args.quality,
+        "preview": False,
+        "use_cache": False,
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        single = await timed_render({**base, "output_dir": f"{tmp}/single"})
+        sharded = await timed_render(
+            {**base, "output_dir": f"{tmp}/sharded", "shards": args.shards}
+        )
+
+    print(f"single process : {single:.2f}s")
+    print(f"{args.shards} shards       : {sharded:.2f}s  (speed-up x{single / sharded:.2f})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Load-test the stdio MCP server with many requests in flight.
+
+Starts the server (``python -m src``) as a subprocess, connects to it over
+stdio with the MCP client, creates a pool of scripts from benchmarks/corpus
+and then fires a weighted mix of tool calls at it, either closed-loop at a
+fixed --concurrency or open-loop at a fixed --rate. Open-loop latencies are
+measured from each request's scheduled send time, so a stalled server is not
+hidden by the generator slowing down with it.
+
+Reported per tool and overall: calls, error rate and p50/p95/p99/max latency.
+Event-loop lag is estimated by pinging the server every --probe-interval
+seconds during the run and subtracting the median round trip of the idle
+server; the generator's own loop lag is shown too, to confirm it was not the
+bottleneck. Renders use benchmarks/stub_manim.py unless --manim is given, so
+the test runs fully offline, against a temporary media directory.
+
+Usage:
+    python benchmarks/bench_stdio_load.py --concurrency 32 --duration 30
+    python benchmarks/bench_stdio_load.py --rate 200 --duration 20 --mix validate_script=8,find_videos=2
+    python benchmarks/bench_stdio_load.py --concurrency 8 --stub-sleep 0.5 --output load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import re
+import shlex
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from mcp import ClientSession  # noqa: E402
+from mcp.client.stdio import StdioServerParameters, stdio_client  # noqa: E402
+
+from benchmarks.bench_tools import CORPUS_DIR, STUB_SCRIPT, git_commit  # noqa: E402
+from src.render_stats import percentile  # noqa: E402
+
+MIX_TOOLS = (
+    "create_script",
+    "validate_script",
+    "render_animation",
+    "find_videos",
+    "get_workspace_info",
+    "get_render_stats",
+)
+DEFAULT_MIX = "validate_script=4,create_script=1,render_animation=2,find_videos=2,get_workspace_info=1"
+
+
+class Scripts:
+    """Scripts created on the server, which the generated calls refer to."""
+
+    def __init__(self, corpus: List[Tuple[str, str]]):
+        self.corpus = corpus
+        self.handles: List[Tuple[str, str]] = []  # (script id, workspace)
+
+    def code(self) -> Tuple[str, str]:
+        return random.choice(self.corpus)
+
+    def pick(self) -> Tuple[str, str]:
+        return random.choice(self.handles)
+
+
+def make_arguments(tool: str, scripts: Scripts, args: argparse.Namespace) -> Dict[str, Any]:
+    """Return the arguments of one generated call to ``tool``."""
+    if tool == "create_script":
+        name, code = scripts.code()
+        return {"code": code, "script_name": name}
+    if tool == "validate_script":
+        return {"code": scripts.code()[1]}
+    if tool == "render_animation":
+        script_id, _ = scripts.pick()
+        return {"script_id": script_id, "quality": args.quality, "preview": False, "use_cache": args.cache}
+    if tool == "find_videos":
+        script_id, workspace = scripts.pick()
+        return {"search_dir": workspace, "script_id": script_id}
+    if tool == "get_workspace_info":
+        return {"workspace_path": scripts.pick()[1]}
+    return {}
+
+
+def parse_mix(mix: str) -> Tuple[List[str], List[float]]:
+    tools, weights = [], []
+    for item in mix.split(","):
+        tool, _, weight = item.partition("=")
+        tools.append(tool.strip())
+        weights.append(float(weight or 1))
+    return tools, weights
+
+
+def parse_created(text: str) -> Optional[Tuple[str, str]]:
+    script_id = re.search(r"Script id: (\S+)", text)
+    workspace = re.search(r"Directory: (.+)", text)
+    return (script_id.group(1), workspace.group(1).strip()) if script_id and workspace else None
+
+
+class Recorder:
+    """Latencies and errors of the generated calls, per tool."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+
+    def add(self, tool: str, latency: float, error: Optional[str]) -> None:
+        self.latencies.setdefault(tool, []).append(latency)
+        if error is not None:
+            kinds = self.errors.setdefault(tool, {})
+            kinds[error] = kinds.get(error, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        everything = [latency for values in self.latencies.values() for latency in values]
+        rows = {tool: (values, self.errors.get(tool, {})) for tool, values in sorted(self.latencies.items())}
+        all_errors: Dict[str, int] = {}
+        for kinds in self.errors.values():
+            for kind, n in kinds.items():
+                all_errors[kind] = all_errors.get(kind, 0) + n
+        rows["all"] = (everything, all_errors)
+        return {tool: _latency_summary(values, errors) for tool, (values, errors) in rows.items() if values}
+
+
+def _latency_summary(values: List[float], errors: Dict[str, int]) -> Dict[str, Any]:
+    failed = sum(errors.values())
+    return {
+        "calls": len(values),
+        "errors": failed,
+        "error_rate": failed / len(values),
+        "error_kinds": errors,
+        "p50_ms": 1000 * percentile(values, 0.5),
+        "p95_ms": 1000 * percentile(values, 0.95),
+        "p99_ms": 1000 * percentile(values, 0.99),
+        "max_ms": 1000 * max(values),
+    }
+
+
+async def call_tool(
+    session: ClientSession, tool: str, arguments: Dict[str, Any], timeout: float
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Call a tool and classify the outcome.
+
+    Returns:
+        The error kind (None on success) and the text of the result
+    """
+    try:
+        result = await asyncio.wait_for(session.call_tool(tool, arguments), timeout)
+    except asyncio.TimeoutError:
+        return "timeout", None
+    except Exception as e:
+        return type(e).__name__, None
+    text = "".join(item.text for item in result.content if getattr(item, "text", None))
+    if result.isError or text.startswith("❌"):
+        return "tool error", text
+    return None, text
+
+
+async def run_load(
+    session: ClientSession,
+    scripts: Scripts,
+    recorder: Recorder,
+    args: argparse.Namespace,
+) -> float:
+    """Generate calls until the duration or request budget runs out; return the elapsed time."""
+    tools, weights = parse_mix(args.mix)
+    deadline = time.perf_counter() + args.duration
+    budget = args.requests
+
+    def next_call() -> Optional[Tuple[str, Dict[str, Any]]]:
+        nonlocal budget
+        if time.perf_counter() >= deadline or budget == 0:
+            return None
+        if budget is not None:
+            budget -= 1
+        tool = random.choices(tools, weights)[0]
+        return tool, make_arguments(tool, scripts, args)
+
+    async def issue(tool: str, arguments: Dict[str, Any], scheduled: float) -> None:
+        error, text = await call_tool(session, tool, arguments, args.timeout)
+        recorder.add(tool, time.perf_counter() - scheduled, error)
+        if tool == "create_script" and text:
+            handle = parse_created(text)
+            if handle:
+                scripts.handles.append(handle)
+
+    started = time.perf_counter()
+    if args.rate:
+        # Open loop: send on schedule however long earlier calls take
+        in_flight = set()
+        interval = 1 / args.rate
+        scheduled = started
+        while (call := next_call()) is not None:
+            scheduled += random.expovariate(args.rate) if args.poisson else interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(issue(*call, scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        await asyncio.gather(*in_flight)
+    else:
+        # Closed loop: each worker sends its next call when the previous one returns
+        async def worker() -> None:
+            while (call := next_call()) is not None:
+                await issue(*call, time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    return time.perf_counter() - started
+
+
+async def probe(
+    measure: Callable[[], "asyncio.Future[Any]"], interval: float, samples: List[float], stop: asyncio.Event
+) -> None:
+    """Time ``measure()`` every ``interval`` seconds until ``stop`` is set."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            await measure()
+        except Exception:
+            pass
+        samples.append(time.perf_counter() - started)
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+def lag_summary(samples: List[float], baseline: float = 0.0) -> Dict[str, float]:
+    lags = [max(0.0, sample - baseline) for sample in samples] or [0.0]
+    return {
+        "samples": len(samples),
+        "p50_ms": 1000 * percentile(lags, 0.5),
+        "p95_ms": 1000 * percentile(lags, 0.95),
+        "p99_ms": 1000 * percentile(lags, 0.99),
+        "max_ms": 1000 * max(lags),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    load = parser.add_mutually_exclusive_group()
+    load.add_argument("--concurrency", type=int, default=16,
+                      help="closed loop: calls kept in flight (default: 16)")
+    load.add_argument("--rate", type=float, default=None,
+                      help="open loop: calls started per second")
+    parser.add_argument("--poisson", action="store_true",
+                        help="with --rate: exponential inter-arrival times instead of a fixed interval")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load (default: 10)")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many calls")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"weighted tool mix as tool=weight,... (default: {DEFAULT_MIX})")
+    parser.add_argument("--scripts", type=int, default=8, help="scripts created before the load starts")
+    parser.add_argument("--quality", default="low", choices=["low", "medium", "high", "production"])
+    parser.add_argument("--cache", action="store_true", help="let renders be served from the render cache")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds before a call counts as failed")
+    parser.add_argument("--probe-interval", type=float, default=0.05,
+                        help="seconds between event-loop lag probes (default: 0.05)")
+    parser.add_argument("--manim", default=None, help="real manim executable (default: the stub)")
+    parser.add_argument("--stub-sleep", type=float, default=0.0, help="stub: seconds each scene takes")
+    parser.add_argument("--stub-log-lines", type=int, default=0, help="stub: stdout lines per animation")
+    parser.add_argument("--server-env", action="append", default=[], metavar="NAME=VALUE",
+                        help="extra server environment, e.g. MANIM_RENDER_CONCURRENCY=4")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=Path, default=None, help="write the results as JSON")
+    args = parser.parse_args()
+    random.seed(args.seed)
+    unsupported = set(parse_mix(args.mix)[0]) - set(MIX_TOOLS)
+    if unsupported:
+        parser.error(f"unsupported tools in --mix: {', '.join(sorted(unsupported))} (choose from {', '.join(MIX_TOOLS)})")
+
+    corpus = [(path.stem, path.read_text(encoding="utf-8")) for path in sorted(CORPUS_DIR.glob("*.py"))]
+    scripts = Scripts(corpus)
+    recorder = Recorder()
+
+    with tempfile.TemporaryDirectory(prefix="manim_load_") as tmp:
+        work_dir = Path(tmp)
+        manim = args.manim
+        if manim is None:
+            stub = work_dir / "manim"
+            stub.write_text(f'#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(str(STUB_SCRIPT))} "$@"\n')
+            stub.chmod(0o755)
+            manim = str(stub)
+        env = {
+            **os.environ,
+            "MANIM_EXECUTABLE": manim,
+            "MANIM_MEDIA_DIR": str(work_dir / "media"),
+            "STUB_MANIM_SLEEP": str(args.stub_sleep),
+            "STUB_MANIM_LOG_LINES": str(args.stub_log_lines),
+            **dict(item.split("=", 1) for item in args.server_env),
+        }
+        if not args.cache:
+            env.setdefault("MANIM_RENDER_CACHE_MAX_MB", "0")
+            env.setdefault("MANIM_PARTIAL_CACHE_MAX_MB", "0")
+        params = StdioServerParameters(command=sys.executable, args=["-m", "src"], env=env, cwd=str(ROOT))
+        server_log = work_dir / "server.log"
+
+        async with AsyncExitStack() as stack:
+            errlog = stack.enter_context(open(server_log, "w"))
+            read, write = await stack.enter_async_context(stdio_client(params, errlog=errlog))
+            session = await stack.enter_async_context(
+                ClientSession(read, write, read_timeout_seconds=timedelta(seconds=args.timeout))
+            )
+            init_started = time.perf_counter()
+            await session.initialize()
+            print(f"server initialized in {1000 * (time.perf_counter() - init_started):.0f} ms")
+
+            for _ in range(args.scripts):
+                name, code = scripts.code()
+                error, text = await call_tool(session, "create_script", {"code": code, "script_name": name}, args.timeout)
+                handle = parse_created(text or "")
+                if handle is None:
+                    sys.exit(f"create_script failed ({error}): {text}\n{server_log.read_text()[-2000:]}")
+                scripts.handles.append(handle)
+
+            # Round trip of the idle server, subtracted from the probes under load
+            idle: List[float] = []
+            for _ in range(20):
+                started = time.perf_counter()
+                await session.send_ping()
+                idle.append(time.perf_counter() - started)
+            baseline = percentile(idle, 0.5)
+
+            stop = asyncio.Event()
+            server_probes: List[float] = []
+            client_probes: List[float] = []
+            interval = args.probe_interval
+            probes = [
+                asyncio.create_task(probe(session.send_ping, interval, server_probes, stop)),
+                asyncio.create_task(probe(lambda: asyncio.sleep(0), interval, client_probes, stop)),
+            ]
+            mode = f"{args.rate:g} calls/s" if args.rate else f"concurrency {args.concurrency}"
+            print(f"load: {mode} for {args.duration:g}s, mix {args.mix}")
+            elapsed = await run_load(session, scripts, recorder, args)
+            stop.set()
+            await asyncio.gather(*probes)
+
+    results = recorder.summary()
+    total = results.get("all", {}).get("calls", 0)
+    report = {
+        "benchmark": "stdio_load",
+        "meta": {
+            "commit": git_commit()[0],
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": "open" if args.rate else "closed",
+            "rate": args.rate,
+            "concurrency": None if args.rate else args.concurrency,
+            "duration": args.duration,
+            "mix": args.mix,
+            "manim": "stub" if args.manim is None else args.manim,
+            "server_env": args.server_env,
+        },
+        "throughput_per_s": total / elapsed if elapsed else 0.0,
+        "results": results,
+        "event_loop_lag": {
+            "idle_ping_ms": 1000 * baseline,
+            "server": lag_summary(server_probes, baseline),
+            "client": lag_summary(client_probes),
+        },
+    }
+
+    print(f"\n{total} calls in {elapsed:.1f}s ({report['throughput_per_s']:.1f} calls/s)\n")
+    print(f"{'tool':<20} {'calls':>7} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for tool, r in results.items():
+        print(
+            f"{tool:<20} {r['calls']:>7} {r['error_rate']:>6.1%} {r['p50_ms']:>7.1f}ms "
+            f"{r['p95_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms {r['max_ms']:>7.1f}ms"
+        )
+        if r["error_kinds"]:
+            print(f"{'':<20} " + ", ".join(f"{kind}: {n}" for kind, n in r["error_kinds"].items()))
+    lag = report["event_loop_lag"]
+    print(f"\nevent-loop lag (idle ping {lag['idle_ping_ms']:.2f} ms subtracted):")
+    for side in ("server", "client"):
+        s = lag[side]
+        print(
+            f"  {side:<7} p50 {s['p50_ms']:.1f} ms, p95 {s['p95_ms']:.1f} ms, "
+            f"p99 {s['p99_ms']:.1f} ms, max {s['max_ms']:.1f} ms ({s['samples']} samples)"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"\nresults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
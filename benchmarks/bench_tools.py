@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency and throughput of the MCP tools.
+
+Drives create_script, validate_script, render_animation, find_videos,
+get_workspace_info and cleanup_files through the server's tool dispatcher for
+the scripts in benchmarks/corpus: first one call at a time (latency
+percentiles), then --concurrency calls at a time (throughput). Results are
+written as JSON, tagged with the git commit, so runs can be compared across
+commits with --compare.
+
+Two tiers are available:
+
+- stub (default): MANIM_EXECUTABLE is benchmarks/stub_manim.py, which writes
+  synthetic videos instead of rendering. --stub-sleep, --stub-output-kb and
+  --stub-log-lines set the cost of each render, so the numbers measure the
+  server rather than Manim.
+- real: renders the corpus with the installed Manim (scenes needing LaTeX
+  can be left out with --corpus).
+
+The server runs against a temporary media directory with the render and
+partial caches disabled (unless --cache is given), so nothing is written to
+the real workspace.
+
+Usage:
+    python benchmarks/bench_tools.py --iterations 50 --concurrency 8
+    python benchmarks/bench_tools.py --stub-sleep 0.5 --stub-log-lines 200
+    python benchmarks/bench_tools.py --tier real --iterations 5 --corpus shapes text graph
+    python benchmarks/bench_tools.py --compare benchmarks/results/tools-stub-1a2b3c4.json
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import platform
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.render_stats import percentile  # noqa: E402
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+STUB_SCRIPT = Path(__file__).resolve().parent / "stub_manim.py"
+TOOLS = (
+    "create_script",
+    "validate_script",
+    "render_animation",
+    "find_videos",
+    "get_workspace_info",
+    "cleanup_files",
+)
+
+
+async def run_phase(
+    server: Any, tool: str, calls: List[Dict[str, Any]], concurrency: int
+) -> Tuple[List[float], int, float, List[str]]:
+    """
+    Call ``tool`` once per argument dict, at most ``concurrency`` at a time.
+
+    Returns:
+        Per-call latencies, the number of failed calls, the wall time of the
+        whole phase and the text of each result (in call order)
+    """
+    slots = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    texts: List[str] = [""] * len(calls)
+    errors = 0
+
+    async def call(index: int, arguments: Dict[str, Any]) -> None:
+        nonlocal errors
+        async with slots:
+            started = time.perf_counter()
+            result = await server.handle_call_tool(tool, arguments)
+            latencies.append(time.perf_counter() - started)
+        texts[index] = result[0].text
+        if texts[index].startswith("❌"):
+            errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i, arguments) for i, arguments in enumerate(calls)))
+    return latencies, errors, time.perf_counter() - started, texts
+
+
+async def run_workflow(
+    server: Any, corpus: List[Tuple[str, str]], count: int, concurrency: int, args: argparse.Namespace
+) -> Dict[str, Tuple[List[float], int, float]]:
+    """Create, validate, render, find, inspect and clean up ``count`` scripts."""
+    scripts = [corpus[i % len(corpus)] for i in range(count)]
+    phases = {}
+
+    async def record(tool: str, calls: List[Dict[str, Any]]) -> List[str]:
+        latencies, errors, wall, texts = await run_phase(server, tool, calls, concurrency)
+        phases[tool] = (latencies, errors, wall)
+        return texts
+
+    created = await record("create_script", [{"code": code, "script_name": name} for name, code in scripts])
+    handles = [
+        (re.search(r"Script id: (\S+)", text), re.search(r"Directory: (.+)", text)) for text in created
+    ]
+    if not all(script_id and workspace for script_id, workspace in handles):
+        raise RuntimeError("create_script failed:\n" + next(t for t in created if t.startswith("❌")))
+    ids = [script_id.group(1) for script_id, _ in handles]
+    workspaces = [workspace.group(1).strip() for _, workspace in handles]
+
+    await record("validate_script", [{"code": code} for _, code in scripts])
+    rendered = await record("render_animation", [
+        {"script_id": script_id, "quality": args.quality, "preview": False, "use_cache": args.cache}
+        for script_id in ids
+    ])
+    failed = [text for text in rendered if text.startswith("❌")]
+    if failed:
+        print(f"  {len(failed)} render(s) failed, e.g.: {failed[0].splitlines()[0][:200]}")
+    await record("find_videos", [{"search_dir": workspace} for workspace in workspaces])
+    await record("get_workspace_info", [{"workspace_path": workspace} for workspace in workspaces])
+    await record("cleanup_files", [{"target_path": workspace, "recursive": True} for workspace in workspaces])
+    return phases
+
+
+def summarize(
+    sequential: Dict[str, Tuple[List[float], int, float]],
+    concurrent: Dict[str, Tuple[List[float], int, float]],
+) -> Dict[str, Dict[str, float]]:
+    """Combine the sequential (latency) and concurrent (throughput) runs per tool."""
+    results = {}
+    for tool in TOOLS:
+        latencies, errors, _ = sequential[tool]
+        concurrent_latencies, concurrent_errors, wall = concurrent[tool]
+        calls = len(latencies) + len(concurrent_latencies)
+        results[tool] = {
+            "calls": calls,
+            "errors": errors + concurrent_errors,
+            "error_rate": (errors + concurrent_errors) / calls if calls else 0.0,
+            "mean_ms": 1000 * sum(latencies) / len(latencies),
+            "p50_ms": 1000 * percentile(latencies, 0.5),
+            "p95_ms": 1000 * percentile(latencies, 0.95),
+            "p99_ms": 1000 * percentile(latencies, 0.99),
+            "max_ms": 1000 * max(latencies),
+            "concurrent_p95_ms": 1000 * percentile(concurrent_latencies, 0.95),
+            "throughput_per_s": len(concurrent_latencies) / wall if wall else 0.0,
+        }
+    return results
+
+
+def git_commit() -> Tuple[Optional[str], bool]:
+    """Return the short commit hash of the tree and whether it has local changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]] = None) -> None:
+    header = f"{'tool':<20} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9} {'conc p95':>9} {'calls/s':>9} {'errors':>7}"
+    if baseline:
+        header += f" {'Δp50':>8} {'Δcalls/s':>9}"
+    print(header)
+    for tool, r in results.items():
+        line = (
+            f"{tool:<20} {r['p50_ms']:>7.1f}ms {r['p95_ms']:>7.1f}ms {r['p99_ms']:>7.1f}ms "
+            f"{r['max_ms']:>7.1f}ms {r['concurrent_p95_ms']:>7.1f}ms {r['throughput_per_s']:>9.1f} "
+            f"{int(r['errors']):>7}"
+        )
+        old = (baseline or {}).get("results", {}).get(tool)
+        if old:
+            line += (
+                f" {_change(old['p50_ms'], r['p50_ms']):>8}"
+                f" {_change(old['throughput_per_s'], r['throughput_per_s']):>9}"
+            )
+        print(line)
+
+
+def _change(old: float, new: float) -> str:
+    return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tier", choices=["stub", "real"], default="stub")
+    parser.add_argument("--iterations", type=int, default=20,
+                        help="scripts taken through every tool in each run (default: 20)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="calls in flight during the throughput run (default: 4)")
+    parser.add_argument("--warmup", type=int, default=2,
+                        help="unrecorded workflows run first (default: 2)")
+    parser.add_argument("--corpus", nargs="+", default=None,
+                        help="corpus scripts to use, by name (default: all)")
+    parser.add_argument("--quality", default="low", choices=["low", "medium", "high", "production"])
+    parser.add_argument("--cache", action="store_true",
+                        help="keep the render and partial movie caches enabled")
+    parser.add_argument("--manim", default=os.getenv("MANIM_EXECUTABLE", "manim"),
+                        help="manim executable for the real tier")
+    parser.add_argument("--stub-sleep", type=float, default=0.0,
+                        help="stub tier: seconds each scene takes to render")
+    parser.add_argument("--stub-output-kb", type=float, default=64,
+                        help="stub tier: size of each synthetic video")
+    parser.add_argument("--stub-log-lines", type=int, default=0,
+                        help="stub tier: stdout lines per animation")
+    parser.add_argument("--output", type=Path, default=None,
+                        help="results file (default: benchmarks/results/tools-<tier>-<commit>.json)")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="earlier results file to show changes against")
+    args = parser.parse_args()
+
+    corpus = [
+        (path.stem, path.read_text(encoding="utf-8"))
+        for path in sorted(CORPUS_DIR.glob("*.py"))
+        if args.corpus is None or path.stem in args.corpus
+    ]
+    if not corpus:
+        parser.error(f"no corpus scripts match {args.corpus}")
+
+    with tempfile.TemporaryDirectory(prefix="manim_bench_") as tmp:
+        work_dir = Path(tmp)
+        if args.tier == "stub":
+            manim = work_dir / "manim"
+            manim.write_text(
+                f'#!/bin/sh\nexec {shlex.quote(sys.executable)} {shlex.quote(str(STUB_SCRIPT))} "$@"\n'
+            )
+            manim.chmod(0o755)
+            os.environ.update({
+                "STUB_MANIM_SLEEP": str(args.stub_sleep),
+                "STUB_MANIM_OUTPUT_KB": str(args.stub_output_kb),
+                "STUB_MANIM_LOG_LINES": str(args.stub_log_lines),
+            })
+            executable = str(manim)
+        else:
+            executable = shutil.which(args.manim)
+            if executable is None:
+                sys.exit(f"manim executable not found: {args.manim}")
+
+        # The server reads its configuration at import time
+        os.environ["MANIM_EXECUTABLE"] = executable
+        os.environ["MANIM_CATALOG_DB"] = str(work_dir / "catalog.sqlite3")
+        server = importlib.import_module("src.server")
+        from src.partial_cache import PartialMovieCache
+        from src.render_cache import RenderCache
+        from src.render_logs import RenderLogStore
+
+        media_dir = work_dir / "media"
+        media_dir.mkdir()
+        server.BASE_DIR = media_dir
+        server.render_cache = RenderCache(
+            media_dir / ".render_cache", server.RENDER_CACHE_MAX_BYTES if args.cache else 0
+        )
+        server.partial_cache = PartialMovieCache(
+            media_dir / ".partial_cache", server.PARTIAL_CACHE_MAX_BYTES if args.cache else 0
+        )
+        server.render_logs = RenderLogStore(
+            media_dir / ".render_logs",
+            server.RENDER_LOG_MAX_BYTES,
+            server.RENDER_LOG_BACKUPS,
+            server.RENDER_LOG_HISTORY,
+        )
+
+        print(f"tier: {args.tier} ({executable}), corpus: {', '.join(name for name, _ in corpus)}")
+        if args.warmup:
+            await run_workflow(server, corpus, args.warmup, 1, args)
+        print(f"latency run: {args.iterations} scripts, one call at a time")
+        sequential = await run_workflow(server, corpus, args.iterations, 1, args)
+        print(f"throughput run: {args.iterations} scripts, {args.concurrency} calls at a time")
+        concurrent = await run_workflow(server, corpus, args.iterations, args.concurrency, args)
+        server.video_catalog.close()
+
+    commit, dirty = git_commit()
+    report = {
+        "benchmark": "tools",
+        "meta": {
+            "commit": commit,
+            "dirty": dirty,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "tier": args.tier,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "render_concurrency": server.RENDER_CONCURRENCY,
+            "iterations": args.iterations,
+            "concurrency": args.concurrency,
+            "quality": args.quality,
+            "cache": args.cache,
+            "corpus": [name for name, _ in corpus],
+            **(
+                {
+                    "stub_sleep": args.stub_sleep,
+                    "stub_output_kb": args.stub_output_kb,
+                    "stub_log_lines": args.stub_log_lines,
+                }
+                if args.tier == "stub" else {}
+            ),
+        },
+        "results": summarize(sequential, concurrent),
+    }
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print()
+    print_results(report["results"], baseline)
+
+    output = args.output or RESULTS_DIR / f"tools-{args.tier}-{commit or 'unknown'}{'-dirty' if dirty else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"\nresults written to {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
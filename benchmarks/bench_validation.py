@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of script validation.
+
+Compares the previous lower-case-and-substring-scan validator with the AST
+validator, cold (first sight of the code) and warm (memoized verdict), on a
+large generated Manim script.
+
+Usage:
+    python benchmarks/bench_validation.py --scenes 200 --repeat 20
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.validation import analyze_code, clear_verdict_cache  # noqa: E402
+
+LEGACY_PATTERNS = [
+    "import os", "import subprocess", "import sys", "__import__", "exec(",
+    "eval(", "open(", "file(", "input(", "raw_input(",
+]
+
+
+def legacy_validate(code: str) -> bool:
+    code_lower = code.lower()
+    return not any(pattern in code_lower for pattern in LEGACY_PATTERNS)
+
+
+def generate_script(scenes: int) -> str:
+    parts = ["from manim import *\n"]
+    for i in range(scenes):
+        parts.append(
+            f"\nclass Scene{i}(Scene):\n"
+            f"    def construct(self):\n"
+            f"        square = Square(side_length={i % 5 + 1})\n"
+            f"        label = Text('Scene {i}').next_to(square, UP)\n"
+            f"        self.play(Create(square), Write(label))\n"
+            f"        self.play(square.animate.rotate(PI / 4).shift(RIGHT * {i % 3}))\n"
+            f"        self.wait()\n"
+        )
+    return "".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    code = generate_script(args.scenes)
+
+    def cold() -> None:
+        clear_verdict_cache()
+        analyze_code(code)
+
+    analyze_code(code)
+    timings = {
+        "legacy substring scan": timeit.timeit(lambda: legacy_validate(code), number=args.repeat),
+        "AST validator (cold)": timeit.timeit(cold, number=args.repeat),
+        "AST validator (memoized)": timeit.timeit(lambda: analyze_code(code), number=args.repeat),
+    }
+
+    print(f"script: {len(code) / 1024:.1f} KiB, {args.scenes} scenes")
+    for label, total in timings.items():
+        print(f"{label:>26}: {total / args.repeat * 1e3:8.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Compare render latency with and without the warm worker pool.
+
+Renders the same script several times through a fresh ``manim`` process and
+through a single warm worker, then prints per-run and median latencies.
+
+Usage:
+    python benchmarks/bench_worker_pool.py examples/basic_animation.py --runs 5
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.worker_pool import WorkerPool  # noqa: E402
+
+QUALITY_FLAGS = {"low": "-ql", "medium": "-qm", "high": "-qh", "production": "-qp"}
+
+
+async def time_subprocess(script: Path, media_dir: Path, quality: str) -> float:
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        os.getenv("MANIM_EXECUTABLE", "manim"),
+        QUALITY_FLAGS[quality],
+        "--media_dir", str(media_dir),
+        str(script),
+        cwd=str(script.parent),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    if await process.wait() != 0:
+        raise SystemExit(f"manim failed on {script}")
+    return time.perf_counter() - started
+
+
+async def time_pool(pool: WorkerPool, script: Path, media_dir: Path, quality: str) -> float:
+    started = time.perf_counter()
+    reply, _ = await pool.render({
+        "script": str(script),
+        "cwd": str(script.parent),
+        "media_dir": str(media_dir),
+        "quality": quality,
+    })
+    if not reply["ok"]:
+        raise SystemExit(reply["traceback"])
+    return time.perf_counter() - started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("script", type=Path)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--quality", choices=sorted(QUALITY_FLAGS), default="low")
+    args = parser.parse_args()
+    script = args.script.resolve()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        media_dir = Path(tmp)
+        cold = [await time_subprocess(script, media_dir, args.quality) for _ in range(args.runs)]
+
+        pool = WorkerPool(size=1, max_jobs=args.runs + 1)
+        warm = [await time_pool(pool, script, media_dir, args.quality) for _ in range(args.runs)]
+        await pool.close()
+
+    for label, samples in (("manim subprocess", cold), ("warm worker pool", warm)):
+        runs = ", ".join(f"{s:.2f}" for s in samples)
+        print(f"{label:>18}: median {statistics.median(samples):.2f}s  [{runs}]")
+    print("(the first pool run includes worker start-up and the manim import)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,12 @@
+"""LaTeX formulas (requires a LaTeX installation)."""
+
+from manim import *
+
+
+class Formulas(Scene):
+    def construct(self):
+        euler = MathTex(r"e^{i\pi} + 1 = 0", font_size=72)
+        series = MathTex(r"\sum_{n=1}^{\infty} \frac{1}{n^2} = \frac{\pi^2}{6}")
+        self.play(Write(euler))
+        self.play(ReplacementTransform(euler, series))
+        self.wait(0.5)
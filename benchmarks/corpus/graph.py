@@ -0,0 +1,14 @@
+"""Axes, function plots and a moving dot."""
+
+from manim import *
+
+
+class PlotFunctions(Scene):
+    def construct(self):
+        axes = Axes(x_range=[-3, 3], y_range=[-2, 2], x_length=8, y_length=5)
+        sine = axes.plot(lambda x: np.sin(2 * x), color=BLUE)
+        parabola = axes.plot(lambda x: 0.3 * x ** 2 - 1, color=YELLOW)
+        dot = Dot(axes.i2gp(-3, sine), color=RED)
+        self.play(Create(axes))
+        self.play(Create(sine), Create(parabola))
+        self.play(MoveAlongPath(dot, sine), run_time=2)
@@ -0,0 +1,14 @@
+"""Basic shapes, transforms and grouped animations."""
+
+from manim import *
+
+
+class ShapeTransforms(Scene):
+    def construct(self):
+        circle = Circle(radius=1, color=BLUE)
+        square = Square(side_length=2, color=RED).shift(LEFT * 3)
+        triangle = Triangle(color=GREEN).shift(RIGHT * 3)
+        self.play(Create(circle), Create(square), Create(triangle))
+        self.play(Transform(square, circle.copy().shift(LEFT * 3)))
+        self.play(Rotate(triangle, PI), circle.animate.scale(1.5))
+        self.play(FadeOut(VGroup(circle, square, triangle)))
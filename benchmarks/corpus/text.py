@@ -0,0 +1,13 @@
+"""Text rendering with Pango (no LaTeX required)."""
+
+from manim import *
+
+
+class TitleCard(Scene):
+    def construct(self):
+        title = Text("Manim MCP Server", font_size=64)
+        subtitle = Text("benchmark corpus", font_size=32).next_to(title, DOWN)
+        self.play(Write(title))
+        self.play(FadeIn(subtitle, shift=UP))
+        self.wait(0.5)
+        self.play(FadeOut(title), FadeOut(subtitle))
@@ -0,0 +1,15 @@
+"""Value trackers and updaters redrawn every frame."""
+
+from manim import *
+
+
+class TrackedValue(Scene):
+    def construct(self):
+        tracker = ValueTracker(0)
+        number = always_redraw(lambda: DecimalNumber(tracker.get_value()).to_edge(UP))
+        bar = always_redraw(
+            lambda: Rectangle(width=max(0.01, tracker.get_value()), height=0.5, fill_opacity=1)
+        )
+        self.add(number, bar)
+        self.play(tracker.animate.set_value(6), run_time=2)
+        self.play(tracker.animate.set_value(1), run_time=1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Configurable stand-in for the ``manim`` CLI used by the benchmarks.
+
+Accepts the options the server passes (``-q*``, ``-p``, ``-n``, ``-s``,
+``--media_dir``), finds the scenes of the script with a regular expression
+and writes one synthetic MP4 per scene (and its partial movie files) where
+Manim would, without importing Manim. The cost of a render is set through
+environment variables so the benchmarks measure the server, not Manim:
+
+    STUB_MANIM_SLEEP      seconds to sleep per scene (default 0)
+    STUB_MANIM_OUTPUT_KB  size of each video in KB (default 64)
+    STUB_MANIM_LOG_LINES  log lines per animation on stdout (default 0)
+
+This file is executed directly and must not import from the server package.
+"""
+
+import os
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+
+QUALITY_DIRS = {"-ql": "480p15", "-qm": "720p30", "-qh": "1080p60", "-qp": "1440p60", "-qk": "2160p60"}
+SCENE_PATTERN = re.compile(r"^class\s+(\w+)\s*\([^)]*Scene[^)]*\)\s*:", re.M)
+PLAY_PATTERN = re.compile(r"self\.(?:play|wait)\(")
+
+
+def _box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload) + 8) + kind + payload
+
+
+def synthetic_mp4(duration: float, size: int) -> bytes:
+    """Return an MP4-shaped file with a real ``mvhd`` duration, padded to ``size`` bytes."""
+    timescale = 1000
+    mvhd = struct.pack(">B3xIIII", 0, 0, 0, timescale, round(duration * timescale)) + bytes(80)
+    head = _box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2mp41") + _box(b"moov", _box(b"mvhd", mvhd))
+    return head + _box(b"mdat", bytes(max(0, size - len(head) - 8)))
+
+
+def main() -> None:
+    sleep = float(os.getenv("STUB_MANIM_SLEEP", "0"))
+    output_bytes = int(float(os.getenv("STUB_MANIM_OUTPUT_KB", "64")) * 1024)
+    log_lines = int(os.getenv("STUB_MANIM_LOG_LINES", "0"))
+
+    args = sys.argv[1:]
+    media_dir = Path("media")
+    if "--media_dir" in args:
+        i = args.index("--media_dir")
+        media_dir = Path(args[i + 1])
+        del args[i:i + 2]
+    if "-n" in args:
+        i = args.index("-n")
+        del args[i:i + 2]
+    positional = [a for a in args if not a.startswith("-")]
+    script = Path(positional[0])
+    code = script.read_text(encoding="utf-8")
+    scenes = positional[1:] or SCENE_PATTERN.findall(code)
+    quality_dir = next((QUALITY_DIRS[a] for a in args if a in QUALITY_DIRS), "720p30")
+    animations = max(1, len(PLAY_PATTERN.findall(code)))
+
+    for scene in scenes:
+        if f"class {scene}" not in code:
+            print(f"Error: scene {scene} not found in {script}", file=sys.stderr)
+            sys.exit(1)
+        scene_dir = media_dir / "videos" / script.stem / quality_dir
+        if "-s" in args:
+            image = media_dir / "images" / script.stem / f"{scene}.png"
+            image.parent.mkdir(parents=True, exist_ok=True)
+            image.write_bytes(b"\x89PNG\r\n\x1a\n")
+            continue
+        partial_dir = scene_dir / "partial_movie_files" / scene
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        for index in range(animations):
+            for line in range(log_lines):
+                print(f"INFO     Animation {index} : rendering frame batch {line}", flush=True)
+            print(f"Animation {index}: Stub:  100%|##########| 15/15 [00:00<00:00]", file=sys.stderr, flush=True)
+            time.sleep(sleep / animations)
+            (partial_dir / f"stub_{index:05d}.mp4").write_bytes(synthetic_mp4(1.0, 1024))
+        (scene_dir / f"{scene}.mp4").write_bytes(synthetic_mp4(float(animations), output_bytes))
+        print(f"INFO     File ready at '{scene_dir / f'{scene}.mp4'}'", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Persistent SQLite catalog of rendered videos.
+
+Renders record their outputs as they finish, and an incremental rescan keeps
+the catalog in sync with files created or deleted behind the server's back.
+The rescan remembers each directory's mtime and subdirectories, so unchanged
+directories are never listed again; only directories whose entries changed
+are re-read. A video rewritten in place does not change its directory, so
+records are also checked against their file when they are returned: stale
+sizes and durations are refreshed and deleted files dropped.
+
+Query patterns match file names, not paths.
+"""
+
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+VIDEO_SUFFIXES = frozenset({".mp4", ".mov", ".webm", ".gif", ".mkv"})
+# Directories that hold intermediate or internal files rather than results
+SKIPPED_DIRS = frozenset({"partial_movie_files", "__pycache__"})
+
+_RECORD_COLUMNS = "path, scene, quality, script_hash, size, duration, created_at, mtime"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    scene TEXT,
+    quality TEXT,
+    script_hash TEXT,
+    size INTEGER NOT NULL,
+    duration REAL,
+    mtime REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS videos_dir ON videos (dir);
+CREATE INDEX IF NOT EXISTS videos_created ON videos (created_at);
+CREATE TABLE IF NOT EXISTS scanned_dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class VideoRecord:
+    """A cataloged video file."""
+
+    path: str
+    scene: Optional[str]
+    quality: Optional[str]
+    script_hash: Optional[str]
+    size: int
+    duration: Optional[float]
+    created_at: float
+
+
+def mp4_duration(path: Path) -> Optional[float]:
+    """
+    Read the duration of an MP4/MOV file from its ``mvhd`` box.
+
+    Only box headers are read, so this is cheap even for large files.
+    Returns None if the file is not a readable MP4.
+    """
+    try:
+        with open(path, "rb") as f:
+            end = os.fstat(f.fileno()).st_size
+            offset = 0
+            while offset + 8 <= end:
+                f.seek(offset)
+                size, box = struct.unpack(">I4s", f.read(8))
+                header = 8
+                if size == 1:
+                    size = struct.unpack(">Q", f.read(8))[0]
+                    header = 16
+                elif size == 0:
+                    size = end - offset
+                if size < header:
+                    return None
+                if box == b"moov":
+                    # Descend into the movie box
+                    end = offset + size
+                    offset += header
+                    continue
+                if box == b"mvhd":
+                    version = f.read(1)[0]
+                    f.read(3)
+                    if version == 1:
+                        _, _, timescale, duration = struct.unpack(">QQIQ", f.read(28))
+                    else:
+                        _, _, timescale, duration = struct.unpack(">IIII", f.read(16))
+                    return duration / timescale if timescale else None
+                offset += size
+    except (OSError, struct.error, IndexError):
+        return None
+    return None
+
+
+def _quality_from_dir(directory: str) -> Optional[str]:
+    """Return Manim's quality directory name (e.g. ``720p30``) if ``directory`` is one."""
+    name = os.path.basename(directory)
+    head, sep, tail = name.partition("p")
+    return name if sep and head.isdigit() and tail.isdigit() else None
+
+
+def _scene_from_name(name: str) -> str:
+    """Return the scene a video belongs to (``Intro.vp9.webm`` -> ``Intro``)."""
+    return name.split(".", 1)[0]
+
+
+def _subtree_bounds(root: str) -> Tuple[str, str]:
+    """Return a half-open string range matching every path below ``root``."""
+    prefix = root.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class VideoCatalog:
+    """SQLite-backed index of rendered videos; the database is created on first use."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Callers hold self._lock, so the connection is opened once
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        return self._conn
+
+    def record(
+        self,
+        path: Path,
+        scene: Optional[str] = None,
+        quality: Optional[str] = None,
+        script_hash: Optional[str] = None,
+    ) -> None:
+        """Add or update a rendered video."""
+        stat = path.stat()
+        directory = str(path.parent)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(path), directory, path.name,
+                    scene or _scene_from_name(path.name),
+                    quality or _quality_from_dir(directory),
+                    script_hash, stat.st_size, mp4_duration(path),
+                    stat.st_mtime, time.time(),
+                ),
+            )
+
+    def rescan(self, root: Path) -> Dict[str, int]:
+        """
+        Bring the catalog up to date with the files under ``root``.
+
+        Returns:
+            Counts of directories listed and videos added and removed
+        """
+        root_str = str(root)
+        stats = {"listed_dirs": 0, "added": 0, "removed": 0}
+        seen = set()
+        stack = [root_str]
+        with self._lock, self._db:
+            while stack:
+                directory = stack.pop()
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                seen.add(directory)
+                row = self._db.execute(
+                    "SELECT mtime_ns, subdirs FROM scanned_dirs WHERE path = ?", (directory,)
+                ).fetchone()
+                if row is not None and row[0] == mtime_ns:
+                    subdirs = json.loads(row[1])
+                else:
+                    subdirs = self._sync_directory(directory, mtime_ns, stats)
+                stack.extend(os.path.join(directory, name) for name in subdirs)
+
+            # Forget directories (and their videos) that disappeared
+            low, high = _subtree_bounds(root_str)
+            gone = [
+                path for (path,) in self._db.execute(
+                    "SELECT path FROM scanned_dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                    (root_str, low, high),
+                )
+                if path not in seen
+            ]
+            for path in gone:
+                stats["removed"] += self._db.execute(
+                    "DELETE FROM videos WHERE dir = ?", (path,)
+                ).rowcount
+                self._db.execute("DELETE FROM scanned_dirs WHERE path = ?", (path,))
+        return stats
+
+    def query(
+        self,
+        root: Path,
+        pattern: str = "*.mp4",
+        recursive: bool = True,
+        scene: Optional[str] = None,
+        quality: Optional[str] = None,
+        script_hash: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
+    ) -> Tuple[List[VideoRecord], int]:
+        """
+        Find cataloged videos under ``root`` whose file name matches ``pattern``, newest first.
+
+        Returns:
+            The requested page of records and the total number of matches
+        """
+        root_str = str(root)
+        if recursive:
+            low, high = _subtree_bounds(root_str)
+            clauses, params = ["path >= ? AND path < ?"], [low, high]
+        else:
+            clauses, params = ["dir = ?"], [root_str]
+        clauses.append("name GLOB ?")
+        params.append(pattern)
+        for column, value in (("scene", scene), ("quality", quality), ("script_hash", script_hash)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = " AND ".join(clauses)
+
+        with self._lock:
+            total = self._db.execute(
+                f"SELECT COUNT(*) FROM videos WHERE {where}", params
+            ).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT {_RECORD_COLUMNS} "
+                f"FROM videos WHERE {where} ORDER BY created_at DESC, path LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        records = self._current(rows)
+        return records, total - (len(rows) - len(records))
+
+    def get(self, path: Path) -> Optional[VideoRecord]:
+        """Return the record of one video, or None if it is not cataloged."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {_RECORD_COLUMNS} FROM videos WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        records = self._current([row] if row else [])
+        return records[0] if records else None
+
+    def recent(self, path_prefix: str = "", limit: int = 100) -> List[VideoRecord]:
+        """Return the newest videos whose path starts with ``path_prefix``."""
+        clause, params = "", []
+        if path_prefix:
+            # Every string starting with the prefix sorts in [prefix, prefix with its last character bumped)
+            clause = "WHERE path >= ? AND path < ? "
+            params = [path_prefix, path_prefix[:-1] + chr(ord(path_prefix[-1]) + 1)]
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {_RECORD_COLUMNS} "
+                f"FROM videos {clause}ORDER BY created_at DESC, path LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+        return self._current(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _current(self, rows: List[Tuple[Any, ...]]) -> List[VideoRecord]:
+        """Turn rows into records, refreshing files rewritten in place and dropping deleted ones."""
+        records = []
+        for *fields, mtime in rows:
+            record = VideoRecord(*fields)
+            try:
+                stat = os.stat(record.path)
+            except FileNotFoundError:
+                with self._lock, self._db:
+                    self._db.execute("DELETE FROM videos WHERE path = ?", (record.path,))
+                continue
+            except OSError:
+                records.append(record)
+                continue
+            if stat.st_mtime != mtime:
+                record.size = stat.st_size
+                record.duration = mp4_duration(Path(record.path))
+                with self._lock, self._db:
+                    self._db.execute(
+                        "UPDATE videos SET size = ?, duration = ?, mtime = ? WHERE path = ?",
+                        (record.size, record.duration, stat.st_mtime, record.path),
+                    )
+            records.append(record)
+        return records
+
+    def _sync_directory(self, directory: str, mtime_ns: int, stats: Dict[str, int]) -> List[str]:
+        """List one changed directory and reconcile its videos; return its subdirectories."""
+        stats["listed_dirs"] += 1
+        subdirs: List[str] = []
+        present: Dict[str, Any] = {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRS and not entry.name.startswith("."):
+                        subdirs.append(entry.name)
+                elif os.path.splitext(entry.name)[1].lower() in VIDEO_SUFFIXES:
+                    present[entry.path] = entry.stat()
+
+        known = {
+            path: mtime for path, mtime in self._db.execute(
+                "SELECT path, mtime FROM videos WHERE dir = ?", (directory,)
+            )
+        }
+        for path in known.keys() - present.keys():
+            self._db.execute("DELETE FROM videos WHERE path = ?", (path,))
+            stats["removed"] += 1
+        quality = _quality_from_dir(directory)
+        for path, stat in present.items():
+            if known.get(path) == stat.st_mtime:
+                continue
+            name = os.path.basename(path)
+            self._db.execute(
+                "INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?, "
+                "(SELECT script_hash FROM videos WHERE path = ?), ?, ?, ?, ?)",
+                (
+                    path, directory, name, _scene_from_name(name), quality,
+                    path, stat.st_size, mp4_duration(Path(path)),
+                    stat.st_mtime, stat.st_mtime,
+                ),
+            )
+            if path not in known:
+                stats["added"] += 1
+
+        self._db.execute(
+            "INSERT OR REPLACE INTO scanned_dirs VALUES (?, ?, ?)",
+            (directory, mtime_ns, json.dumps(subdirs)),
+        )
+        return subdirs
@@ -0,0 +1,224 @@
+"""
+Encoder profiles and output formats for rendered videos.
+
+Manim encodes every scene as H.264 MP4 with fixed settings. Other codecs,
+rate factors and containers are produced by re-encoding that MP4 with ffmpeg
+after the render, which keeps the render caches format-agnostic: a cached
+render can be re-encoded to any profile without rendering again.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+OUTPUT_FORMATS = ("mp4", "webm", "gif", "png")
+
+_FASTSTART = ("-movflags", "+faststart")
+
+
+@dataclass(frozen=True)
+class EncoderProfile:
+    """ffmpeg settings producing one output format."""
+
+    name: str
+    output_format: str
+    codec: Optional[str] = None
+    crf: Optional[int] = None
+    preset: Optional[str] = None
+    pix_fmt: Optional[str] = None
+    video_filter: Optional[str] = None
+    extra: Tuple[str, ...] = ()
+    description: str = ""
+
+
+ENCODER_PROFILES: Dict[str, EncoderProfile] = {
+    profile.name: profile for profile in (
+        EncoderProfile(
+            "h264_fast", "mp4", "libx264", 23, "veryfast", "yuv420p", extra=_FASTSTART,
+            description="H.264, quick to encode, larger files",
+        ),
+        EncoderProfile(
+            "h264_balanced", "mp4", "libx264", 23, "medium", "yuv420p", extra=_FASTSTART,
+            description="H.264 with ffmpeg's default speed/size trade-off",
+        ),
+        EncoderProfile(
+            "h264_small", "mp4", "libx264", 28, "slow", "yuv420p", extra=_FASTSTART,
+            description="H.264, slower encode for smaller files",
+        ),
+        EncoderProfile(
+            "hevc_small", "mp4", "libx265", 28, "medium", "yuv420p",
+            extra=("-tag:v", "hvc1", *_FASTSTART),
+            description="H.265, smallest MP4 but slow and not universally playable",
+        ),
+        EncoderProfile(
+            "vp9", "webm", "libvpx-vp9", 33, None, "yuv420p",
+            extra=("-b:v", "0", "-deadline", "good", "-cpu-used", "4", "-row-mt", "1"),
+            description="VP9 WebM for browsers",
+        ),
+        EncoderProfile(
+            "gif", "gif", video_filter="fps=15,scale=480:-1:flags=lanczos",
+            description="15 fps, 480 px wide GIF with a generated palette",
+        ),
+        EncoderProfile(
+            "gif_full", "gif",
+            description="GIF at the rendered size and frame rate with a generated palette",
+        ),
+        EncoderProfile(
+            "png", "png", description="One PNG per frame",
+        ),
+    )
+}
+
+# Profile used when only an output format is requested (None keeps Manim's MP4)
+DEFAULT_PROFILES: Dict[str, Optional[str]] = {
+    "mp4": None,
+    "webm": "vp9",
+    "gif": "gif",
+    "png": "png",
+}
+
+
+@dataclass
+class EncodeResult:
+    """Outcome of encoding one video."""
+
+    profile: str
+    output: Path
+    seconds: float
+    bytes: int
+    files: int = 1
+
+
+def resolve_profile(
+    output_format: Optional[str] = None, profile_name: Optional[str] = None
+) -> Optional[EncoderProfile]:
+    """
+    Return the profile to encode with, or None to keep Manim's own MP4.
+
+    Raises:
+        ValueError: If the format or profile is unknown, or they do not match
+    """
+    if profile_name:
+        profile = ENCODER_PROFILES.get(profile_name)
+        if profile is None:
+            raise ValueError(
+                f"Unknown encoder profile: {profile_name} "
+                f"(available: {', '.join(ENCODER_PROFILES)})"
+            )
+        if output_format and output_format != profile.output_format:
+            raise ValueError(
+                f"Encoder profile {profile_name} produces {profile.output_format}, not {output_format}"
+            )
+        return profile
+    output_format = output_format or "mp4"
+    if output_format not in DEFAULT_PROFILES:
+        raise ValueError(
+            f"Unsupported output format: {output_format} (use {', '.join(OUTPUT_FORMATS)})"
+        )
+    default = DEFAULT_PROFILES[output_format]
+    return ENCODER_PROFILES[default] if default else None
+
+
+def output_path_for(video: Path, profile: EncoderProfile) -> Path:
+    """Return where the encoded version of ``video`` is written, next to it."""
+    if profile.output_format == "png":
+        return video.parent / f"{video.stem}_frames" / "frame_%05d.png"
+    return video.with_name(f"{video.stem}.{profile.name}.{profile.output_format}")
+
+
+def build_ffmpeg_command(
+    source: Path,
+    output: Path,
+    profile: EncoderProfile,
+    ffmpeg: str = "ffmpeg",
+    crf: Optional[int] = None,
+    preset: Optional[str] = None,
+    threads: Optional[int] = None,
+) -> List[str]:
+    """Return the ffmpeg command encoding ``source`` with ``profile``."""
+    command = [ffmpeg, "-y", "-loglevel", "error", "-i", str(source)]
+    if threads:
+        command += ["-threads", str(threads)]
+    if profile.output_format == "gif":
+        # Build a palette from the clip itself instead of the generic 256-colour one
+        chain = f"{profile.video_filter}," if profile.video_filter else ""
+        command += [
+            "-filter_complex",
+            f"[0:v]{chain}split[a][b];[a]palettegen=stats_mode=diff[p];[b][p]paletteuse",
+            "-loop", "0",
+        ]
+    else:
+        if profile.video_filter:
+            command += ["-vf", profile.video_filter]
+        if profile.codec and profile.output_format != "png":
+            command += ["-c:v", profile.codec]
+        crf = crf if crf is not None else profile.crf
+        if crf is not None and profile.codec:
+            command += ["-crf", str(crf)]
+        preset = preset or profile.preset
+        if preset and profile.codec in ("libx264", "libx265"):
+            command += ["-preset", preset]
+        if profile.pix_fmt:
+            command += ["-pix_fmt", profile.pix_fmt]
+        command += list(profile.extra)
+        if profile.output_format == "webm":
+            command += ["-c:a", "libopus"]
+        elif profile.output_format == "mp4":
+            command += ["-c:a", "aac"]
+    command.append(str(output))
+    return command
+
+
+async def encode_video(
+    source: Path,
+    profile: EncoderProfile,
+    ffmpeg: str = "ffmpeg",
+    crf: Optional[int] = None,
+    preset: Optional[str] = None,
+    output: Optional[Path] = None,
+    threads: Optional[int] = None,
+) -> EncodeResult:
+    """
+    Encode ``source`` with ``profile`` and measure the time and output size.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    output = output or output_path_for(source, profile)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if profile.output_format == "png":
+        for stale in output.parent.glob("frame_*.png"):
+            stale.unlink()
+
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        *build_ffmpeg_command(source, output, profile, ffmpeg, crf, preset, threads),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await process.communicate()
+    except asyncio.CancelledError:
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            # Reap it even if cancelled again, so no zombie is left behind
+            await asyncio.shield(process.wait())
+        raise
+    seconds = time.perf_counter() - started
+    if process.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg encode ({profile.name}) failed: "
+            f"{stderr.decode('utf-8', errors='replace')[-2000:]}"
+        )
+
+    if profile.output_format == "png":
+        frames = list(output.parent.glob("frame_*.png"))
+        return EncodeResult(
+            profile.name, output.parent, seconds, sum(f.stat().st_size for f in frames), len(frames)
+        )
+    return EncodeResult(profile.name, output, seconds, output.stat().st_size)
@@ -0,0 +1,83 @@
+"""
+HTTP transports serving many MCP clients from one server process.
+
+The stdio transport gives every client a server process of its own, with
+cold caches and its own render scheduler. Over HTTP, all clients connect to
+one long-running process and share its scheduler, caches, catalog and warm
+worker pool. Two transports are mounted on one Starlette app:
+
+- ``/mcp``: streamable HTTP, one MCP session per ``Mcp-Session-Id``
+- ``/sse`` and ``/messages/``: the older HTTP+SSE transport
+
+``/healthz`` answers ``ok`` once the app is serving, for load balancers and
+benchmarks waiting for start-up.
+"""
+
+import contextlib
+from typing import Any, AsyncIterator
+
+import uvicorn
+from mcp.server.lowlevel import Server
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Mount, Route
+from starlette.types import Receive, Scope, Send
+
+STREAMABLE_HTTP_PATH = "/mcp"
+SSE_PATH = "/sse"
+SSE_MESSAGES_PATH = "/messages/"
+
+
+class _StreamableHTTPEndpoint:
+    """ASGI endpoint handing requests to the session manager (a class so Starlette does not wrap it)."""
+
+    def __init__(self, manager: StreamableHTTPSessionManager):
+        self.manager = manager
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.manager.handle_request(scope, receive, send)
+
+
+def create_app(mcp_server: Server, json_response: bool = False) -> Starlette:
+    """
+    Build the ASGI app serving ``mcp_server`` over streamable HTTP and SSE.
+
+    Args:
+        mcp_server: The MCP server shared by all clients
+        json_response: Answer streamable HTTP requests with plain JSON instead
+            of an SSE stream (for clients that do not read streams)
+    """
+    manager = StreamableHTTPSessionManager(app=mcp_server, json_response=json_response)
+    sse = SseServerTransport(SSE_MESSAGES_PATH)
+
+    async def handle_sse(request: Request) -> Response:
+        async with sse.connect_sse(request.scope, request.receive, request._send) as (read, write):
+            await mcp_server.run(read, write, mcp_server.create_initialization_options())
+        return Response()
+
+    async def health(request: Request) -> Response:
+        return PlainTextResponse("ok")
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        async with manager.run():
+            yield
+
+    return Starlette(
+        routes=[
+            Route(STREAMABLE_HTTP_PATH, endpoint=_StreamableHTTPEndpoint(manager)),
+            Route(SSE_PATH, endpoint=handle_sse),
+            Mount(SSE_MESSAGES_PATH, app=sse.handle_post_message),
+            Route("/healthz", endpoint=health),
+        ],
+        lifespan=lifespan,
+    )
+
+
+async def serve(app: Any, host: str, port: int, log_level: str = "info") -> None:
+    """Serve ``app`` with uvicorn until the process is interrupted."""
+    config = uvicorn.Config(app, host=host, port=port, log_level=log_level)
+    await uvicorn.Server(config).serve()
@@ -0,0 +1,124 @@
+"""
+Long-lived Manim render worker.
+
+Started by ``worker_pool.WorkerPool`` as ``python manim_worker.py``. The worker
+imports Manim once and then serves render jobs, one JSON object per line on
+stdin, answering with one JSON object per line on the protocol channel. Each
+job runs against a temporary copy of the Manim config and a freshly loaded
+module, so nothing leaks from one script into the next.
+
+This file is executed directly and must not import from the server package.
+"""
+
+import importlib.util
+import json
+import os
+import resource
+import sys
+import traceback
+import uuid
+from typing import Any, Dict, List
+
+
+def _open_protocol_channel():
+    """Detach the protocol from fd 1 so Manim's console output cannot corrupt it."""
+    protocol_fd = os.dup(1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    return os.fdopen(protocol_fd, "w", encoding="utf-8", buffering=1)
+
+
+def _run_job(job: Dict[str, Any]) -> List[str]:
+    from manim import Scene, config, tempconfig
+
+    script = job["script"]
+    module_name = f"_manim_job_{uuid.uuid4().hex}"
+    spec = importlib.util.spec_from_file_location(module_name, script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+
+    previous_cwd = os.getcwd()
+    os.chdir(job["cwd"])
+    try:
+        with tempconfig({}):
+            config.input_file = script
+            config.media_dir = job["media_dir"]
+            config.quality = f"{job['quality']}_quality"
+            config.preview = bool(job.get("preview", False))
+            if job.get("save_last_frame"):
+                config.save_last_frame = True
+                config.write_to_movie = False
+            animation_range = job.get("animation_range")
+            if animation_range:
+                config.from_animation_number = animation_range[0]
+                if animation_range[1] is not None:
+                    config.upto_animation_number = animation_range[1]
+            spec.loader.exec_module(module)
+
+            scene_classes = [
+                obj for obj in vars(module).values()
+                if isinstance(obj, type)
+                and issubclass(obj, Scene)
+                and obj.__module__ == module_name
+            ]
+            wanted = job.get("scenes")
+            if wanted:
+                scene_classes = [cls for cls in scene_classes if cls.__name__ in wanted]
+            if not scene_classes:
+                raise RuntimeError(f"No scenes to render in {script}")
+
+            outputs = []
+            for scene_cls in scene_classes:
+                scene = scene_cls()
+                scene.render()
+                file_writer = scene.renderer.file_writer
+                output = file_writer.image_file_path if config.save_last_frame else file_writer.movie_file_path
+                if output:
+                    outputs.append(str(output))
+            return outputs
+    finally:
+        os.chdir(previous_cwd)
+        sys.modules.pop(module_name, None)
+
+
+def _usage_since(before_self, before_children) -> Dict[str, Any]:
+    """Return the CPU time used since the given snapshots, and the worker's peak RSS."""
+    after_self = resource.getrusage(resource.RUSAGE_SELF)
+    after_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "user_cpu": (after_self.ru_utime - before_self.ru_utime)
+        + (after_children.ru_utime - before_children.ru_utime),
+        "sys_cpu": (after_self.ru_stime - before_self.ru_stime)
+        + (after_children.ru_stime - before_children.ru_stime),
+        # Peak over the worker's lifetime: RSS high-water marks cannot be reset
+        "peak_rss_bytes": max(after_self.ru_maxrss, after_children.ru_maxrss)
+        * (1 if sys.platform == "darwin" else 1024),
+    }
+
+
+def main() -> None:
+    protocol = _open_protocol_channel()
+    import manim  # noqa: F401  (warm the import before announcing readiness)
+
+    protocol.write(json.dumps({"ready": True, "pid": os.getpid()}) + "\n")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        before = (resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN))
+        try:
+            outputs = _run_job(job)
+            reply = {"ok": True, "outputs": outputs, "rusage": _usage_since(*before)}
+        except BaseException as e:  # report everything, including SystemExit
+            reply = {"ok": False, "error": f"{type(e).__name__}: {e}",
+                     "traceback": traceback.format_exc()}
+        # Mark the end of the job's output, so the pool does not attribute
+        # output still in the pipe to the next job
+        if job.get("end_marker"):
+            sys.stderr.write(job["end_marker"] + "\n")
+            sys.stderr.flush()
+        protocol.write(json.dumps(reply) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Server-wide cache of Manim partial movie files.
+
+Manim caches each animation as ``<hash>.mp4`` in a per-scene
+``partial_movie_files`` directory and skips re-rendering animations whose
+file already exists. Those directories live inside each workspace, so two
+scripts sharing most of their animations never benefit from each other.
+
+This cache keeps one shared, size-bounded pool of partial movies keyed by
+Manim's animation hash. Before a render the pool is *seeded* into the scene's
+partial movie directory with hard links; after a render new partial movies
+are *harvested* back. Animation hashes cannot be predicted before Manim runs,
+so the pool remembers which hashes each scene name used and only those are
+seeded; seeded links Manim did not use are removed again after the render,
+and reuse is counted from the file list Manim writes. Manim never writes into
+the shared pool directly, and
+entries are published with an atomic rename under a per-entry lock, so
+concurrent renders cannot observe or produce half-written files.
+
+Script revisions use the same mechanism directly: the partial movies of the
+parent script are linked into the revision's directories, and the file list
+Manim writes afterwards tells which animations were reused.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Output directory names Manim uses for each quality preset
+QUALITY_DIRS = {
+    "low": "480p15",
+    "medium": "720p30",
+    "high": "1080p60",
+    "production": "1440p60",
+}
+
+_PARTIAL_DIR_NAME = "partial_movie_files"
+_FILE_LIST_NAME = "partial_movie_file_list.txt"
+_STALE_LOCK_SECONDS = 600
+# Per quality, the hashes each scene name used, one file per scene
+_SCENE_INDEX_DIR = ".scenes"
+
+
+def partial_movie_dir(media_dir: Path, script_stem: str, quality: str, scene: str) -> Optional[Path]:
+    """Return the directory Manim keeps a scene's partial movies in, or None for an unknown quality."""
+    quality_dir = QUALITY_DIRS.get(quality)
+    if quality_dir is None:
+        return None
+    return media_dir / "videos" / script_stem / quality_dir / _PARTIAL_DIR_NAME / scene
+
+
+def link_partial_movies(source_dir: Path, target_dir: Path) -> int:
+    """
+    Hard-link (or copy) the partial movies in ``source_dir`` into ``target_dir``.
+
+    Returns:
+        The number of partial movies added to ``target_dir``
+    """
+    if not source_dir.is_dir():
+        return 0
+    target_dir.mkdir(parents=True, exist_ok=True)
+    linked = 0
+    for partial in partial_hashes(source_dir):
+        source, target = source_dir / f"{partial}.mp4", target_dir / f"{partial}.mp4"
+        if target.exists():
+            continue
+        try:
+            os.link(source, target)
+        except OSError:
+            try:
+                shutil.copy2(source, target)
+            except OSError:
+                continue
+        linked += 1
+    return linked
+
+
+def partial_hashes(partial_dir: Path) -> Set[str]:
+    """Return the animation hashes of the reusable partial movies in a directory."""
+    return {
+        partial.stem for partial in partial_dir.glob("*.mp4")
+        if not partial.stem.startswith("uncached_")
+    }
+
+
+def animation_reuse(partial_dir: Path, before: Set[str]) -> Tuple[List[int], List[int]]:
+    """
+    Split a finished scene's animations into reused and rendered ones.
+
+    Args:
+        partial_dir: The scene's partial movie directory
+        before: Hashes of the partial movies present before the render
+
+    Returns:
+        The indices of the animations Manim reused and of those it rendered
+    """
+    file_list = partial_dir / _FILE_LIST_NAME
+    if not file_list.is_file():
+        return [], []
+    reused, rendered = [], []
+    for index, partial in enumerate(_listed_partials(file_list)):
+        (reused if partial.stem in before else rendered).append(index)
+    return reused, rendered
+
+
+def _listed_partials(file_list: Path) -> List[Path]:
+    """Return the partial movies listed in Manim's file list, in animation order."""
+    partials = []
+    for line in file_list.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if line.startswith("file "):
+            name = line[len("file "):].strip().strip("'")
+            # Manim writes entries as ffmpeg "file:" protocol URLs
+            partial = Path(name.removeprefix("file:"))
+            if not partial.is_absolute():
+                partial = file_list.parent / partial
+            partials.append(partial)
+    return partials
+
+
+@dataclass
+class PartialCacheReport:
+    """What a render took from and gave to the shared partial movie cache."""
+
+    reused: int = 0
+    rendered: int = 0
+    published: int = 0
+    seeded: Dict[Path, Set[str]] = field(default_factory=dict, repr=False)
+    existing: Dict[Path, Set[str]] = field(default_factory=dict, repr=False)
+
+
+class PartialMovieCache:
+    """
+    Shared pool of partial movies stored as ``<root>/<quality dir>/<hash>.mp4``.
+
+    Args:
+        root: Directory holding the pool
+        max_bytes: Size budget; least recently used entries are evicted beyond
+            it. 0 disables the cache.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        # Serializes the read-modify-write of the per-scene hash indexes
+        self._index_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def seed(
+        self, media_dir: Path, script_stem: str, quality: str, scenes: Iterable[str]
+    ) -> PartialCacheReport:
+        """
+        Hard-link the pooled partial movies a scene name used before into its partial movie directory.
+
+        Returns:
+            A report remembering, per directory, the hashes linked from the
+            pool and those that were already present
+        """
+        report = PartialCacheReport()
+        quality_dir = QUALITY_DIRS.get(quality)
+        if not self.enabled or quality_dir is None:
+            return report
+
+        pool = self.root / quality_dir
+        for scene in scenes:
+            target_dir = partial_movie_dir(media_dir, script_stem, quality, scene)
+            existing = partial_hashes(target_dir) if target_dir.is_dir() else set()
+            seeded = set()
+            for partial in self._scene_hashes(pool, scene) - existing:
+                target_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(pool / f"{partial}.mp4", target_dir / f"{partial}.mp4")
+                except OSError:
+                    # Evicted concurrently, or a filesystem without hard links
+                    continue
+                seeded.add(partial)
+            report.seeded[target_dir] = seeded
+            report.existing[target_dir] = existing
+        return report
+
+    def harvest(self, media_dir: Path, script_stem: str, report: PartialCacheReport) -> PartialCacheReport:
+        """
+        Publish newly rendered partial movies, count reuse and drop unused seeded links.
+
+        Only partial movies listed in Manim's ``partial_movie_file_list.txt``
+        (i.e. used by the final video) are considered. Partial movies that
+        were in the scene's directory before seeding are neither reused from
+        the pool nor rendered, but are published if the pool lacks them.
+        """
+        if not self.enabled:
+            return report
+        for partial_dir, seeded in report.seeded.items():
+            file_list = partial_dir / _FILE_LIST_NAME
+            if not file_list.is_file():
+                # The render failed or was cancelled; nothing it used is known
+                for partial in seeded:
+                    (partial_dir / f"{partial}.mp4").unlink(missing_ok=True)
+                continue
+            quality_dir = partial_dir.parent.parent.name
+            existing = report.existing.get(partial_dir, set())
+            listed = set()
+            for partial in _listed_partials(file_list):
+                if partial.stem.startswith("uncached_"):
+                    continue
+                listed.add(partial.stem)
+                entry = self.root / quality_dir / partial.name
+                if partial.stem in seeded:
+                    report.reused += 1
+                    self._touch(entry)
+                    continue
+                if partial.stem not in existing:
+                    report.rendered += 1
+                if self._publish(partial, entry):
+                    report.published += 1
+            for partial in seeded - listed:
+                (partial_dir / f"{partial}.mp4").unlink(missing_ok=True)
+            self._remember(self.root / quality_dir, partial_dir.name, listed)
+        self.evict()
+        return report
+
+    def evict(self) -> int:
+        """Evict least recently used entries beyond the size budget; return bytes freed."""
+        entries: List[Tuple[float, int, Path]] = []
+        for entry in self.root.glob("*/*.mp4"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+            freed += size
+        return freed
+
+    def _scene_hashes(self, pool: Path, scene: str) -> Set[str]:
+        """Return the pooled hashes a scene name used in earlier renders."""
+        try:
+            lines = (pool / _SCENE_INDEX_DIR / f"{scene}.txt").read_text(encoding="utf-8").split()
+        except OSError:
+            return set()
+        return {partial for partial in lines if (pool / f"{partial}.mp4").is_file()}
+
+    def _remember(self, pool: Path, scene: str, hashes: Set[str]) -> None:
+        """Record the hashes a scene used, rewriting its index without evicted entries."""
+        index = pool / _SCENE_INDEX_DIR / f"{scene}.txt"
+        with self._index_lock:
+            known = self._scene_hashes(pool, scene)
+            if hashes <= known:
+                return
+            index.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=index.parent, prefix=f".{index.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write("\n".join(sorted(known | hashes)) + "\n")
+                os.replace(tmp, index)
+            finally:
+                Path(tmp).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        sizes = [entry.stat().st_size for entry in self.root.glob("*/*.mp4")] if self.enabled else []
+        return {"entries": len(sizes), "bytes": sum(sizes), "max_bytes": self.max_bytes}
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            pass
+
+    def _publish(self, partial: Path, entry: Path) -> bool:
+        """Atomically copy ``partial`` into the pool unless another render already is."""
+        if entry.exists() or not partial.is_file():
+            return False
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        lock = entry.with_name(entry.name + ".lock")
+        try:
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - lock.stat().st_mtime < _STALE_LOCK_SECONDS:
+                    return False  # another render is publishing the same entry
+                lock.unlink()
+            except FileNotFoundError:
+                pass
+            return self._publish(partial, entry)
+        os.close(fd)
+        tmp = entry.with_name(f".{entry.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copy2(partial, tmp)
+            os.replace(tmp, entry)
+            return True
+        finally:
+            tmp.unlink(missing_ok=True)
+            lock.unlink(missing_ok=True)
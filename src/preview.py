@@ -0,0 +1,80 @@
+"""
+Inline preview images for rendered frames.
+
+Frames saved by ``manim -s`` are full-resolution PNGs. Before they are
+returned as MCP image content they are downscaled to a maximum edge length
+and re-encoded (JPEG by default), which typically shrinks a 1080p frame from
+hundreds of kilobytes to a few tens. Pillow ships with Manim; without it the
+original PNG is returned unchanged.
+"""
+
+import io
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is a Manim dependency, but the server does not require it
+    Image = None
+
+PREVIEW_FORMATS = ("jpeg", "png", "webp")
+
+
+@dataclass
+class PreviewImage:
+    """An encoded preview and what was done to produce it."""
+
+    data: bytes
+    mime_type: str
+    size: Tuple[int, int]
+    original_size: Tuple[int, int]
+    original_bytes: int
+
+
+def png_dimensions(data: bytes) -> Optional[Tuple[int, int]]:
+    """Return ``(width, height)`` from a PNG header, or None if ``data`` is not a PNG."""
+    if data[:8] != b"\x89PNG\r\n\x1a\n" or data[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", data[16:24])
+
+
+def encode_preview(
+    path: Path, max_size: int = 512, image_format: str = "jpeg", quality: int = 80
+) -> PreviewImage:
+    """
+    Downscale and re-encode an image for inline display.
+
+    Args:
+        path: Image file to encode
+        max_size: Longest edge of the result in pixels (0 keeps the original size)
+        image_format: One of ``PREVIEW_FORMATS``
+        quality: Lossy encoder quality (1-100) for JPEG and WebP
+
+    Raises:
+        ValueError: If ``image_format`` is not supported
+    """
+    if image_format not in PREVIEW_FORMATS:
+        raise ValueError(
+            f"Unsupported preview format: {image_format} (use {', '.join(PREVIEW_FORMATS)})"
+        )
+    original = path.read_bytes()
+    if Image is None:
+        dimensions = png_dimensions(original) or (0, 0)
+        return PreviewImage(original, "image/png", dimensions, dimensions, len(original))
+
+    with Image.open(io.BytesIO(original)) as image:
+        original_size = image.size
+        if max_size and max(image.size) > max_size:
+            image.thumbnail((max_size, max_size), Image.LANCZOS)
+        if image_format == "jpeg" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buffer = io.BytesIO()
+        if image_format == "png":
+            image.save(buffer, format="PNG", optimize=True)
+        else:
+            image.save(buffer, format=image_format.upper(), quality=quality)
+        return PreviewImage(
+            buffer.getvalue(), f"image/{image_format}", image.size, original_size, len(original)
+        )
@@ -0,0 +1,55 @@
+"""
+Termination of render process trees.
+
+Renders are started in a session of their own (``start_new_session=True``),
+which makes the render process the leader of a new process group that its
+ffmpeg and LaTeX children join. Signalling the group rather than the process
+reaches every descendant, so nothing is left running once a render is
+stopped.
+"""
+
+import asyncio
+import os
+import signal
+
+# Seconds a render gets to exit after SIGTERM before it is killed
+DEFAULT_KILL_GRACE = 5.0
+
+
+def signal_process_group(pid: int, signum: int) -> bool:
+    """
+    Send ``signum`` to the process group led by ``pid``.
+
+    Returns:
+        False if the group no longer exists
+    """
+    try:
+        os.killpg(pid, signum)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+async def terminate_process_group(
+    process: asyncio.subprocess.Process, grace: float = DEFAULT_KILL_GRACE
+) -> None:
+    """
+    Stop a process started with ``start_new_session=True`` and all its descendants.
+
+    The group is sent SIGTERM, and SIGKILL if the leader has not exited
+    within ``grace`` seconds. The group is signalled even if the leader has
+    already exited, since its children may still hold the render's pipes,
+    and is killed (and its leader reaped) even if the caller is cancelled
+    while waiting.
+    """
+    try:
+        if grace > 0 and signal_process_group(process.pid, signal.SIGTERM) and process.returncode is None:
+            try:
+                await asyncio.wait_for(process.wait(), grace)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        # Descendants may outlive a leader that exited on SIGTERM
+        signal_process_group(process.pid, signal.SIGKILL)
+        # Reap the leader even if cancelled again, so no zombie is left behind
+        await asyncio.shield(process.wait())
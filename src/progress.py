@@ -0,0 +1,127 @@
+"""
+Incremental reading and progress parsing of Manim render output.
+
+Manim reports per-animation progress through tqdm bars such as::
+
+    Animation 3: Create(Circle):  45%|####5     | 27/60 [00:00<00:00, 85.12it/s]
+
+tqdm redraws the bar with carriage returns, so output is split on both ``\\r``
+and ``\\n``. Lines are length-capped while reading so memory stays bounded
+however much a render prints.
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+MAX_LINE_LENGTH = 4096
+
+_LINE_SPLIT_RE = re.compile(rb"[\r\n]")
+_PROGRESS_RE = re.compile(
+    r"Animation\s+(?P<index>\d+)\s*:\s*(?P<name>.*?):\s+\d+%\|[^|]*\|\s*"
+    r"(?P<done>\d+)/(?P<total>\d+)"
+)
+
+
+@dataclass(frozen=True)
+class RenderProgress:
+    """Progress of the animation currently being rendered."""
+
+    animation: int
+    name: str
+    frames_done: int
+    frames_total: int
+
+    @property
+    def progress(self) -> float:
+        """Monotonic progress value: animation index plus the frame fraction."""
+        if self.frames_total <= 0:
+            return float(self.animation)
+        return self.animation + self.frames_done / self.frames_total
+
+    @property
+    def message(self) -> str:
+        return (
+            f"Animation {self.animation}: {self.name} "
+            f"({self.frames_done}/{self.frames_total} frames)"
+        )
+
+
+# Receives a monotonically increasing progress value and a human-readable message
+ProgressCallback = Callable[[float, str], Awaitable[None]]
+
+
+def parse_progress(line: str) -> Optional[RenderProgress]:
+    """Parse a Manim progress bar line, returning None for other output."""
+    match = _PROGRESS_RE.search(line)
+    if match is None:
+        return None
+    return RenderProgress(
+        animation=int(match.group("index")),
+        name=match.group("name").strip(),
+        frames_done=int(match.group("done")),
+        frames_total=int(match.group("total")),
+    )
+
+
+async def iter_output_lines(
+    stream: asyncio.StreamReader, max_line: int = MAX_LINE_LENGTH
+) -> AsyncIterator[str]:
+    """
+    Yield decoded lines from ``stream`` as they arrive.
+
+    Lines are split on ``\\r`` and ``\\n``; lines longer than ``max_line``
+    bytes are yielded in pieces instead of being buffered whole.
+    """
+    pending = b""
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        parts = _LINE_SPLIT_RE.split(pending + chunk)
+        pending = parts.pop()
+        for part in parts:
+            for start in range(0, len(part), max_line):
+                yield part[start:start + max_line].decode("utf-8", errors="replace")
+        while len(pending) > max_line:
+            yield pending[:max_line].decode("utf-8", errors="replace")
+            pending = pending[max_line:]
+    if pending:
+        yield pending.decode("utf-8", errors="replace")
+
+
+class ProgressForwarder:
+    """
+    Parse output lines and forward throttled progress updates.
+
+    Updates are sent when a new animation starts, when an animation finishes
+    and otherwise at most once per ``min_interval`` seconds. A failing
+    callback (e.g. a disconnected client) disables forwarding rather than
+    failing the render.
+    """
+
+    def __init__(self, callback: ProgressCallback, min_interval: float = 0.25):
+        self.callback: Optional[ProgressCallback] = callback
+        self.min_interval = min_interval
+        self.last: Optional[RenderProgress] = None
+        self._last_sent = 0.0
+
+    async def feed(self, line: str) -> None:
+        update = parse_progress(line)
+        if update is None or self.callback is None:
+            return
+        now = time.monotonic()
+        if (
+            self.last is None
+            or update.animation != self.last.animation
+            or update.frames_done == update.frames_total
+            or now - self._last_sent >= self.min_interval
+        ):
+            self.last = update
+            self._last_sent = now
+            try:
+                await self.callback(update.progress, update.message)
+            except Exception:
+                self.callback = None
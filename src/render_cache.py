@@ -0,0 +1,265 @@
+"""
+Content-addressed cache of rendered Manim outputs.
+
+Entries are keyed by a hash of the script contents, the render flags and the
+installed Manim version, so resubmitting identical code returns the existing
+video instead of spawning ``manim`` again. The cache is persisted on disk and
+bounded in size with least-recently-used eviction.
+
+Hits are materialized as copies, never hard links: Manim and ffmpeg rewrite
+outputs in place, which would otherwise change the cached entry as well.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Placeholder for the script stem inside stored relative paths. Manim writes
+# outputs to ``<media>/videos/<script stem>/...``; storing the stem as a slot
+# lets the same code saved under a different name still hit the cache.
+_SCRIPT_SLOT = "{script}"
+_INDEX_NAME = "index.json"
+# Seconds between index writes caused by hits alone (recency is not worth a write per hit)
+_INDEX_SAVE_INTERVAL = 30.0
+
+
+@lru_cache(maxsize=1)
+def manim_version() -> str:
+    """Return the installed Manim version, or ``"unknown"`` if not importable."""
+    try:
+        return metadata.version("manim")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def make_cache_key(
+    code: bytes,
+    quality: str,
+    flags: Sequence[str] = (),
+    version: Optional[str] = None,
+) -> str:
+    """
+    Build the cache key for a render.
+
+    Args:
+        code: Raw script bytes
+        quality: Render quality name
+        flags: Additional CLI flags that change the rendered output
+        version: Manim version (defaults to the installed version)
+
+    Returns:
+        Hex digest identifying the render
+    """
+    digest = hashlib.sha256()
+    for part in (version or manim_version(), quality, *flags):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(code)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Size-bounded LRU cache of render outputs stored under ``root``."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        if self.enabled:
+            # The directory is created by the first store
+            self._index = self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(entry["size"] for entry in self._index.values())
+
+    def lookup(self, key: str) -> bool:
+        """Return whether ``key`` is cached, counting a hit or a miss."""
+        return self._claim(key) is not None
+
+    def fetch(self, key: str, media_dir: Path, script_stem: str) -> Optional[List[Path]]:
+        """
+        Look ``key`` up and materialize it, counting a hit or a miss.
+
+        The entry is checked and its file list taken under one lock, so an
+        eviction in between cannot turn a counted hit into a render without
+        videos; an entry removed while it is copied counts as a miss.
+
+        Returns:
+            Paths of the materialized files, or None on a miss
+        """
+        files = self._claim(key)
+        if files is None:
+            return None
+        try:
+            return self._copy_out(key, files, media_dir, script_stem)
+        except OSError:
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return None
+
+    def materialize(self, key: str, media_dir: Path, script_stem: str) -> Optional[List[Path]]:
+        """
+        Place the cached outputs for ``key`` into ``media_dir``.
+
+        Files are copied to the locations Manim would have written them; a
+        target that is already an unmodified copy is kept.
+
+        Returns:
+            Paths of the materialized files, or None if ``key`` is not cached
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            files = list(entry["files"])
+        return self._copy_out(key, files, media_dir, script_stem)
+
+    def _claim(self, key: str) -> Optional[List[str]]:
+        """Count a hit or a miss for ``key``; on a hit return a snapshot of its files."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and not all(
+                (self.root / key / rel).is_file() for rel in entry["files"]
+            ):
+                # Files were removed behind our back; drop the stale entry
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry["last_used"] = time.time()
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= _INDEX_SAVE_INTERVAL:
+                self._save_index()
+            return list(entry["files"])
+
+    def _copy_out(
+        self, key: str, files: List[str], media_dir: Path, script_stem: str
+    ) -> List[Path]:
+        outputs = []
+        for rel in files:
+            source = self.root / key / rel
+            target = media_dir / rel.replace(_SCRIPT_SLOT, script_stem, 1)
+            if not _same_file_contents(source, target):
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.unlink(missing_ok=True)
+                shutil.copy2(source, target)
+            outputs.append(target)
+        return outputs
+
+    def store(
+        self, key: str, media_dir: Path, script_stem: str, files: Sequence[Path]
+    ) -> bool:
+        """
+        Copy rendered ``files`` (located under ``media_dir``) into the cache.
+
+        Returns:
+            True if the entry was stored, False if caching is disabled or the
+            outputs alone exceed the cache budget
+        """
+        if not self.enabled or not files:
+            return False
+        size = sum(f.stat().st_size for f in files)
+        if size > self.max_bytes:
+            return False
+
+        # A staging directory of its own, so concurrent stores of one key cannot collide
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=self.root, prefix=f".{key}."))
+        try:
+            rel_paths = []
+            for f in files:
+                parts = list(f.relative_to(media_dir).parts)
+                if len(parts) > 1 and parts[1] == script_stem:
+                    parts[1] = _SCRIPT_SLOT
+                rel = "/".join(parts)
+                target = staging / rel
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(f, target)
+                rel_paths.append(rel)
+
+            with self._lock:
+                shutil.rmtree(self.root / key, ignore_errors=True)
+                os.replace(staging, self.root / key)
+                self._index[key] = {"files": rel_paths, "size": size, "last_used": time.time()}
+                self._evict()
+                self._save_index()
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return True
+
+    def flush(self) -> None:
+        """Write recency updates from hits that are not on disk yet."""
+        with self._lock:
+            if self._dirty:
+                self._save_index()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _evict(self) -> None:
+        total = self.total_bytes
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index[key]["size"]
+            self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self._index.pop(key, None)
+        shutil.rmtree(self.root / key, ignore_errors=True)
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads((self.root / _INDEX_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self) -> None:
+        tmp = self.root / f"{_INDEX_NAME}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(self._index), encoding="utf-8")
+        os.replace(tmp, self.root / _INDEX_NAME)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+
+def _same_file_contents(source: Path, target: Path) -> bool:
+    """Return whether ``target`` is a separate, unmodified copy of ``source``."""
+    try:
+        source_stat, target_stat = source.stat(), target.stat()
+    except OSError:
+        return False
+    # copy2 preserves the mtime, so a file rewritten since it was materialized differs
+    return (
+        not os.path.samestat(source_stat, target_stat)
+        and target_stat.st_size == source_stat.st_size
+        and target_stat.st_mtime_ns == source_stat.st_mtime_ns
+    )
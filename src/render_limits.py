@@ -0,0 +1,191 @@
+"""
+Per-render resource limits.
+
+Every render can be confined to a resource envelope so one heavy render
+cannot starve the others on the same host:
+
+- ``RLIMIT_AS`` and ``RLIMIT_CPU`` are applied to the render process (and
+  inherited by its children) by ``rusage_exec.py`` before it starts Manim.
+  The server itself is multithreaded, so nothing runs between its fork and
+  exec; :meth:`RenderLimits.exec_options` passes the limits on the shim's
+  command line instead.
+- On cgroup v2 hosts with a delegated directory, each render also runs in a
+  cgroup of its own with ``memory.max`` and ``cpu.max`` set, which bounds the
+  whole process tree and reports out-of-memory kills. The shim moves itself
+  into the cgroup, so everything it starts is accounted there.
+
+:func:`classify_breach` turns the way a render died into a description of
+the limit it hit, if any.
+"""
+
+import logging
+import os
+import re
+import signal
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Seconds between RLIMIT_CPU's SIGXCPU (soft limit) and SIGKILL (hard limit)
+CPU_KILL_MARGIN = 5
+# cpu.max period in microseconds (the kernel default)
+CPU_PERIOD_US = 100_000
+
+# Allocation failures as reported by Python, ffmpeg/libc and C++ (LaTeX, Cairo)
+_OUT_OF_MEMORY = re.compile(r"MemoryError|Cannot allocate memory|std::bad_alloc|out of memory", re.I)
+
+
+@dataclass(frozen=True)
+class RenderLimits:
+    """
+    The resource envelope of one render.
+
+    Attributes:
+        memory_bytes: Address-space limit per process, and the cgroup's
+            memory.max for the whole render
+        cpu_seconds: CPU time limit per process
+        cpu_quota: CPU cores the render's cgroup may use (cpu.max)
+        ffmpeg_threads: Threads of the server's own ffmpeg re-encodes
+            (Manim's internal ffmpeg calls are not affected)
+        cgroup_root: Delegated cgroup v2 directory to create render cgroups in
+    """
+
+    memory_bytes: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    cpu_quota: Optional[float] = None
+    ffmpeg_threads: Optional[int] = None
+    cgroup_root: Optional[Path] = None
+
+    def exec_options(self, cpu: bool = True, cgroup: Optional["RenderCgroup"] = None) -> List[str]:
+        """
+        Return the ``rusage_exec.py`` options applying these limits to the command it runs.
+
+        Args:
+            cpu: Apply RLIMIT_CPU (not wanted for long-lived workers, whose
+                CPU time accumulates across renders)
+            cgroup: Cgroup the shim moves itself into before starting the command
+        """
+        options = []
+        if self.memory_bytes:
+            options += ["--memory", str(self.memory_bytes)]
+        if cpu and self.cpu_seconds:
+            options += ["--cpu", f"{self.cpu_seconds}:{self.cpu_seconds + CPU_KILL_MARGIN}"]
+        if cgroup is not None:
+            options += ["--cgroup", str(cgroup.path)]
+        return options
+
+
+def cgroup_v2_available(root: Path) -> bool:
+    """Return whether ``root`` is a writable cgroup v2 directory delegating memory and cpu."""
+    try:
+        controllers = (root / "cgroup.subtree_control").read_text().split()
+    except OSError:
+        return False
+    return {"memory", "cpu"} <= set(controllers) and os.access(root, os.W_OK)
+
+
+class RenderCgroup:
+    """A cgroup v2 directory holding the processes of one render."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def create(
+        cls, root: Path, memory_bytes: Optional[int] = None, cpu_quota: Optional[float] = None
+    ) -> Optional["RenderCgroup"]:
+        """
+        Create a render cgroup under ``root`` with the given limits.
+
+        Returns:
+            The cgroup, or None if cgroups are unavailable (the render then
+            runs with rlimits only)
+        """
+        if not cgroup_v2_available(root):
+            return None
+        cgroup = cls(root / f"render-{uuid.uuid4().hex[:12]}")
+        try:
+            cgroup.path.mkdir()
+            if memory_bytes:
+                (cgroup.path / "memory.max").write_text(str(memory_bytes))
+                # Without this the kernel swaps instead of enforcing the limit
+                swap_max = cgroup.path / "memory.swap.max"
+                if swap_max.exists():
+                    swap_max.write_text("0")
+            if cpu_quota:
+                (cgroup.path / "cpu.max").write_text(f"{round(cpu_quota * CPU_PERIOD_US)} {CPU_PERIOD_US}")
+        except OSError as e:
+            logger.warning("Cannot create render cgroup in %s: %s", root, e)
+            cgroup.remove()
+            return None
+        return cgroup
+
+    def oom_kills(self) -> int:
+        """Return how many processes the kernel killed for exceeding memory.max."""
+        try:
+            events = (self.path / "memory.events").read_text()
+        except OSError:
+            return 0
+        match = re.search(r"^oom_kill (\d+)$", events, re.M)
+        return int(match.group(1)) if match else 0
+
+    def remove(self, attempts: int = 20) -> None:
+        """Delete the cgroup, waiting briefly for exiting processes to leave it."""
+        for _ in range(attempts):
+            try:
+                self.path.rmdir()
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                time.sleep(0.05)
+        logger.warning("Render cgroup %s is still in use; leaving it behind", self.path)
+
+
+def classify_breach(
+    limits: RenderLimits,
+    exit_code: Optional[int] = None,
+    output: str = "",
+    oom_kills: int = 0,
+    cpu_time: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Describe the limit a failed render exceeded, or return None.
+
+    Args:
+        limits: The limits the render ran with
+        exit_code: Exit status of the render process (negative for signals)
+        output: The render's error output
+        oom_kills: Out-of-memory kills in the render's cgroup
+        cpu_time: CPU seconds the render used, if known
+    """
+    if oom_kills:
+        return f"memory limit of {_megabytes(limits.memory_bytes)} exceeded (killed by the kernel OOM killer)"
+    if limits.cpu_seconds and (
+        exit_code == -signal.SIGXCPU
+        or (exit_code == -signal.SIGKILL and cpu_time is not None and cpu_time >= limits.cpu_seconds)
+    ):
+        return f"CPU time limit of {limits.cpu_seconds}s exceeded"
+    if limits.memory_bytes and _OUT_OF_MEMORY.search(output):
+        return f"memory limit of {_megabytes(limits.memory_bytes)} exceeded (allocation failed)"
+    return None
+
+
+def _megabytes(value: Optional[int]) -> str:
+    return f"{value / 1024 / 1024:.0f} MB" if value else "unknown size"
+
+
+def describe(limits: RenderLimits, cgroup: bool = False) -> Sequence[str]:
+    """Return human-readable descriptions of the limits each Manim render runs with."""
+    parts = []
+    if limits.memory_bytes:
+        parts.append(f"memory {_megabytes(limits.memory_bytes)}")
+    if limits.cpu_seconds:
+        parts.append(f"CPU time {limits.cpu_seconds}s")
+    if limits.cpu_quota and cgroup:
+        parts.append(f"{limits.cpu_quota:g} CPU cores")
+    return parts
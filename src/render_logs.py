@@ -0,0 +1,233 @@
+"""
+Per-render log files with size-bounded rotation.
+
+Manim's output is streamed to ``<root>/<log id>.log`` as it arrives instead
+of being collected in memory: LaTeX failures alone can print megabytes. Once
+a log reaches ``max_bytes`` it is rotated to ``.log.1`` (then ``.log.2``, up
+to ``backups``), so a runaway render cannot fill the disk, and only the
+``max_logs`` most recent logs are kept. The error summary (the LaTeX error
+line and the first Python traceback) is extracted while the output streams
+past, so it survives even when rotation drops the start of the log.
+"""
+
+import re
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Deque, List, Optional
+
+# Traceback body lines kept in a summary; the frames nearest the error win
+TRACEBACK_LINES = 30
+# Output lines summarized when no traceback or LaTeX error was seen
+FALLBACK_LINES = 20
+# Default and largest slice returned by a single read
+DEFAULT_READ_BYTES = 64 * 1024
+MAX_READ_BYTES = 1024 * 1024
+# Seconds between flushes, so a log can be read while its render runs
+_FLUSH_INTERVAL = 1.0
+
+_TRACEBACK_HEADER = "Traceback (most recent call last)"
+# Frame lines of plain and rich (boxed) tracebacks
+_TRACEBACK_BODY = re.compile(r"^(\s|[│╭╰])")
+# TeX reports errors as "! <message>"; Manim and LaTeX packages add their own wording
+_LATEX_ERROR = re.compile(r"^! |LaTeX Error:|LaTeX compilation error|latex error converting", re.IGNORECASE)
+_LOG_ID = re.compile(r"^[0-9a-f]{12}$")
+
+
+class ErrorSummary:
+    """Pick the LaTeX error line and the first Python traceback out of a stream of output lines."""
+
+    def __init__(self):
+        self.latex_error: Optional[str] = None
+        self.traceback: List[str] = []
+        self.omitted = 0
+        self._body: Deque[str] = deque(maxlen=TRACEBACK_LINES)
+        self._in_traceback = False
+        self._tail: Deque[str] = deque(maxlen=FALLBACK_LINES)
+
+    def feed(self, line: str) -> None:
+        if line.strip():
+            self._tail.append(line)
+        if self.latex_error is None and _LATEX_ERROR.search(line):
+            self.latex_error = line.strip()
+        if self._in_traceback:
+            if not line.strip() or _TRACEBACK_BODY.match(line):
+                if len(self._body) == self._body.maxlen:
+                    self.omitted += 1
+                self._body.append(line)
+            else:
+                # The exception line closes the first traceback
+                self.traceback.extend(self._body)
+                self.traceback.append(line)
+                self._in_traceback = False
+        elif not self.traceback and _TRACEBACK_HEADER in line:
+            self.traceback.append(line)
+            self._in_traceback = True
+
+    def text(self) -> str:
+        """Return the summary, or the last output lines if no error was recognized."""
+        traceback = list(self.traceback)
+        if self._in_traceback:
+            # The output ended inside the traceback
+            traceback.extend(self._body)
+        if self.omitted and traceback:
+            traceback.insert(1, f"  ... ({self.omitted} lines omitted)")
+        parts = []
+        if self.latex_error:
+            parts.append(f"LaTeX error: {self.latex_error}")
+        if traceback:
+            parts.append("\n".join(traceback))
+        return "\n\n".join(parts) or "\n".join(self._tail)
+
+
+@dataclass
+class LogSlice:
+    """A byte range read from a render log."""
+
+    log_id: str
+    offset: int
+    data: bytes
+    size: int
+    rotated: bool
+
+
+class RenderLog:
+    """Writer of one render's log, rotated across numbered segment files."""
+
+    def __init__(self, path: Path, max_bytes: int, backups: int):
+        self.path = path
+        self.id = path.stem
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.bytes_written = 0
+        self.summary = ErrorSummary()
+        self._file: Optional[BinaryIO] = open(path, "wb")
+        self._segment_bytes = 0
+        self._flushed_at = time.monotonic()
+
+    def write(self, line: str) -> None:
+        """Append one output line to the log and the error summary."""
+        self.summary.feed(line)
+        if self._file is None:
+            return
+        data = (line + "\n").encode("utf-8", errors="replace")
+        if self._segment_bytes and self._segment_bytes + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._segment_bytes += len(data)
+        self.bytes_written += len(data)
+        now = time.monotonic()
+        if now - self._flushed_at >= _FLUSH_INTERVAL:
+            self._file.flush()
+            self._flushed_at = now
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                segment = _segment_path(self.path, index)
+                if segment.exists():
+                    segment.replace(_segment_path(self.path, index + 1))
+            self.path.replace(_segment_path(self.path, 1))
+        self._file = open(self.path, "wb")
+        self._segment_bytes = 0
+
+
+class RenderLogStore:
+    """
+    Directory of render logs keeping the ``max_logs`` most recent.
+
+    Args:
+        root: Directory holding the logs
+        max_bytes: Size at which a log is rotated
+        backups: Rotated segments kept per log
+        max_logs: Number of logs kept
+    """
+
+    def __init__(self, root: Path, max_bytes: int, backups: int, max_logs: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.max_logs = max(1, max_logs)
+        self._owners: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
+    def open(self, owner: Optional[str] = None) -> RenderLog:
+        """
+        Start a new log, removing the oldest logs beyond ``max_logs``.
+
+        Args:
+            owner: Tag recorded for :meth:`owner`, e.g. the client session
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._prune(self.max_logs - 1)
+        log = RenderLog(self.root / f"{uuid.uuid4().hex[:12]}.log", self.max_bytes, self.backups)
+        self._owners[log.id] = owner
+        while len(self._owners) > self.max_logs:
+            self._owners.popitem(last=False)
+        return log
+
+    def owner(self, log_id: str) -> Optional[str]:
+        """Return the owner a log was opened with in this process (None if unknown)."""
+        return self._owners.get(log_id)
+
+    def exists(self, log_id: str) -> bool:
+        return bool(_LOG_ID.match(log_id)) and (self.root / f"{log_id}.log").exists()
+
+    def read(self, log_id: str, offset: int = 0, length: int = DEFAULT_READ_BYTES) -> LogSlice:
+        """
+        Read ``length`` bytes of a log starting at ``offset``.
+
+        Offsets count from the start of the oldest segment still on disk; a
+        negative offset counts back from the end.
+
+        Raises:
+            KeyError: If the log does not exist
+        """
+        if not self.exists(log_id):
+            raise KeyError(log_id)
+        path = self.root / f"{log_id}.log"
+        segments = [
+            _segment_path(path, index) for index in range(self.backups, 0, -1)
+            if _segment_path(path, index).exists()
+        ] + [path]
+        sizes = [segment.stat().st_size for segment in segments]
+        size = sum(sizes)
+        if offset < 0:
+            offset = max(0, size + offset)
+        offset = min(offset, size)
+        remaining = max(0, min(length, MAX_READ_BYTES, size - offset))
+
+        chunks = []
+        position = 0
+        for segment, segment_size in zip(segments, sizes):
+            if remaining and offset < position + segment_size:
+                with open(segment, "rb") as handle:
+                    handle.seek(max(0, offset - position))
+                    chunk = handle.read(remaining)
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            position += segment_size
+        return LogSlice(log_id, offset, b"".join(chunks), size, rotated=len(segments) > 1)
+
+    def _prune(self, keep: int) -> None:
+        logs = []
+        for path in self.root.glob("*.log"):
+            try:
+                logs.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        logs.sort(reverse=True)
+        for _, path in logs[keep:]:
+            for segment in path.parent.glob(f"{path.name}*"):
+                segment.unlink(missing_ok=True)
+
+
+def _segment_path(path: Path, index: int) -> Path:
+    return path.with_name(f"{path.name}.{index}")
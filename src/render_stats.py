@@ -0,0 +1,203 @@
+"""
+Per-render resource accounting.
+
+Each finished render contributes one :class:`RenderRecord` (wall time, CPU
+time, peak RSS, output size and frame count) to a bounded ring buffer, from
+which percentiles are computed on demand. Cumulative totals survive eviction
+from the buffer and can be exported as a Prometheus textfile for the node
+exporter's textfile collector.
+"""
+
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+@dataclass
+class ResourceUsage:
+    """Resources consumed by one render process (or worker job)."""
+
+    wall: float
+    user_cpu: Optional[float] = None
+    sys_cpu: Optional[float] = None
+    peak_rss_bytes: Optional[int] = None
+
+    @classmethod
+    def from_report(cls, wall: float, report: Optional[Dict[str, Any]]) -> "ResourceUsage":
+        report = report or {}
+        return cls(
+            wall=wall,
+            user_cpu=report.get("user_cpu"),
+            sys_cpu=report.get("sys_cpu"),
+            peak_rss_bytes=report.get("peak_rss_bytes"),
+        )
+
+
+@dataclass
+class RenderRecord:
+    """Accounting for one finished render."""
+
+    script: str
+    quality: str
+    backend: str
+    usage: ResourceUsage
+    output_bytes: int = 0
+    frames: Optional[int] = None
+    finished_at: float = field(default_factory=time.time)
+
+
+# name -> (extractor, Prometheus metric, help text)
+METRICS: Dict[str, Tuple[Callable[[RenderRecord], Optional[float]], str, str]] = {
+    "wall": (lambda r: r.usage.wall, "manim_render_wall_seconds", "Wall-clock render time"),
+    "user_cpu": (lambda r: r.usage.user_cpu, "manim_render_user_cpu_seconds", "User CPU time of the render process tree"),
+    "sys_cpu": (lambda r: r.usage.sys_cpu, "manim_render_sys_cpu_seconds", "System CPU time of the render process tree"),
+    "peak_rss": (lambda r: r.usage.peak_rss_bytes, "manim_render_peak_rss_bytes", "Peak resident set size of the largest render process"),
+    "output": (lambda r: r.output_bytes, "manim_render_output_bytes", "Size of the rendered videos"),
+    "frames": (lambda r: r.frames, "manim_render_frames", "Frames in the rendered videos"),
+}
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the ``q`` quantile of ``values`` with linear interpolation."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q
+    low, high = math.floor(position), math.ceil(position)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+class RenderStats:
+    """
+    Ring buffer of render records with percentile summaries.
+
+    Args:
+        history: Number of records kept for percentiles
+        textfile: If set, a Prometheus textfile rewritten after every render
+    """
+
+    def __init__(self, history: int = 1000, textfile: Optional[Path] = None):
+        self.textfile = textfile
+        self._records: Deque[RenderRecord] = deque(maxlen=history)
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._failures: Dict[str, int] = {}
+        self._limit_breaches: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, record: RenderRecord) -> None:
+        """Add a finished render."""
+        with self._lock:
+            self._records.append(record)
+            totals = self._totals.setdefault(record.quality, {"count": 0})
+            totals["count"] += 1
+            for name, (extract, _, _) in METRICS.items():
+                value = extract(record)
+                if value is not None:
+                    totals[name] = totals.get(name, 0) + value
+                    totals[f"{name}_count"] = totals.get(f"{name}_count", 0) + 1
+        self._write_textfile()
+
+    def record_failure(self, quality: str, limited: bool = False) -> None:
+        """Count a render that failed, and whether it was stopped by a resource limit."""
+        with self._lock:
+            self._failures[quality] = self._failures.get(quality, 0) + 1
+            if limited:
+                self._limit_breaches[quality] = self._limit_breaches.get(quality, 0) + 1
+        self._write_textfile()
+
+    def records(self, quality: Optional[str] = None, last: Optional[int] = None) -> List[RenderRecord]:
+        """Return buffered records, oldest first, optionally filtered and truncated."""
+        with self._lock:
+            records = [r for r in self._records if quality is None or r.quality == quality]
+        return records[-last:] if last else records
+
+    @property
+    def failures(self) -> int:
+        with self._lock:
+            return sum(self._failures.values())
+
+    @property
+    def limit_breaches(self) -> int:
+        with self._lock:
+            return sum(self._limit_breaches.values())
+
+    @staticmethod
+    def summarize(records: Sequence[RenderRecord]) -> Dict[str, Dict[str, float]]:
+        """
+        Return percentiles, mean and max of each metric over ``records``.
+
+        Metrics no record reported (e.g. CPU time from a pool without
+        accounting) are omitted.
+        """
+        summary = {}
+        for name, (extract, _, _) in METRICS.items():
+            values = [v for v in (extract(r) for r in records) if v is not None]
+            if not values:
+                continue
+            summary[name] = {
+                "count": len(values),
+                "mean": sum(values) / len(values),
+                "max": max(values),
+                **{f"p{round(q * 100)}": percentile(values, q) for q in QUANTILES},
+            }
+        return summary
+
+    def prometheus_text(self) -> str:
+        """Render the current statistics in the Prometheus text exposition format."""
+        with self._lock:
+            totals = {quality: dict(values) for quality, values in self._totals.items()}
+            failures = dict(self._failures)
+            breaches = dict(self._limit_breaches)
+            records = list(self._records)
+
+        lines = [
+            "# HELP manim_renders_total Renders completed.",
+            "# TYPE manim_renders_total counter",
+        ]
+        lines += [f'manim_renders_total{{quality="{q}"}} {t["count"]}' for q, t in sorted(totals.items())]
+        lines += [
+            "# HELP manim_render_failures_total Renders that failed.",
+            "# TYPE manim_render_failures_total counter",
+        ]
+        lines += [f'manim_render_failures_total{{quality="{q}"}} {n}' for q, n in sorted(failures.items())]
+        lines += [
+            "# HELP manim_render_limit_breaches_total Renders stopped for exceeding a resource limit.",
+            "# TYPE manim_render_limit_breaches_total counter",
+        ]
+        lines += [f'manim_render_limit_breaches_total{{quality="{q}"}} {n}' for q, n in sorted(breaches.items())]
+
+        # Quantiles cover the buffered window; _sum and _count are cumulative
+        summaries = {
+            quality: self.summarize([r for r in records if r.quality == quality])
+            for quality in totals
+        }
+        for name, (_, metric, help_text) in METRICS.items():
+            reported = [q for q in sorted(totals) if f"{name}_count" in totals[q]]
+            if not reported:
+                continue
+            lines += [f"# HELP {metric} {help_text}.", f"# TYPE {metric} summary"]
+            for quality in reported:
+                for q in QUANTILES:
+                    value = summaries[quality].get(name, {}).get(f"p{round(q * 100)}")
+                    if value is not None:
+                        lines.append(f'{metric}{{quality="{quality}",quantile="{q}"}} {value:g}')
+                lines.append(f'{metric}_sum{{quality="{quality}"}} {totals[quality][name]:g}')
+                lines.append(f'{metric}_count{{quality="{quality}"}} {totals[quality][f"{name}_count"]:g}')
+        return "\n".join(lines) + "\n"
+
+    def _write_textfile(self) -> None:
+        if self.textfile is None:
+            return
+        # Write atomically so the collector never reads a partial file
+        tmp = self.textfile.with_name(f".{self.textfile.name}.{os.getpid()}.tmp")
+        try:
+            self.textfile.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(self.prometheus_text(), encoding="utf-8")
+            os.replace(tmp, self.textfile)
+        except OSError:
+            tmp.unlink(missing_ok=True)
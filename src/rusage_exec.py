@@ -0,0 +1,103 @@
+"""
+Run a command and record its resource usage.
+
+Started by the server as
+``python rusage_exec.py <report.json> [--memory BYTES] [--cpu SOFT:HARD] [--cgroup DIR] -- <command...>``.
+The options confine the command: ``--cgroup`` moves this process into a
+cgroup v2 directory and ``--memory``/``--cpu`` set ``RLIMIT_AS`` and
+``RLIMIT_CPU``, all inherited by the command. They are applied here rather
+than in a ``preexec_fn`` because the server is multithreaded, and running
+Python between fork and exec there can deadlock. With ``-`` as the report
+path no usage is recorded and this process simply becomes the command.
+The command inherits this process's stdin, stdout and stderr, so its output
+streams exactly as if it had been started directly. When it exits, the
+``wait4`` rusage is written to the report file as JSON: its CPU times
+include every descendant the command waited for (such as ffmpeg or LaTeX),
+but ``ru_maxrss`` is the peak RSS of the largest single process among them,
+not of the tree as a whole. This process exits with the command's status.
+asyncio reaps children itself and discards their rusage, which is why the
+server cannot collect it without this shim.
+
+This file is executed directly and must not import from the server package.
+"""
+
+import argparse
+import json
+import os
+import resource
+import signal
+import subprocess
+import sys
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="rusage_exec.py")
+    parser.add_argument("report_path")
+    parser.add_argument("--memory", type=int)
+    parser.add_argument("--cpu")
+    parser.add_argument("--cgroup")
+    split = argv.index("--")
+    return parser.parse_args(argv[:split]), argv[split + 1:]
+
+
+def _confine(args) -> None:
+    """Apply the requested cgroup and rlimits to this process, and so to the command."""
+    if args.cgroup:
+        with open(os.path.join(args.cgroup, "cgroup.procs"), "w") as f:
+            f.write("0")
+    if args.memory:
+        resource.setrlimit(resource.RLIMIT_AS, (args.memory, args.memory))
+    if args.cpu:
+        soft, hard = (int(value) for value in args.cpu.split(":"))
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def main() -> None:
+    args, command = _parse_args(sys.argv[1:])
+    report_path = args.report_path
+    try:
+        _confine(args)
+    except OSError as e:
+        print(f"rusage_exec.py: cannot apply render limits: {e}", file=sys.stderr)
+        sys.exit(126)
+    if report_path == "-":
+        try:
+            os.execvp(command[0], command)
+        except OSError as e:
+            print(f"{command[0]}: {e}", file=sys.stderr)
+            sys.exit(127)
+    try:
+        child = subprocess.Popen(command)
+    except OSError as e:
+        print(f"{command[0]}: {e}", file=sys.stderr)
+        sys.exit(127)
+
+    # Pass polite termination requests on to the command
+    for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+        signal.signal(signum, lambda signum, frame: child.send_signal(signum))
+
+    _, status, usage = os.wait4(child.pid, 0)
+    code = os.waitstatus_to_exitcode(status)
+    child.returncode = code
+
+    report = {
+        "user_cpu": usage.ru_utime,
+        "sys_cpu": usage.ru_stime,
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        "peak_rss_bytes": usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024),
+        "exit_code": code,
+    }
+    tmp = f"{report_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f)
+    os.replace(tmp, report_path)
+
+    if code < 0:
+        # Die from the same signal so the caller sees the real cause
+        signal.signal(-code, signal.SIG_DFL)
+        os.kill(os.getpid(), -code)
+    sys.exit(code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Static discovery of Manim scenes in a script.
+
+Scenes are found with an AST pass instead of importing the script, so
+discovery is cheap and never executes user code.
+"""
+
+import ast
+from typing import List, Set
+
+
+def _base_name(node: ast.expr) -> str:
+    """Return the trailing name of a base class expression (``manim.Scene`` -> ``Scene``)."""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    if isinstance(node, ast.Subscript):
+        return _base_name(node.value)
+    return ""
+
+
+def discover_scenes(code: str) -> List[str]:
+    """
+    Find the Scene subclasses defined at module level in ``code``.
+
+    A class counts as a scene if one of its bases is named ``*Scene`` (which
+    covers ``Scene``, ``ThreeDScene``, ``MovingCameraScene`` and friends) or
+    is another scene defined earlier in the same script.
+
+    Args:
+        code: Manim script source
+
+    Returns:
+        Scene class names in definition order
+
+    Raises:
+        SyntaxError: If ``code`` does not parse
+    """
+    tree = ast.parse(code)
+    scenes: List[str] = []
+    known: Set[str] = set()
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for base in node.bases:
+            name = _base_name(base)
+            if name.endswith("Scene") or name in known:
+                scenes.append(node.name)
+                known.add(node.name)
+                break
+    return scenes
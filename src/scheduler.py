@@ -0,0 +1,226 @@
+"""
+In-process render job scheduler.
+
+Jobs are coroutine factories queued by priority (higher first, FIFO within a
+priority) and run with a bounded number executing at once. Job records stay
+available after completion so clients can poll for status and results.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+import uuid
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+JobFactory = Callable[[], Awaitable[Any]]
+
+
+class JobState(str, Enum):
+    """Lifecycle states of a render job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobState.SUCCEEDED, JobState.FAILED, JobState.CANCELLED)
+
+
+@dataclass
+class RenderJob:
+    """A scheduled render and its outcome."""
+
+    id: str
+    description: str
+    priority: int
+    factory: JobFactory = field(repr=False)
+    needs_slot: bool = True
+    state: JobState = JobState.QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = field(default=None, repr=False)
+    error: Optional[str] = None
+    progress: Optional[str] = None
+    exception: Optional[BaseException] = field(default=None, repr=False)
+    task: Optional["asyncio.Future[Any]"] = field(default=None, repr=False)
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    paths: Tuple[Path, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the public fields of the job record."""
+        return {
+            "id": self.id,
+            "description": self.description,
+            "priority": self.priority,
+            "state": self.state.value,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            "progress": self.progress,
+        }
+
+
+class RenderScheduler:
+    """
+    Bounded-concurrency priority scheduler for render jobs.
+
+    Args:
+        concurrency: Maximum number of jobs running at once
+        max_records: Number of finished job records to retain
+    """
+
+    def __init__(self, concurrency: int, max_records: int = 1000):
+        self.concurrency = max(1, concurrency)
+        self.max_records = max_records
+        self._jobs: Dict[str, RenderJob] = {}
+        self._queue: List[Tuple[int, int, RenderJob]] = []
+        self._counter = itertools.count()
+        self._running = 0
+
+    def submit(
+        self,
+        factory: JobFactory,
+        priority: int = 0,
+        description: str = "",
+        needs_slot: bool = True,
+        paths: Sequence[Path] = (),
+    ) -> RenderJob:
+        """
+        Queue a job and return its record.
+
+        Jobs submitted with ``needs_slot=False`` start immediately without
+        taking a concurrency slot. They are meant for coordinators that only
+        wait on other scheduled jobs, which would otherwise deadlock the
+        scheduler by holding a slot while their children queue for one.
+
+        ``paths`` names the directories the job reads or writes; they are
+        reported by :meth:`busy_paths` until the job finishes.
+        """
+        job = RenderJob(
+            id=uuid.uuid4().hex[:12],
+            description=description,
+            priority=priority,
+            factory=factory,
+            needs_slot=needs_slot,
+            paths=tuple(paths),
+        )
+        self._jobs[job.id] = job
+        if needs_slot:
+            heapq.heappush(self._queue, (-priority, next(self._counter), job))
+            self._dispatch()
+        else:
+            self._start(job)
+        return job
+
+    async def run(
+        self,
+        factory: JobFactory,
+        priority: int = 0,
+        description: str = "",
+        needs_slot: bool = True,
+        paths: Sequence[Path] = (),
+    ) -> Any:
+        """
+        Submit a job and wait for it, re-raising its exception on failure.
+
+        Cancelling the caller cancels the job.
+        """
+        job = self.submit(factory, priority, description, needs_slot, paths)
+        try:
+            await job.done.wait()
+        except asyncio.CancelledError:
+            self.cancel(job.id)
+            raise
+        if job.state is JobState.SUCCEEDED:
+            return job.result
+        if job.state is JobState.CANCELLED:
+            raise asyncio.CancelledError()
+        raise job.exception
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Returns:
+            True if the job was cancelled, False if unknown or already finished
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.state.finished:
+            return False
+        if job.state is JobState.QUEUED:
+            self._finish(job, JobState.CANCELLED)
+        else:
+            job.task.cancel()
+        return True
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """Return the 1-based position of a queued job, or None."""
+        queued = sorted(entry for entry in self._queue if entry[2].state is JobState.QUEUED)
+        for position, (_, _, job) in enumerate(queued, start=1):
+            if job.id == job_id:
+                return position
+        return None
+
+    def busy_paths(self) -> Set[Path]:
+        """Return the paths used by queued and running jobs."""
+        return {
+            path for job in self._jobs.values() if not job.state.finished for path in job.paths
+        }
+
+    def stats(self) -> Dict[str, int]:
+        counts = {state.value: 0 for state in JobState}
+        for job in self._jobs.values():
+            counts[job.state.value] += 1
+        return {"concurrency": self.concurrency, **counts}
+
+    def _dispatch(self) -> None:
+        while self._queue and self._running < self.concurrency:
+            _, _, job = heapq.heappop(self._queue)
+            if job.state is not JobState.QUEUED:
+                continue
+            self._running += 1
+            self._start(job)
+
+    def _start(self, job: RenderJob) -> None:
+        job.state = JobState.RUNNING
+        job.started_at = time.time()
+        job.task = asyncio.ensure_future(job.factory())
+        job.task.add_done_callback(lambda task, job=job: self._on_done(job, task))
+
+    def _on_done(self, job: RenderJob, task: "asyncio.Future[Any]") -> None:
+        if task.cancelled():
+            state = JobState.CANCELLED
+        elif task.exception() is not None:
+            job.exception = task.exception()
+            job.error = str(job.exception)
+            state = JobState.FAILED
+        else:
+            job.result = task.result()
+            state = JobState.SUCCEEDED
+        if job.needs_slot:
+            self._running -= 1
+        self._finish(job, state)
+        self._dispatch()
+
+    def _finish(self, job: RenderJob, state: JobState) -> None:
+        job.state = state
+        job.finished_at = time.time()
+        job.done.set()
+        self._trim()
+
+    def _trim(self) -> None:
+        finished = [job for job in self._jobs.values() if job.state.finished]
+        for job in finished[: max(0, len(finished) - self.max_records)]:
+            del self._jobs[job.id]
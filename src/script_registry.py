@@ -0,0 +1,114 @@
+"""
+Handles for scripts created through the server.
+
+``create_script`` registers every script it writes and returns a handle: a
+stable id, the script's path and a hash of its content. Later tools resolve
+the id in constant time instead of guessing which workspace belongs to which
+request, which also keeps concurrent workflows from picking up each other's
+scripts.
+
+A handle can be a revision of another: revisions are written next to their
+parent, so renders can reuse the animations the parent already rendered.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+def content_hash(code: bytes) -> str:
+    """Return the hash identifying a script's content (as recorded in the video catalog)."""
+    return hashlib.sha256(code).hexdigest()
+
+
+@dataclass(frozen=True)
+class ScriptHandle:
+    """A script created by the server."""
+
+    id: str
+    path: Path
+    content_hash: str
+    created_at: float = field(default_factory=time.time)
+    parent_id: Optional[str] = None
+    revision: int = 1
+
+    @property
+    def workspace(self) -> Path:
+        return self.path.parent
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "path": str(self.path),
+            "content_hash": self.content_hash,
+            "created_at": self.created_at,
+            "parent_id": self.parent_id,
+            "revision": self.revision,
+        }
+
+
+class ScriptRegistry:
+    """
+    In-memory index of script handles by id.
+
+    Args:
+        max_entries: Number of handles kept; the least recently used are forgotten
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._handles: "OrderedDict[str, ScriptHandle]" = OrderedDict()
+        self._by_path: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        path: Path,
+        code: bytes,
+        parent: Optional[ScriptHandle] = None,
+        revision: Optional[int] = None,
+    ) -> ScriptHandle:
+        """
+        Create a handle for a script that was just written, optionally as a revision of ``parent``.
+
+        ``revision`` defaults to one more than the parent's; callers that
+        number revision files pass the number they chose.
+        """
+        if revision is None:
+            revision = parent.revision + 1 if parent is not None else 1
+        handle = ScriptHandle(
+            id=f"script_{uuid.uuid4().hex[:12]}",
+            path=path,
+            content_hash=content_hash(code),
+            parent_id=parent.id if parent is not None else None,
+            revision=revision,
+        )
+        with self._lock:
+            self._handles[handle.id] = handle
+            self._by_path[path] = handle.id
+            while len(self._handles) > self.max_entries:
+                _, forgotten = self._handles.popitem(last=False)
+                if self._by_path.get(forgotten.path) == forgotten.id:
+                    del self._by_path[forgotten.path]
+        return handle
+
+    def get(self, script_id: str) -> Optional[ScriptHandle]:
+        with self._lock:
+            handle = self._handles.get(script_id)
+            if handle is not None:
+                self._handles.move_to_end(script_id)
+            return handle
+
+    def find(self, path: Path) -> Optional[ScriptHandle]:
+        """Return the newest handle of the script at ``path``, if any."""
+        with self._lock:
+            script_id = self._by_path.get(path)
+        return self.get(script_id) if script_id else None
+
+    def __len__(self) -> int:
+        return len(self._handles)
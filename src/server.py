@@ -7,27 +7,256 @@ for better control and flexibility.
 """
 
 import asyncio
+import base64
+import difflib
+import json
+import logging
 import os
+import re
 import shutil
+import sqlite3
 import subprocess
+import sys
 import tempfile
+import time
 import uuid
+import weakref
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Set, Tuple
 
 import mcp.server.stdio
 import mcp.types as types
 from mcp.server.lowlevel import NotificationOptions, Server
+from mcp.server.lowlevel.helper_types import ReadResourceContents
 from mcp.server.models import InitializationOptions
+from pydantic import AnyUrl
+
+if __name__ == "__main__" and not __package__:
+    # Executed as a script (python src/server.py): make the sibling modules
+    # importable through the package so relative imports work (PEP 366).
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    __package__ = "src"
+
+from .catalog import VIDEO_SUFFIXES, VideoCatalog, VideoRecord, mp4_duration
+from .encoding import ENCODER_PROFILES, OUTPUT_FORMATS, EncoderProfile, encode_video, resolve_profile
+from .partial_cache import (
+    QUALITY_DIRS, PartialCacheReport, PartialMovieCache, animation_reuse, link_partial_movies,
+    partial_hashes, partial_movie_dir,
+)
+from .preview import PREVIEW_FORMATS, encode_preview
+from .process_group import terminate_process_group
+from .progress import ProgressCallback, ProgressForwarder, iter_output_lines
+from .render_cache import RenderCache, make_cache_key
+from .render_limits import RenderCgroup, RenderLimits, classify_breach, describe as describe_limits
+from .render_logs import DEFAULT_READ_BYTES, MAX_READ_BYTES, RenderLog, RenderLogStore
+from .render_stats import RenderRecord, RenderStats, ResourceUsage
+from .scenes import discover_scenes
+from .script_registry import ScriptHandle, ScriptRegistry, content_hash
+from .scheduler import JobFactory, JobState, RenderJob, RenderScheduler
+from .sharding import concat_videos, estimate_animation_count, format_range_flag, plan_shards
+from .validation import Finding, analyze_code
+from .video_resources import (
+    VIDEO_URI_TEMPLATE, ResourceSubscriptions, mime_type, parse_video_uri, read_range, video_uri,
+)
+from .worker_pool import WORKER_SCRIPT, WorkerPool, WorkerPoolError
+from .workspace_gc import WORKSPACE_PREFIX, WorkspaceGC, touch_workspace
+from .workspace_stats import WorkspaceStatsCache, largest_types
+
+logger = logging.getLogger(__name__)
 
 
 # Configuration
+# Transport: "stdio" serves one client per process; "http" serves many clients
+# from this process over streamable HTTP (/mcp) and SSE (/sse)
+MCP_TRANSPORT = os.getenv("MANIM_MCP_TRANSPORT", "stdio")
+MCP_HOST = os.getenv("MANIM_MCP_HOST", "127.0.0.1")
+MCP_PORT = int(os.getenv("MANIM_MCP_PORT", "8000"))
+# Confine each client session to the workspaces it created (default: on over HTTP)
+SESSION_ISOLATION = os.getenv(
+    "MANIM_SESSION_ISOLATION", "0" if MCP_TRANSPORT == "stdio" else "1"
+) == "1"
+# Honor "validate": false on create_script/revise_script (default: only over
+# stdio, where the client is the operator; HTTP clients are untrusted)
+ALLOW_UNVALIDATED_SCRIPTS = os.getenv(
+    "MANIM_ALLOW_UNVALIDATED_SCRIPTS", "1" if MCP_TRANSPORT == "stdio" else "0"
+) == "1"
+
 MANIM_EXECUTABLE = os.getenv("MANIM_EXECUTABLE", "manim")
-BASE_DIR = Path(__file__).parent / "media"
-BASE_DIR.mkdir(exist_ok=True)
+FFMPEG_EXECUTABLE = os.getenv("FFMPEG_EXECUTABLE", "ffmpeg")
+BASE_DIR = Path(os.getenv("MANIM_MEDIA_DIR", str(Path(__file__).parent / "media")))
+BASE_DIR.mkdir(parents=True, exist_ok=True)
+RENDER_CACHE_DIR = BASE_DIR / ".render_cache"
+RENDER_CACHE_MAX_BYTES = int(os.getenv("MANIM_RENDER_CACHE_MAX_MB", "1024")) * 1024 * 1024
+PARTIAL_CACHE_DIR = BASE_DIR / ".partial_cache"
+PARTIAL_CACHE_MAX_BYTES = int(os.getenv("MANIM_PARTIAL_CACHE_MAX_MB", "2048")) * 1024 * 1024
+CATALOG_DB = Path(os.getenv("MANIM_CATALOG_DB", str(BASE_DIR / ".catalog.sqlite3")))
+
+QUALITY_FLAGS = {
+    "low": ["-ql"],
+    "medium": ["-qm"],
+    "high": ["-qh"],
+    "production": ["-qp"],
+}
+
+# Warm worker pool (0 disables it and renders with a fresh manim process)
+WORKER_POOL_SIZE = int(os.getenv("MANIM_WORKER_POOL_SIZE", "0"))
+WORKER_MAX_JOBS = int(os.getenv("MANIM_WORKER_MAX_JOBS", "20"))
+WORKER_PYTHON = os.getenv("MANIM_WORKER_PYTHON", sys.executable)
+
+# Lines of render output kept in memory per stream
+RENDER_LOG_TAIL_LINES = int(os.getenv("MANIM_RENDER_LOG_TAIL_LINES", "200"))
+
+# Full render output is streamed to a log file per render. Each log rotates
+# at MANIM_RENDER_LOG_MAX_MB, keeping MANIM_RENDER_LOG_BACKUPS old segments,
+# and only the MANIM_RENDER_LOG_HISTORY most recent logs are kept
+RENDER_LOG_DIR = BASE_DIR / ".render_logs"
+RENDER_LOG_MAX_BYTES = int(float(os.getenv("MANIM_RENDER_LOG_MAX_MB", "1")) * 1024 * 1024)
+RENDER_LOG_BACKUPS = int(os.getenv("MANIM_RENDER_LOG_BACKUPS", "2"))
+RENDER_LOG_HISTORY = int(os.getenv("MANIM_RENDER_LOG_HISTORY", "500"))
+
+# Render scheduling: concurrent renders and retained job records
+RENDER_CONCURRENCY = int(os.getenv("MANIM_RENDER_CONCURRENCY", str(os.cpu_count() or 1)))
+RENDER_JOB_HISTORY = int(os.getenv("MANIM_RENDER_JOB_HISTORY", "1000"))
+
+# Rendered videos as MCP resources: largest byte range returned by one read
+# and number of (newest) videos listed
+RESOURCE_CHUNK_BYTES = int(float(os.getenv("MANIM_RESOURCE_CHUNK_MB", "8")) * 1024 * 1024)
+RESOURCE_LIST_LIMIT = int(os.getenv("MANIM_RESOURCE_LIST_LIMIT", "500"))
+
+# Largest scripts x scenes x qualities matrix a single render_batch call may expand to
+BATCH_MAX_ITEMS = int(os.getenv("MANIM_BATCH_MAX_ITEMS", "256"))
+
+# Render timeouts: seconds a render process may run (0 disables; callers can
+# override it) and seconds between SIGTERM and SIGKILL when one is stopped
+RENDER_TIMEOUT = float(os.getenv("MANIM_RENDER_TIMEOUT", "1800"))
+RENDER_KILL_GRACE = float(os.getenv("MANIM_RENDER_KILL_GRACE", "5"))
+
+# Resource envelope of each render (0 disables a limit). Memory and CPU time
+# are enforced with rlimits, which cap each process separately; with a
+# delegated cgroup v2 directory, memory and a CPU quota (in cores) also cap
+# each render's process tree as a whole
+RENDER_MEMORY_LIMIT = int(os.getenv("MANIM_RENDER_MEMORY_MB", "0")) * 1024 * 1024
+RENDER_CPU_LIMIT = int(os.getenv("MANIM_RENDER_CPU_SECONDS", "0"))
+RENDER_CPU_QUOTA = float(os.getenv("MANIM_RENDER_CPU_QUOTA", "0"))
+RENDER_CGROUP_ROOT = os.getenv("MANIM_RENDER_CGROUP_ROOT", "")
+# Threads of the ffmpeg re-encodes requested with output_format/crf/preset;
+# Manim's own ffmpeg calls and the shard concat are not affected
+FFMPEG_THREADS = int(os.getenv("MANIM_FFMPEG_THREADS", "0"))
+
+# Inline frame previews: longest edge in pixels, encoding and lossy quality
+PREVIEW_MAX_SIZE = int(os.getenv("MANIM_PREVIEW_MAX_SIZE", "512"))
+PREVIEW_FORMAT = os.getenv("MANIM_PREVIEW_FORMAT", "jpeg")
+PREVIEW_QUALITY = int(os.getenv("MANIM_PREVIEW_QUALITY", "80"))
+
+# Per-render resource accounting: records kept for percentiles, and an
+# optional Prometheus textfile for the node exporter's textfile collector
+RENDER_STATS_HISTORY = int(os.getenv("MANIM_RENDER_STATS_HISTORY", "1000"))
+RENDER_STATS_TEXTFILE = os.getenv("MANIM_RENDER_STATS_TEXTFILE", "")
+RUSAGE_EXEC_SCRIPT = Path(__file__).resolve().parent / "rusage_exec.py"
+
+# Script handles returned by create_script
+SCRIPT_HANDLE_LIMIT = int(os.getenv("MANIM_SCRIPT_HANDLES", "10000"))
+
+# Directory summaries cached for get_workspace_info
+WORKSPACE_STATS_CACHE_DIRS = int(os.getenv("MANIM_WORKSPACE_STATS_CACHE_DIRS", "10000"))
+
+# Background removal of manim_work_* workspaces (0 disables a limit)
+WORKSPACE_MAX_BYTES = int(os.getenv("MANIM_WORKSPACE_MAX_MB", "5120")) * 1024 * 1024
+WORKSPACE_MAX_AGE = float(os.getenv("MANIM_WORKSPACE_TTL_HOURS", "72")) * 3600
+WORKSPACE_GC_INTERVAL = float(os.getenv("MANIM_WORKSPACE_GC_INTERVAL", "300"))
+
+# Limits applied to every Manim render; re-encodes only get ffmpeg_threads
+render_limits = RenderLimits(
+    memory_bytes=RENDER_MEMORY_LIMIT or None,
+    cpu_seconds=RENDER_CPU_LIMIT or None,
+    cpu_quota=RENDER_CPU_QUOTA or None,
+    ffmpeg_threads=FFMPEG_THREADS or None,
+    cgroup_root=Path(RENDER_CGROUP_ROOT) if RENDER_CGROUP_ROOT else None,
+)
+
+# The stores below create their files under BASE_DIR on first use, not on import
+
+# Render output cache shared by all render tools
+render_cache = RenderCache(RENDER_CACHE_DIR, RENDER_CACHE_MAX_BYTES)
+
+# Per-animation partial movies shared across all workspaces
+partial_cache = PartialMovieCache(PARTIAL_CACHE_DIR, PARTIAL_CACHE_MAX_BYTES)
+
+# Index of rendered videos answering find_videos
+video_catalog = VideoCatalog(CATALOG_DB)
+
+# Output of recent renders, read back with get_render_log
+render_logs = RenderLogStore(RENDER_LOG_DIR, RENDER_LOG_MAX_BYTES, RENDER_LOG_BACKUPS, RENDER_LOG_HISTORY)
+
+# Resource usage of recent renders, exposed by get_render_stats
+render_stats = RenderStats(
+    RENDER_STATS_HISTORY, Path(RENDER_STATS_TEXTFILE) if RENDER_STATS_TEXTFILE else None
+)
+
+# Scripts created by create_script, looked up by handle id
+script_registry = ScriptRegistry(SCRIPT_HANDLE_LIMIT)
+
+# Per-directory summaries reused across get_workspace_info calls
+workspace_stats = WorkspaceStatsCache(WORKSPACE_STATS_CACHE_DIRS)
+
+# Every render, synchronous or submitted, runs through this scheduler
+render_scheduler = RenderScheduler(RENDER_CONCURRENCY, RENDER_JOB_HISTORY)
+
+# Keeps BASE_DIR within budget without touching workspaces being rendered
+workspace_gc = WorkspaceGC(
+    BASE_DIR,
+    WORKSPACE_MAX_BYTES,
+    WORKSPACE_MAX_AGE,
+    measure=lambda path: workspace_stats.collect(path).total_bytes,
+    busy_paths=lambda: render_scheduler.busy_paths(),
+)
+
+def _limited_command(command: List[str]) -> List[str]:
+    """Run ``command`` under the render memory limit via ``rusage_exec.py``, if one is set."""
+    # Workers serve many jobs, so their CPU time is not limited
+    options = render_limits.exec_options(cpu=False)
+    if not options:
+        return command
+    return [command[0], str(RUSAGE_EXEC_SCRIPT), "-", *options, "--", *command]
+
+
+worker_pool: Optional[WorkerPool] = None
+if WORKER_POOL_SIZE > 0:
+    worker_pool = WorkerPool(
+        WORKER_POOL_SIZE,
+        WORKER_MAX_JOBS,
+        _limited_command([WORKER_PYTHON, str(WORKER_SCRIPT)]),
+        kill_grace=RENDER_KILL_GRACE,
+    )
+
+# Follow-up tasks of background renders, referenced until they finish
+_background_tasks: Set["asyncio.Future[Any]"] = set()
+
+# Workspace name prefix of each client session, when sessions are isolated
+_session_keys: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+# Sessions told about new and re-rendered videos
+resource_subscriptions = ResourceSubscriptions()
+
+
+class ManimServer(Server):
+    """Low-level server that also advertises resource subscriptions and list changes."""
+    
+    def get_capabilities(
+        self,
+        notification_options: NotificationOptions,
+        experimental_capabilities: Dict[str, Dict[str, Any]],
+    ) -> types.ServerCapabilities:
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None and types.SubscribeRequest in self.request_handlers:
+            capabilities.resources.subscribe = True
+            capabilities.resources.listChanged = True
+        return capabilities
+
 
 # Global server instance
-server = Server("manim-mcp-server-refactored")
+server = ManimServer("manim-mcp-server-refactored", version="0.2.0")
 
 
 class ManimError(Exception):
@@ -37,7 +266,10 @@ class ManimError(Exception):
 
 class ScriptValidationError(ManimError):
     """Exception for script validation errors."""
-    pass
+    
+    def __init__(self, message: str, findings: Sequence[Finding] = ()):
+        super().__init__(message)
+        self.findings = list(findings)
 
 
 class RenderError(ManimError):
@@ -45,6 +277,16 @@ class RenderError(ManimError):
     pass
 
 
+class RenderTimeoutError(RenderError):
+    """Exception for renders stopped after exceeding their timeout."""
+    pass
+
+
+class RenderLimitError(RenderError):
+    """Exception for renders that exceeded their memory or CPU limit."""
+    pass
+
+
 def validate_manim_code(code: str) -> bool:
     """
     Validate Manim code for security issues.
@@ -58,27 +300,114 @@ def validate_manim_code(code: str) -> bool:
     Raises:
         ScriptValidationError: If code contains dangerous patterns
     """
-    dangerous_patterns = [
-        "import os",
-        "import subprocess", 
-        "import sys",
-        "__import__",
-        "exec(",
-        "eval(",
-        "open(",
-        "file(",
-        "input(",
-        "raw_input(",
-    ]
-    
-    code_lower = code.lower()
-    for pattern in dangerous_patterns:
-        if pattern in code_lower:
-            raise ScriptValidationError(f"Potentially dangerous code pattern detected: {pattern}")
+    findings = analyze_code(code)
+    if findings:
+        raise ScriptValidationError(
+            f"Potentially dangerous code pattern detected: {findings[0]}", findings
+        )
     
     return True
 
 
+# Arguments shared by the synchronous and asynchronous render tools
+RENDER_PROPERTIES: Dict[str, Any] = {
+    "script_path": {
+        "type": "string",
+        "description": "Path to the Manim script file",
+    },
+    "script_id": {
+        "type": "string",
+        "description": "Script handle id returned by create_script (alternative to script_path)",
+    },
+    "output_dir": {
+        "type": "string",
+        "description": "Directory for video output (optional)",
+    },
+    "quality": {
+        "type": "string",
+        "description": "Render quality (low, medium, high, production)",
+        "enum": ["low", "medium", "high", "production"],
+    },
+    "preview": {
+        "type": "boolean",
+        "description": "Whether to open preview after rendering (default: true)",
+    },
+    "use_cache": {
+        "type": "boolean",
+        "description": "Reuse a previous identical render if available (default: true)",
+    },
+    "scenes": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Scene classes to render (default: all scenes in the script; several scenes render in parallel)",
+    },
+    "shards": {
+        "type": "integer",
+        "description": "Split a single scene into this many animation ranges rendered in parallel and joined with ffmpeg (default: 1)",
+    },
+    "output_format": {
+        "type": "string",
+        "description": "Container of the delivered video; anything but mp4 is encoded from Manim's MP4 with ffmpeg (default: mp4)",
+        "enum": list(OUTPUT_FORMATS),
+    },
+    "encoder_profile": {
+        "type": "string",
+        "description": "ffmpeg encoder profile: " + "; ".join(
+            f"{profile.name} ({profile.output_format}): {profile.description}"
+            for profile in ENCODER_PROFILES.values()
+        ),
+        "enum": list(ENCODER_PROFILES),
+    },
+    "crf": {
+        "type": "integer",
+        "description": "Override the profile's constant rate factor (lower is better quality and larger files)",
+        "minimum": 0,
+        "maximum": 63,
+    },
+    "encoder_preset": {
+        "type": "string",
+        "description": "Override the x264/x265 speed preset (e.g. ultrafast, veryfast, medium, slow)",
+    },
+    "frame_only": {
+        "type": "boolean",
+        "description": "Render only a single frame and return it inline as an image, like render_preview_frame (default: false)",
+    },
+    "animation_index": {
+        "type": "integer",
+        "description": "With frame_only: show the frame at the end of this animation instead of the final frame",
+        "minimum": 0,
+    },
+    "timeout": {
+        "type": "number",
+        "description": f"Seconds each render process may run before it and its children are killed; 0 disables the limit (default: {RENDER_TIMEOUT:g})",
+        "minimum": 0,
+    },
+    "progressive": {
+        "type": "boolean",
+        "description": "Return a low-quality proxy right away and render the requested quality as a background job (default: false)",
+    },
+}
+
+# Matrix axes of render_batch, accepted for the whole batch and per script
+BATCH_PROPERTIES: Dict[str, Any] = {
+    "scenes": {
+        "type": "array",
+        "items": {"type": "string"},
+        "description": "Scene classes to render (default: all scenes in the script)",
+    },
+    "qualities": {
+        "type": "array",
+        "items": {"type": "string", "enum": list(QUALITY_FLAGS)},
+        "description": "Qualities to render every scene at (default: ['medium'])",
+    },
+}
+
+# Render options of render_batch applied to every render in the batch
+BATCH_RENDER_OPTIONS = (
+    "use_cache", "output_format", "encoder_profile", "crf", "encoder_preset", "timeout",
+)
+
+
 @server.list_tools()
 async def handle_list_tools() -> List[types.Tool]:
     """List available tools."""
@@ -104,13 +433,44 @@ async def handle_list_tools() -> List[types.Tool]:
                     },
                     "validate": {
                         "type": "boolean",
-                        "description": "Whether to validate the script for security (default: true)",
+                        "description": "Whether to validate the script for security (default: true; false is rejected unless the server allows it)",
+                    },
+                    "parent_id": {
+                        "type": "string",
+                        "description": "Script id this script revises; it is written to the parent's workspace like revise_script (optional)",
                     }
                 },
                 "required": ["code"],
             },
         ),
         
+        types.Tool(
+            name="revise_script",
+            description="Save an edited version of a script next to it, so renders re-render only the animations that changed",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "script_id": {
+                        "type": "string",
+                        "description": "Script id of the version being revised",
+                    },
+                    "code": {
+                        "type": "string",
+                        "description": "The revised Manim Python code",
+                    },
+                    "script_name": {
+                        "type": "string",
+                        "description": "Name of the new script file without extension (default: the parent's name with a revision suffix, e.g. 'scene_r2')",
+                    },
+                    "validate": {
+                        "type": "boolean",
+                        "description": "Whether to validate the script for security (default: true; false is rejected unless the server allows it)",
+                    }
+                },
+                "required": ["script_id", "code"],
+            },
+        ),
+        
         types.Tool(
             name="validate_script",
             description="Validate Manim script for security issues",
@@ -130,35 +490,197 @@ async def handle_list_tools() -> List[types.Tool]:
         types.Tool(
             name="render_animation",
             description="Execute Manim rendering for a script file",
+            inputSchema={
+                "type": "object",
+                "properties": dict(RENDER_PROPERTIES),
+            },
+        ),
+        
+        types.Tool(
+            name="render_preview_frame",
+            description="Render a single frame of a scene (the last frame, or the end of one animation) and return it inline as an image",
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path to the Manim script file",
-                    },
-                    "output_dir": {
+                    "script_path": RENDER_PROPERTIES["script_path"],
+                    "script_id": RENDER_PROPERTIES["script_id"],
+                    "scene": {
                         "type": "string",
-                        "description": "Directory for video output (optional)",
+                        "description": "Scene to preview (default: the first scene in the script)",
                     },
+                    "animation_index": RENDER_PROPERTIES["animation_index"],
                     "quality": {
+                        **RENDER_PROPERTIES["quality"],
+                        "description": "Render quality (default: low)",
+                    },
+                    "max_size": {
+                        "type": "integer",
+                        "description": f"Longest edge of the returned image in pixels (default: {PREVIEW_MAX_SIZE}; 0 keeps the rendered size)",
+                        "minimum": 0,
+                    },
+                    "image_format": {
                         "type": "string",
-                        "description": "Render quality (low, medium, high, production)",
-                        "enum": ["low", "medium", "high", "production"]
+                        "description": f"Encoding of the returned image (default: {PREVIEW_FORMAT})",
+                        "enum": list(PREVIEW_FORMATS),
                     },
+                },
+            },
+        ),
+        
+        # Render Job Tools
+        types.Tool(
+            name="submit_render",
+            description="Queue a Manim render in the background and return a job id",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    **RENDER_PROPERTIES,
                     "preview": {
                         "type": "boolean",
-                        "description": "Whether to open preview after rendering (default: true)",
+                        "description": "Whether to open preview after rendering (default: false)",
+                    },
+                    "priority": {
+                        "type": "integer",
+                        "description": "Higher priorities run first; equal priorities run in submission order (default: 0)",
+                    },
+                },
+            },
+        ),
+        
+        types.Tool(
+            name="render_batch",
+            description="Render several scripts, each at several scenes and qualities, as parallel jobs and return one combined result with per-render status, timings and output paths",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "items": {
+                        "type": "array",
+                        "description": "Scripts to render; 'scenes', 'qualities' and 'output_dir' override the batch defaults per script",
+                        "minItems": 1,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "script_path": RENDER_PROPERTIES["script_path"],
+                                "script_id": RENDER_PROPERTIES["script_id"],
+                                "scenes": BATCH_PROPERTIES["scenes"],
+                                "qualities": BATCH_PROPERTIES["qualities"],
+                                "output_dir": RENDER_PROPERTIES["output_dir"],
+                            },
+                        },
+                    },
+                    **BATCH_PROPERTIES,
+                    "output_dir": RENDER_PROPERTIES["output_dir"],
+                    "use_cache": RENDER_PROPERTIES["use_cache"],
+                    "output_format": RENDER_PROPERTIES["output_format"],
+                    "encoder_profile": RENDER_PROPERTIES["encoder_profile"],
+                    "crf": RENDER_PROPERTIES["crf"],
+                    "encoder_preset": RENDER_PROPERTIES["encoder_preset"],
+                    "timeout": RENDER_PROPERTIES["timeout"],
+                    "priority": {
+                        "type": "integer",
+                        "description": "Priority of every render in the batch; higher priorities run first (default: 0)",
+                    },
+                },
+                "required": ["items"],
+            },
+        ),
+        
+        types.Tool(
+            name="get_render_status",
+            description="Get the state of a render job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job id returned by submit_render",
+                    }
+                },
+                "required": ["job_id"],
+            },
+        ),
+        
+        types.Tool(
+            name="get_render_result",
+            description="Get the result of a finished render job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job id returned by submit_render",
+                    },
+                    "wait": {
+                        "type": "boolean",
+                        "description": "Whether to wait for the job to finish (default: false)",
+                    }
+                },
+                "required": ["job_id"],
+            },
+        ),
+        
+        types.Tool(
+            name="cancel_render",
+            description="Cancel a queued or running render job",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "job_id": {
+                        "type": "string",
+                        "description": "Job id returned by submit_render",
                     }
                 },
-                "required": ["script_path"],
+                "required": ["job_id"],
+            },
+        ),
+        
+        types.Tool(
+            name="get_render_log",
+            description="Read part of a render's full output log (log id from a render result or error)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "log_id": {
+                        "type": "string",
+                        "description": "Log id reported by the render",
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Byte offset to start reading at; negative values count back from the end (default: 0)",
+                    },
+                    "length": {
+                        "type": "integer",
+                        "description": f"Number of bytes to read (default: {DEFAULT_READ_BYTES}, at most {MAX_READ_BYTES})",
+                        "minimum": 1,
+                    },
+                },
+                "required": ["log_id"],
+            },
+        ),
+        
+        types.Tool(
+            name="get_render_stats",
+            description="Summarize the wall time, CPU time, peak memory of the largest process, output size and frame count of recent renders as percentiles",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "quality": {
+                        **RENDER_PROPERTIES["quality"],
+                        "description": "Only renders of this quality (default: all)",
+                    },
+                    "last": {
+                        "type": "integer",
+                        "description": f"Only the most recent N renders (default: all {RENDER_STATS_HISTORY} kept)",
+                        "minimum": 1,
+                    },
+                },
             },
         ),
         
         # File Management Tools
         types.Tool(
             name="find_videos",
-            description="Find video files in specified directory",
+            description="Find video files in specified directory, newest first",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -168,11 +690,33 @@ async def handle_list_tools() -> List[types.Tool]:
                     },
                     "pattern": {
                         "type": "string",
-                        "description": "File pattern to match (default: '*.mp4')",
+                        "description": "File name pattern to match, e.g. 'Intro*.mp4'; patterns with a '/' also match directories (default: '*.mp4')",
                     },
                     "recursive": {
                         "type": "boolean",
                         "description": "Whether to search recursively (default: true)",
+                    },
+                    "scene": {
+                        "type": "string",
+                        "description": "Only videos of this scene",
+                    },
+                    "script_id": {
+                        "type": "string",
+                        "description": "Only videos rendered from this script handle's content",
+                    },
+                    "quality": {
+                        "type": "string",
+                        "description": "Only videos of this quality (low, medium, high, production, or e.g. '720p30')",
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Maximum number of videos to return (default: 100)",
+                        "minimum": 1,
+                    },
+                    "offset": {
+                        "type": "integer",
+                        "description": "Number of videos to skip, for paging (default: 0)",
+                        "minimum": 0,
                     }
                 },
                 "required": ["search_dir"],
@@ -256,10 +800,28 @@ async def handle_call_tool(
     try:
         if name == "create_script":
             return await _handle_create_script(arguments)
+        elif name == "revise_script":
+            return await _handle_revise_script(arguments)
         elif name == "validate_script":
             return await _handle_validate_script(arguments)
         elif name == "render_animation":
             return await _handle_render_animation(arguments)
+        elif name == "render_preview_frame":
+            return await _handle_render_preview_frame(arguments)
+        elif name == "submit_render":
+            return await _handle_submit_render(arguments)
+        elif name == "render_batch":
+            return await _handle_render_batch(arguments)
+        elif name == "get_render_status":
+            return await _handle_get_render_status(arguments)
+        elif name == "get_render_result":
+            return await _handle_get_render_result(arguments)
+        elif name == "cancel_render":
+            return await _handle_cancel_render(arguments)
+        elif name == "get_render_log":
+            return await _handle_get_render_log(arguments)
+        elif name == "get_render_stats":
+            return await _handle_get_render_stats(arguments)
         elif name == "find_videos":
             return await _handle_find_videos(arguments)
         elif name == "get_workspace_info":
@@ -280,6 +842,115 @@ async def handle_call_tool(
         ]
 
 
+# Resource Handlers
+
+@server.list_resources()
+async def handle_list_resources() -> List[types.Resource]:
+    """List the newest rendered videos this client may read."""
+    session = _request_session()
+    if session is not None:
+        resource_subscriptions.listen(session)
+    prefix = _session_workspace_prefix()
+    path_prefix = str(BASE_DIR.resolve() / prefix) if prefix else ""
+    records = await asyncio.to_thread(video_catalog.recent, path_prefix, RESOURCE_LIST_LIMIT)
+    
+    resources = []
+    for record in records:
+        path = Path(record.path)
+        if not path.is_file():
+            continue
+        details = ", ".join(
+            part for part in (
+                record.scene,
+                record.quality,
+                f"{record.duration:.1f}s" if record.duration else None,
+            ) if part
+        )
+        resources.append(
+            types.Resource(
+                uri=AnyUrl(video_uri(path)),
+                name=path.name,
+                description=(
+                    f"Rendered video ({details}); reads return at most {RESOURCE_CHUNK_BYTES} bytes, "
+                    f"add ?offset=N&length=N to fetch larger files in ranges"
+                ),
+                mimeType=mime_type(path),
+                size=record.size,
+            )
+        )
+    return resources
+
+
+@server.list_resource_templates()
+async def handle_list_resource_templates() -> List[types.ResourceTemplate]:
+    """Describe how to address byte ranges of rendered videos."""
+    return [
+        types.ResourceTemplate(
+            uriTemplate=VIDEO_URI_TEMPLATE,
+            name="video-range",
+            description=(
+                f"Byte range of a rendered video by absolute path; length defaults to and "
+                f"is capped at {RESOURCE_CHUNK_BYTES} bytes"
+            ),
+        )
+    ]
+
+
+@server.read_resource()
+async def handle_read_resource(uri: AnyUrl) -> List[ReadResourceContents]:
+    """Return a byte range of a rendered video, base64-encoded by the server."""
+    path, offset, length = _video_resource(str(uri))
+    data = await asyncio.to_thread(
+        read_range, path, offset, min(length or RESOURCE_CHUNK_BYTES, RESOURCE_CHUNK_BYTES)
+    )
+    return [ReadResourceContents(content=data, mime_type=mime_type(path))]
+
+
+@server.subscribe_resource()
+async def handle_subscribe_resource(uri: AnyUrl) -> None:
+    """Notify the client whenever a video is rendered again."""
+    path, _, _ = _video_resource(str(uri))
+    resource_subscriptions.subscribe(_request_session(), video_uri(path))
+
+
+@server.unsubscribe_resource()
+async def handle_unsubscribe_resource(uri: AnyUrl) -> None:
+    """Stop notifying the client about a video."""
+    path, _, _ = _video_resource(str(uri))
+    resource_subscriptions.unsubscribe(_request_session(), video_uri(path))
+
+
+def _video_resource(uri: str) -> Tuple[Path, int, Optional[int]]:
+    """
+    Return the cataloged video a resource URI names and the byte range it asks for.
+    
+    Raises:
+        ValueError: If the URI is malformed or names a file that is not a
+            rendered video this client may read
+    """
+    path, offset, length = parse_video_uri(uri)
+    if not _is_client_path(path) or video_catalog.get(path) is None or not path.is_file():
+        raise ValueError(f"Unknown resource: {uri}")
+    return path, offset, length
+
+
+async def _notify_resources(videos: Sequence[Path]) -> None:
+    """Tell interested clients that videos were added or rewritten."""
+    for session, subscribed in resource_subscriptions.listeners():
+        visible = [video for video in videos if _is_client_path(video, session)]
+        if not visible:
+            continue
+        try:
+            for video in visible:
+                uri = video_uri(video)
+                if uri in subscribed:
+                    await session.send_resource_updated(AnyUrl(uri))
+            await session.send_resource_list_changed()
+        except Exception:
+            # The client may have disconnected; it can list resources again
+            pass
+
+
 # Tool Implementation Functions
 
 async def _handle_create_script(arguments: Dict[str, Any]) -> List[types.TextContent]:
@@ -288,51 +959,157 @@ async def _handle_create_script(arguments: Dict[str, Any]) -> List[types.TextCon
     if not code:
         raise ValueError("Missing required argument: code")
     
-    script_dir_str = arguments.get("script_dir")
-    script_name = arguments.get("script_name", "scene")
+    parent = None
+    if arguments.get("parent_id"):
+        if arguments.get("script_dir"):
+            raise ValueError("script_dir cannot be combined with parent_id: revisions are written to the parent's workspace")
+        parent = _resolve_script_handle(arguments["parent_id"])
+    
     validate = arguments.get("validate", True)
+    if not validate and not ALLOW_UNVALIDATED_SCRIPTS:
+        raise ValueError(
+            "validate: false is not allowed on this server "
+            "(the operator can enable it with MANIM_ALLOW_UNVALIDATED_SCRIPTS=1)"
+        )
+    try:
+        handle = _create_script(
+            code,
+            arguments.get("script_dir"),
+            arguments.get("script_name") or ("scene" if parent is None else None),
+            validate,
+            parent,
+        )
+    except ScriptValidationError as e:
+        return [
+            types.TextContent(
+                type="text",
+                text=f"❌ Script validation failed: {str(e)}"
+            )
+        ]
+    
+    revision_text = ""
+    if parent is not None:
+        added, removed = _diff_stats(parent.path.read_text(encoding="utf-8"), code)
+        revision_text = (
+            f"🧬 Revision {handle.revision} of {parent.id} ({parent.path.name})\n"
+            f"✏️ Changes: +{added} -{removed} lines\n"
+        )
+    
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"✅ Script created successfully!\n\n"
+                f"🆔 Script id: {handle.id}\n"
+                f"📄 Script path: {handle.path}\n"
+                f"📁 Directory: {handle.workspace}\n"
+                f"#️⃣ Content hash: {handle.content_hash}\n"
+                f"{revision_text}"
+                f"🔍 Validated: {'Yes' if validate else 'No'}\n\n"
+                f"Use 'render_animation' with this script id (or path) to render this script."
+            )
+        )
+    ]
+
+
+async def _handle_revise_script(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle saving a revision of a script."""
+    script_id = arguments.get("script_id")
+    if not script_id:
+        raise ValueError("Missing required argument: script_id")
+    return await _handle_create_script({
+        "code": arguments.get("code"),
+        "script_name": arguments.get("script_name"),
+        "validate": arguments.get("validate", True),
+        "parent_id": script_id,
+    })
+
+
+# Suffix of revision script names ("scene_r2"), stripped before numbering the next revision
+_REVISION_SUFFIX = re.compile(r"_r\d+$")
+
+
+def _create_script(
+    code: str,
+    script_dir_str: Optional[str],
+    script_name: Optional[str],
+    validate: bool = True,
+    parent: Optional[ScriptHandle] = None,
+) -> ScriptHandle:
+    """
+    Write a script and register a handle for it.
+    
+    A revision of ``parent`` is written to the parent's workspace, under
+    ``script_name`` or the parent's name with a revision suffix, so it
+    renders into the same media directory and can reuse the parent's
+    animations. It never replaces an existing file.
     
-    # Validate code if requested
+    Raises:
+        ScriptValidationError: If ``validate`` is set and the code is unsafe
+        ValueError: If ``script_name`` is not a plain file name, or a
+            revision's ``script_name`` is already taken
+        ManimError: If the script cannot be written
+    """
+    if script_name is not None and (
+        script_name in ("", ".", "..") or "/" in script_name or "\\" in script_name
+    ):
+        raise ValueError(f"script_name must be a file name without directories: {script_name!r}")
     if validate:
-        try:
-            validate_manim_code(code)
-        except ScriptValidationError as e:
-            return [
-                types.TextContent(
-                    type="text",
-                    text=f"❌ Script validation failed: {str(e)}"
-                )
-            ]
+        validate_manim_code(code)
     
     # Determine script directory
-    if script_dir_str:
-        script_dir = Path(script_dir_str).expanduser().resolve()
+    if parent is not None:
+        script_dir = parent.workspace
+    elif script_dir_str:
+        script_dir = _client_path(script_dir_str, "script_dir")
     else:
         # Create temporary directory
-        work_dir_name = f"manim_work_{uuid.uuid4().hex[:8]}"
-        script_dir = BASE_DIR / work_dir_name
+        work_dir_name = f"{_session_workspace_prefix() or WORKSPACE_PREFIX}{uuid.uuid4().hex[:8]}"
+        script_dir = BASE_DIR.resolve() / work_dir_name
     
-    script_dir.mkdir(parents=True, exist_ok=True)
-    script_path = script_dir / f"{script_name}.py"
+    revision = None
+    if parent is None or script_name:
+        script_path = script_dir / f"{script_name}.py"
+        if not _is_client_path(script_path):
+            raise ValueError(f"script_name is outside this session's workspaces: {script_path}")
     
+    encoded = code.encode("utf-8")
     try:
-        script_path.write_text(code, encoding="utf-8")
-        
-        return [
-            types.TextContent(
-                type="text",
-                text=(
-                    f"✅ Script created successfully!\n\n"
-                    f"📄 Script path: {script_path}\n"
-                    f"📁 Directory: {script_dir}\n"
-                    f"🔍 Validated: {'Yes' if validate else 'No'}\n\n"
-                    f"Use 'render_animation' tool to render this script."
-                )
-            )
-        ]
-        
-    except Exception as e:
+        script_dir.mkdir(parents=True, exist_ok=True)
+        if parent is None:
+            script_path.write_bytes(encoded)
+        elif script_name:
+            try:
+                with open(script_path, "xb") as f:
+                    f.write(encoded)
+            except FileExistsError:
+                raise ValueError(f"Script already exists; choose another script_name: {script_path}")
+        else:
+            # Claim the first free revision number; concurrent revisions get distinct files
+            base = _REVISION_SUFFIX.sub("", parent.path.stem)
+            revision = parent.revision + 1
+            while True:
+                script_path = script_dir / f"{base}_r{revision}.py"
+                try:
+                    with open(script_path, "xb") as f:
+                        f.write(encoded)
+                    break
+                except FileExistsError:
+                    revision += 1
+    except OSError as e:
         raise ManimError(f"Failed to create script: {str(e)}")
+    return script_registry.register(script_path, encoded, parent, revision)
+
+
+def _diff_stats(old: str, new: str) -> Tuple[int, int]:
+    """Return the number of lines added and removed between two versions of a script."""
+    added = removed = 0
+    for line in difflib.unified_diff(old.splitlines(), new.splitlines(), n=0, lineterm=""):
+        if line.startswith("+") and not line.startswith("+++"):
+            added += 1
+        elif line.startswith("-") and not line.startswith("---"):
+            removed += 1
+    return added, removed
 
 
 async def _handle_validate_script(arguments: Dict[str, Any]) -> List[types.TextContent]:
@@ -350,84 +1127,1610 @@ async def _handle_validate_script(arguments: Dict[str, Any]) -> List[types.TextC
             )
         ]
     except ScriptValidationError as e:
+        finding_list = "\n".join(f"- {finding}" for finding in e.findings)
         return [
             types.TextContent(
                 type="text",
-                text=f"❌ Script validation failed: {str(e)}"
+                text=(
+                    f"❌ Script validation failed: {len(e.findings)} issue(s) found\n\n"
+                    f"{finding_list}"
+                )
             )
         ]
 
 
 async def _handle_render_animation(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle animation rendering."""
-    script_path_str = arguments.get("script_path")
-    if not script_path_str:
-        raise ValueError("Missing required argument: script_path")
-    
-    script_path = Path(script_path_str).expanduser().resolve()
+    if arguments.get("frame_only"):
+        return await _handle_render_preview_frame(arguments)
+    if arguments.get("progressive") and arguments.get("quality", "medium") != "low":
+        return await _render_progressive(arguments)
+    factory, needs_slot = _plan_render(arguments, _request_progress_callback())
+    return await render_scheduler.run(
+        factory,
+        description=str(_resolve_script_path(arguments)),
+        needs_slot=needs_slot,
+        paths=_render_paths(arguments),
+    )
+
+
+async def _handle_render_preview_frame(
+    arguments: Dict[str, Any]
+) -> List[types.TextContent | types.ImageContent]:
+    """Handle single-frame preview rendering."""
+    script_path = _resolve_script_path(arguments)
+    scenes = arguments.get("scenes") or []
+    scene = arguments.get("scene") or (scenes[0] if scenes else None)
+    if scene is None:
+        discovered = _discover_scenes_in(script_path)
+        if not discovered:
+            raise ValueError(f"No scenes found in script: {script_path}")
+        scene = discovered[0]
+    
+    index = arguments.get("animation_index")
+    frame_args = {
+        "script_path": str(script_path),
+        "output_dir": arguments.get("output_dir"),
+        "quality": arguments.get("quality", "low"),
+        "preview": False,
+        "use_cache": False,
+        "scenes": [scene],
+        "save_last_frame": True,
+    }
+    if index is not None:
+        # Stop after the chosen animation so its final frame is the one saved
+        frame_args["animation_range"] = [0, int(index)]
+    
+    media_dir = _media_dir_for(script_path, arguments.get("output_dir"))
+    started = time.time()
+    timer = time.perf_counter()
+    await render_scheduler.run(
+        lambda: _render_animation(frame_args),
+        description=f"{script_path}::{scene} (frame)",
+        paths=_render_paths(frame_args),
+    )
+    elapsed = time.perf_counter() - timer
+    
+    # Manim names the frame "<Scene>_ManimCE_v<version>.png"
+    images_dir = media_dir / "images" / script_path.stem
+    frames = [
+        path for pattern in (f"{scene}.png", f"{scene}_ManimCE_v*.png")
+        for path in images_dir.glob(pattern)
+        if path.stat().st_mtime >= started
+    ]
+    if not frames:
+        raise RenderError(f"Manim did not save a frame for scene {scene}")
+    frame = max(frames, key=lambda path: path.stat().st_mtime)
+    
+    image = await asyncio.to_thread(
+        encode_preview,
+        frame,
+        int(arguments.get("max_size", PREVIEW_MAX_SIZE)),
+        arguments.get("image_format", PREVIEW_FORMAT),
+        PREVIEW_QUALITY,
+    )
+    position = f"end of animation {index}" if index is not None else "last frame"
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"🖼️ Frame preview rendered!\n\n"
+                f"📄 Script: {script_path}\n"
+                f"🎞️ Scene: {scene} ({position})\n"
+                f"⏱️ Render time: {elapsed:.2f}s\n"
+                f"📐 Size: {image.size[0]}x{image.size[1]} "
+                f"(rendered {image.original_size[0]}x{image.original_size[1]})\n"
+                f"📦 Image: {len(image.data) / 1024:.1f} KB {image.mime_type} "
+                f"(PNG on disk {image.original_bytes / 1024:.1f} KB)\n"
+                f"📁 Frame file: {frame}"
+            )
+        ),
+        types.ImageContent(
+            type="image",
+            data=base64.b64encode(image.data).decode("ascii"),
+            mimeType=image.mime_type,
+        ),
+    ]
+
+
+async def _render_progressive(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """
+    Render a low-quality proxy now and queue the requested quality in the background.
+    
+    Manim writes each quality to its own directory, so the proxy stays next to
+    the final video. The client can poll the upgrade job or wait for the log
+    notification sent when it finishes.
+    """
+    quality = arguments.get("quality", "medium")
+    proxy_args = {**arguments, "quality": "low", "progressive": False}
+    proxy_result = await _handle_render_animation(proxy_args)
+    
+    session = _request_session()
+    upgrade_args = {**arguments, "progressive": False, "preview": False}
+    job = _submit_background_render(
+        upgrade_args,
+        description=f"{_resolve_script_path(arguments)} (upgrade to {quality})",
+        on_done=lambda job: _notify_upgrade(session, job, upgrade_args),
+    )
+    
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"⚡ Low-quality proxy ready; {quality} render queued in the background.\n\n"
+                f"{proxy_result[0].text}\n\n"
+                f"🆙 Upgrade job: {job.id} ({quality}, state: {job.state.value})\n"
+                f"Use 'get_render_status' or 'get_render_result' with this job id; "
+                f"a log notification is sent when the {quality} video is ready."
+            )
+        )
+    ]
+
+
+async def _notify_upgrade(
+    session: Optional[Any], job: RenderJob, arguments: Dict[str, Any]
+) -> None:
+    """Tell the client that a progressive render's background upgrade finished."""
+    if session is None:
+        return
+    data: Dict[str, Any] = {
+        "event": "render_upgraded" if job.state is JobState.SUCCEEDED else "render_upgrade_failed",
+        "job_id": job.id,
+        "quality": arguments.get("quality", "medium"),
+    }
+    if job.state is JobState.SUCCEEDED:
+        script_path = _resolve_script_path(arguments)
+        media_dir = _media_dir_for(script_path, arguments.get("output_dir"))
+        data["videos"] = [
+            str(video) for video in _collect_render_outputs(
+                media_dir, script_path.stem, job.started_at or 0, arguments.get("scenes") or ()
+            )
+        ]
+    else:
+        data["error"] = job.error
+    try:
+        await session.send_log_message(level="info", data=data, logger="manim-mcp-server")
+    except Exception:
+        # The client may have disconnected; the job record still holds the result
+        pass
+
+
+def _plan_render(
+    arguments: Dict[str, Any],
+    progress: Optional[ProgressCallback] = None,
+    priority: int = 0,
+) -> Tuple[JobFactory, bool]:
+    """
+    Choose how to render a request.
+    
+    Returns:
+        The job factory and whether it needs a scheduler slot. Sharded and
+        multi-scene renders return slotless coordinators that schedule one
+        job per shard or scene.
+    """
+    _encoder_profile_for(arguments)  # reject bad encoding options before queueing
+    _render_timeout(arguments)
+    shards = int(arguments.get("shards") or 1)
+    if shards > 1:
+        return (lambda: _render_sharded(arguments, shards, progress, priority)), False
+    scenes = _plan_scene_fanout(arguments)
+    if scenes is not None:
+        return (lambda: _render_scenes_parallel(arguments, scenes, progress, priority)), False
+    return (lambda: _render_animation(arguments, progress)), True
+
+
+def _resolve_script_handle(script_id: str, require_file: bool = True) -> ScriptHandle:
+    """
+    Return the handle of a script this client may use.
+    
+    Unless ``require_file`` is off, the script must still exist with the
+    content it was created with: another workflow writing the same
+    ``script_dir``/``script_name`` must not swap the script behind an id.
+    
+    Raises:
+        ValueError: If the id is unknown or belongs to another session, or
+            the script was deleted or rewritten since it was created
+    """
+    handle = script_registry.get(script_id)
+    if handle is None or not _is_client_path(handle.path):
+        raise ValueError(f"Unknown script id: {script_id}")
+    if not require_file:
+        return handle
+    try:
+        code = handle.path.read_bytes()
+    except FileNotFoundError:
+        raise ValueError(f"Script file not found: {handle.path}")
+    except OSError as e:
+        raise ValueError(f"Cannot read script {handle.path}: {str(e)}")
+    if content_hash(code) != handle.content_hash:
+        raise ValueError(
+            f"Script {handle.path} was rewritten after {script_id} was created; "
+            f"create it again to get an id for the new content"
+        )
+    return handle
+
+
+def _resolve_script_path(arguments: Dict[str, Any]) -> Path:
+    """Return the existing script referenced by the ``script_id`` or ``script_path`` argument."""
+    script_id = arguments.get("script_id")
+    if script_id:
+        return _resolve_script_handle(script_id).path
+    else:
+        script_path_str = arguments.get("script_path")
+        if not script_path_str:
+            raise ValueError("Missing required argument: script_path")
+        script_path = _client_path(script_path_str, "script_path")
     if not script_path.exists():
         raise ValueError(f"Script file not found: {script_path}")
+    return script_path
+
+
+def _render_paths(arguments: Dict[str, Any]) -> List[Path]:
+    """
+    Return the directories a render request uses and mark their workspaces as used.
+    
+    The scheduler reports these paths as busy until the job finishes, which
+    keeps the workspace garbage collector away from them.
+    """
+    paths = [_resolve_script_path(arguments).parent]
+    if arguments.get("output_dir"):
+        paths.append(_client_path(arguments["output_dir"], "output_dir"))
+    base_dir = BASE_DIR.resolve()
+    for path in paths:
+        if base_dir in path.parents:
+            touch_workspace(base_dir / path.relative_to(base_dir).parts[0])
+    return paths
+
+
+def _plan_scene_fanout(arguments: Dict[str, Any]) -> Optional[List[str]]:
+    """Return the scenes to render as separate parallel jobs, or None for a single render."""
+    scenes = _requested_scenes(_resolve_script_path(arguments), arguments.get("scenes"))
+    return scenes if len(scenes) > 1 else None
+
+
+def _requested_scenes(script_path: Path, requested: Optional[Sequence[str]]) -> List[str]:
+    """
+    Return the requested scenes without duplicates, or all scenes in the script.
+    
+    Raises:
+        ValueError: If a requested scene is not defined in the script
+    """
+    # A script that does not parse yields no scenes; manim reports the error
+    discovered = _discover_scenes_in(script_path)
+    
+    if not requested:
+        return discovered
+    unknown = [scene for scene in requested if discovered and scene not in discovered]
+    if unknown:
+        raise ValueError(
+            f"Scene(s) not found in script: {', '.join(unknown)} "
+            f"(available: {', '.join(discovered)})"
+        )
+    return list(dict.fromkeys(requested))
+
+
+async def _render_scenes_parallel(
+    arguments: Dict[str, Any],
+    scenes: List[str],
+    progress: Optional[ProgressCallback] = None,
+    priority: int = 0,
+) -> List[types.TextContent]:
+    """Render each scene as its own scheduled job and combine the per-scene results."""
+    script_path_str = str(_resolve_script_path(arguments))
+    latest: Dict[str, float] = {}
+    
+    def scene_progress(scene: str) -> Optional[ProgressCallback]:
+        if progress is None:
+            return None
+        
+        async def notify(value: float, message: str) -> None:
+            # Sum per-scene progress so the combined value stays monotonic
+            latest[scene] = value
+            await progress(sum(latest.values()), f"{scene}: {message}")
+        
+        return notify
+    
+    async def render_scene(scene: str) -> Tuple[float, List[Any]]:
+        timer = time.perf_counter()
+        contents = await render_scheduler.run(
+            lambda: _render_animation({**arguments, "scenes": [scene]}, scene_progress(scene)),
+            priority=priority,
+            description=f"{script_path_str}::{scene}",
+        )
+        return time.perf_counter() - timer, contents
+    
+    timer = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(render_scene(scene) for scene in scenes), return_exceptions=True
+    )
+    elapsed = time.perf_counter() - timer
+    
+    failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+    if len(failures) == len(scenes):
+        errors = "\n".join(f"- {scene}: {outcome}" for scene, outcome in zip(scenes, outcomes))
+        raise RenderError(f"All scenes failed to render:\n{errors}")
+    
+    scene_lines = []
+    attachments = []
+    for scene, outcome in zip(scenes, outcomes):
+        if isinstance(outcome, BaseException):
+            scene_lines.append(f"- ❌ {scene}: {outcome}")
+            continue
+        scene_elapsed, contents = outcome
+        scene_lines.append(f"- ✅ {scene}: rendered in {scene_elapsed:.2f}s")
+        scene_lines.extend(f"   {line}" for line in _scene_details(contents))
+        attachments.extend(content for content in contents if not isinstance(content, types.TextContent))
+    
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"{'✅' if not failures else '⚠️'} Rendered {len(scenes) - len(failures)}/{len(scenes)} scene(s) in parallel\n\n"
+                f"📄 Script: {script_path_str}\n"
+                f"⏱️ Wall time: {elapsed:.2f}s\n\n"
+                f"🎞️ Scenes:\n" + "\n".join(scene_lines) + "\n\n"
+                f"Use 'find_videos' tool to locate generated videos."
+            )
+        ),
+        *attachments,
+    ]
+
+
+def _scene_details(contents: Sequence[Any]) -> List[str]:
+    """
+    Return the per-render lines of a single-scene render result.
+    
+    The heading, script, quality and output dir (shared by every scene of a
+    fan-out), the output tail and the closing hint are left out; the videos, log id, cache
+    and encode lines are kept.
+    """
+    lines = []
+    for content in contents:
+        if not isinstance(content, types.TextContent):
+            continue
+        text = content.text.split("\n📋 Output:", 1)[0]
+        for line in text.splitlines()[1:]:
+            if line.strip() and not line.startswith(("📄 Script:", "🎬 Quality:", "📁 Output dir:", "Use '")):
+                lines.append(line)
+    return lines
+
+
+async def _render_sharded(
+    arguments: Dict[str, Any],
+    shards: int,
+    progress: Optional[ProgressCallback] = None,
+    priority: int = 0,
+) -> List[types.TextContent]:
+    """Render one scene as parallel animation-range shards joined with ffmpeg."""
+    script_path = _resolve_script_path(arguments)
+    code = script_path.read_text(encoding="utf-8")
+    scenes = list(arguments.get("scenes") or []) or _discover_scenes_in(script_path)
+    if len(scenes) != 1:
+        raise ValueError(
+            "Sharded rendering needs exactly one scene; "
+            "pass 'scenes' with a single scene name"
+        )
+    scene = scenes[0]
+    scene_args = {**arguments, "scenes": [scene]}
+    
+    animation_count = estimate_animation_count(code, scene)
+    if animation_count is None or animation_count < 2:
+        # The animation count depends on runtime control flow; render normally
+        result = await render_scheduler.run(
+            lambda: _render_animation(scene_args, progress),
+            priority=priority,
+            description=f"{script_path}::{scene}",
+        )
+        note = "ℹ️ Sharding skipped: the scene's animation count could not be determined statically.\n\n"
+        return [types.TextContent(type="text", text=note + result[0].text)]
+    
+    quality = arguments.get("quality", "medium")
+    output_dir_str = arguments.get("output_dir")
+    media_dir = _media_dir_for(script_path, output_dir_str)
+    
+    cache_key = None
+    if arguments.get("use_cache", True) and render_cache.enabled:
+        # Same key as an unsharded render: the joined video is equivalent
+        cache_key = make_cache_key(
+            code.encode("utf-8"), quality, [*QUALITY_FLAGS.get(quality, ["-qm"]), scene]
+        )
+        cached = await _serve_from_cache(
+            cache_key, script_path, media_dir, quality, output_dir_str, arguments
+        )
+        if cached is not None:
+            return cached
+    
+    ranges = plan_shards(animation_count, shards)
+    shard_root = media_dir / ".shards" / uuid.uuid4().hex[:8]
+    latest: Dict[int, float] = {}
+    
+    def shard_progress(index: int) -> Optional[ProgressCallback]:
+        if progress is None:
+            return None
+        start = ranges[index][0]
+        
+        async def notify(value: float, message: str) -> None:
+            # Manim numbers animations absolutely; count each shard from its start
+            latest[index] = max(0.0, value - start)
+            await progress(sum(latest.values()), f"shard {index}: {message}")
+        
+        return notify
+    
+    def render_shard(index: int) -> "asyncio.Future[Any]":
+        shard_args = {
+            **scene_args,
+            "output_dir": str(shard_root / f"{index:03d}"),
+            "animation_range": list(ranges[index]),
+            "use_cache": False,
+            "preview": False,
+        }
+        return asyncio.ensure_future(render_scheduler.run(
+            lambda: _render_animation(shard_args, shard_progress(index)),
+            priority=priority,
+            description=f"{script_path}::{scene}[{format_range_flag(ranges[index])}]",
+        ))
+    
+    timer = time.perf_counter()
+    tasks = [render_shard(index) for index in range(len(ranges))]
+    try:
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        
+        shard_videos = []
+        for index in range(len(ranges)):
+            shard_dir = shard_root / f"{index:03d}"
+            videos = _collect_render_outputs(shard_dir, script_path.stem, 0, [scene])
+            if not videos:
+                raise RenderError(f"Shard {index} produced no video for scene {scene}")
+            shard_videos.append(videos[0])
+        
+        final_video = media_dir / shard_videos[0].relative_to(shard_root / "000")
+        try:
+            await concat_videos(shard_videos, final_video, FFMPEG_EXECUTABLE)
+        except (OSError, RuntimeError) as e:
+            raise RenderError(f"Joining shards failed: {str(e)}")
+    finally:
+        shutil.rmtree(shard_root, ignore_errors=True)
+    elapsed = time.perf_counter() - timer
+    
+    await _catalog_videos([final_video], script_path)
+    
+    cache_line = ""
+    if cache_key is not None:
+        cache_line = await _store_in_cache(cache_key, media_dir, script_path.stem, [final_video])
+    encode_text = await _encode_outputs(arguments, [final_video], script_path)
+    if encode_text:
+        encode_text = f"\n\n{encode_text}"
+    
+    shard_list = ", ".join(format_range_flag(r) for r in ranges)
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"✅ Animation rendered in {len(ranges)} shards!\n\n"
+                f"📄 Script: {script_path}\n"
+                f"🎞️ Scene: {scene} ({animation_count} animations)\n"
+                f"🎬 Quality: {quality}\n"
+                f"✂️ Animation ranges: {shard_list}\n"
+                f"⏱️ Wall time: {elapsed:.2f}s\n"
+                f"{cache_line}\n"
+                f"📹 Video: {final_video}"
+                f"{encode_text}"
+            )
+        )
+    ]
+
+
+async def _render_animation(
+    arguments: Dict[str, Any], progress: Optional[ProgressCallback] = None
+) -> List[types.TextContent]:
+    """Render a script; callers are responsible for scheduling."""
+    script_path = _resolve_script_path(arguments)
     
     output_dir_str = arguments.get("output_dir")
     quality = arguments.get("quality", "medium")
     preview = arguments.get("preview", True)
+    use_cache = arguments.get("use_cache", True)
+    scenes = list(arguments.get("scenes") or [])
+    animation_range = arguments.get("animation_range")
+    save_last_frame = arguments.get("save_last_frame", False)
     
     # Build Manim command
     manim_cmd = [MANIM_EXECUTABLE]
     
     # Add quality flag
-    quality_flags = {
-        "low": ["-ql"],
-        "medium": ["-qm"], 
-        "high": ["-qh"],
-        "production": ["-qp"]
-    }
-    manim_cmd.extend(quality_flags.get(quality, ["-qm"]))
+    quality_flags = QUALITY_FLAGS.get(quality, ["-qm"])
+    manim_cmd.extend(quality_flags)
     
     # Add preview flag
     if preview:
         manim_cmd.append("-p")
     
+    # Restrict to a range of animations (used by sharded renders and frame previews)
+    render_flags = list(quality_flags)
+    if animation_range:
+        render_flags.extend(["-n", format_range_flag(animation_range)])
+        manim_cmd.extend(render_flags[-2:])
+    
+    # Save only the last frame as a PNG (used by frame previews)
+    if save_last_frame:
+        render_flags.append("-s")
+        manim_cmd.append("-s")
+    
     # Add output directory if specified
+    media_dir = _media_dir_for(script_path, output_dir_str)
     if output_dir_str:
-        output_dir = Path(output_dir_str).expanduser().resolve()
-        output_dir.mkdir(parents=True, exist_ok=True)
-        manim_cmd.extend(["--media_dir", str(output_dir)])
+        media_dir.mkdir(parents=True, exist_ok=True)
+        manim_cmd.extend(["--media_dir", str(media_dir)])
     
     manim_cmd.append(str(script_path))
+    manim_cmd.extend(scenes)
+    
+    # Serve identical renders from the cache
+    cache_key = None
+    if use_cache and render_cache.enabled:
+        cache_key = make_cache_key(script_path.read_bytes(), quality, [*render_flags, *scenes])
+        cached = await _serve_from_cache(
+            cache_key, script_path, media_dir, quality, output_dir_str, arguments
+        )
+        if cached is not None:
+            return cached
+    
+    # Let Manim reuse animations rendered by any workspace
+    partial_report = None
+    if partial_cache.enabled:
+        partial_report = await asyncio.to_thread(
+            partial_cache.seed,
+            media_dir,
+            script_path.stem,
+            quality,
+            scenes or _discover_scenes_in(script_path),
+        )
+    
+    # Let a revision reuse the animations its ancestors rendered
+    handle = (
+        script_registry.get(arguments["script_id"]) if arguments.get("script_id")
+        else script_registry.find(script_path)
+    )
+    lineage = None
+    if handle is not None and handle.parent_id and not save_last_frame:
+        lineage = await asyncio.to_thread(
+            _seed_from_lineage, handle, media_dir, quality, scenes or _discover_scenes_in(script_path)
+        )
+    
+    timeout = _render_timeout(arguments)
+    log = await asyncio.to_thread(render_logs.open, _session_workspace_prefix())
+    if worker_pool is not None:
+        render = _render_with_pool(
+            script_path, media_dir, quality, preview, scenes, animation_range, progress,
+            save_last_frame, log,
+        )
+        backend = "warm worker pool"
+    else:
+        render = _render_with_subprocess(manim_cmd, script_path, progress, log)
+        backend = "manim subprocess"
+    
+    started = time.time()
+    timer = time.perf_counter()
+    try:
+        output, usage = await asyncio.wait_for(render, timeout)
+    except RenderError as e:
+        render_stats.record_failure(quality, limited=isinstance(e, RenderLimitError))
+        raise
+    except asyncio.TimeoutError:
+        render_stats.record_failure(quality)
+        removed = await asyncio.to_thread(
+            _remove_partial_outputs, media_dir, script_path, quality, scenes, started
+        )
+        raise RenderTimeoutError(
+            f"Render timed out after {timeout:g}s; stopped the render and removed "
+            f"{removed} partial output file(s)\n"
+            f"📜 Log: {log.id} (use 'get_render_log' to read it)"
+        )
+    except asyncio.CancelledError:
+        await asyncio.to_thread(
+            _remove_partial_outputs, media_dir, script_path, quality, scenes, started
+        )
+        raise
+    finally:
+        log.close()
+    elapsed = time.perf_counter() - timer
+    
+    partial_line = ""
+    if partial_report is not None:
+        try:
+            partial_report = await asyncio.to_thread(
+                partial_cache.harvest, media_dir, script_path.stem, partial_report
+            )
+        except OSError as e:
+            # The render itself succeeded; only sharing its partial movies failed
+            logger.warning("Cannot harvest partial movies into the shared cache: %s", e)
+        partial_line = (
+            f"🧩 Partial movies: {partial_report.reused} reused from shared cache, "
+            f"{partial_report.rendered} rendered\n"
+        )
+    
+    revision_line = ""
+    if lineage is not None:
+        revision_line = await asyncio.to_thread(_format_revision_reuse, handle, lineage)
+    
+    outputs = _collect_render_outputs(media_dir, script_path.stem, started, scenes)
+    record = await asyncio.to_thread(
+        _render_record, script_path, quality, backend, usage, outputs
+    )
+    render_stats.record(record)
+    usage_line = _format_usage(record)
+    if not animation_range:
+        # Shard outputs are temporary; the coordinator records the joined video
+        await _catalog_videos(outputs, script_path)
+    
+    cache_line = ""
+    if cache_key is not None:
+        cache_line = await _store_in_cache(cache_key, media_dir, script_path.stem, outputs)
+    
+    encode_text = ""
+    if not animation_range and not save_last_frame:
+        encode_text = await _encode_outputs(arguments, outputs, script_path)
+        if encode_text:
+            encode_text += "\n\n"
+    video_list = "\n".join(f"- {path}" for path in outputs) or "- (none found)"
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"✅ Animation rendered successfully!\n\n"
+                f"📄 Script: {script_path}\n"
+                f"🎬 Quality: {quality}\n"
+                f"📁 Output dir: {output_dir_str or 'default'}\n"
+                f"⏱️ Render time: {elapsed:.2f}s ({backend})\n"
+                f"{usage_line}"
+                f"📜 Log: {log.id}\n"
+                f"{partial_line}"
+                f"{revision_line}"
+                f"{cache_line}\n"
+                f"📹 Videos:\n{video_list}\n\n"
+                f"{encode_text}"
+                f"📋 Output:\n{'...' if len(output) > 500 else ''}{output[-500:]}\n\n"
+                f"Use 'find_videos' tool to locate generated videos."
+            )
+        )
+    ]
+
+
+def _seed_from_lineage(
+    handle: ScriptHandle, media_dir: Path, quality: str, scenes: Sequence[str]
+) -> Dict[Path, Set[str]]:
+    """
+    Link the partial movies rendered for a revision's ancestors into its own directories.
+    
+    Manim keeps partial movies per script name, so a revision would otherwise
+    re-render every animation. Animations whose code did not change hash the
+    same and are reused by Manim.
     
+    Returns:
+        Each scene's partial movie directory with the hashes present before the render
+    """
+    ancestors = []
+    parent = script_registry.get(handle.parent_id) if handle.parent_id else None
+    while parent is not None:
+        ancestors.append(parent)
+        parent = script_registry.get(parent.parent_id) if parent.parent_id else None
+    
+    before: Dict[Path, Set[str]] = {}
+    for scene in scenes:
+        target = partial_movie_dir(media_dir, handle.path.stem, quality, scene)
+        if target is None:
+            continue
+        for ancestor in ancestors:
+            link_partial_movies(partial_movie_dir(media_dir, ancestor.path.stem, quality, scene), target)
+        before[target] = partial_hashes(target) if target.is_dir() else set()
+    return before
+
+
+def _format_revision_reuse(handle: ScriptHandle, lineage: Dict[Path, Set[str]]) -> str:
+    """Describe which animations of a revision were reused and which were re-rendered."""
+    lines = []
+    reused_total = rendered_total = 0
+    for partial_dir, before in lineage.items():
+        reused, rendered = animation_reuse(partial_dir, before)
+        if not reused and not rendered:
+            continue
+        reused_total += len(reused)
+        rendered_total += len(rendered)
+        lines.append(
+            f"   - {partial_dir.name}: reused {_format_indices(reused)}; "
+            f"re-rendered {_format_indices(rendered)}\n"
+        )
+    return (
+        f"🧬 Revision {handle.revision} of {handle.parent_id}: "
+        f"{reused_total}/{reused_total + rendered_total} animation(s) reused, "
+        f"{rendered_total} re-rendered\n"
+        + "".join(lines)
+    )
+
+
+def _format_indices(indices: List[int]) -> str:
+    return ", ".join(str(index) for index in indices) or "none"
+
+
+async def _render_with_subprocess(
+    manim_cmd: List[str],
+    script_path: Path,
+    progress: Optional[ProgressCallback] = None,
+    log: Optional[RenderLog] = None,
+) -> Tuple[str, ResourceUsage]:
+    """
+    Render by spawning a fresh manim process.
+    
+    The process runs under ``rusage_exec.py``, which reports the CPU time of
+    the whole process tree and the peak RSS of its largest process (rusage
+    keeps a maximum, not a sum), in a session of its own so
+    cancelling the render (including by a timeout) terminates every process
+    it started. The configured resource limits apply to the whole tree.
+    
+    Output is streamed to ``log``; only a bounded tail of each stream is kept
+    in memory, and failures report the error summary extracted from the log.
+    
+    Returns:
+        The tail of manim's output and the resources the render used
+    
+    Raises:
+        RenderLimitError: If the render died after exceeding a resource limit
+        RenderError: If the render failed otherwise
+    """
+    forwarder = ProgressForwarder(progress) if progress else None
+    stdout_tail: Deque[str] = deque(maxlen=RENDER_LOG_TAIL_LINES)
+    stderr_tail: Deque[str] = deque(maxlen=RENDER_LOG_TAIL_LINES)
+    
+    async def pump(stream: asyncio.StreamReader, tail: Deque[str]) -> None:
+        async for line in iter_output_lines(stream):
+            tail.append(line)
+            if log is not None:
+                log.write(line)
+            if forwarder is not None:
+                await forwarder.feed(line)
+    
+    fd, report_name = tempfile.mkstemp(prefix="manim_rusage_", suffix=".json")
+    os.close(fd)
+    report_path = Path(report_name)
+    cgroup = None
+    if render_limits.cgroup_root is not None and (render_limits.memory_bytes or render_limits.cpu_quota):
+        cgroup = await asyncio.to_thread(
+            RenderCgroup.create,
+            render_limits.cgroup_root,
+            render_limits.memory_bytes,
+            render_limits.cpu_quota,
+        )
     try:
         # Execute Manim
+        timer = time.perf_counter()
         process = await asyncio.create_subprocess_exec(
-            *manim_cmd,
+            sys.executable, str(RUSAGE_EXEC_SCRIPT), str(report_path),
+            *render_limits.exec_options(cgroup=cgroup), "--", *manim_cmd,
             cwd=str(script_path.parent),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
         
-        stdout, stderr = await process.communicate()
+        try:
+            await asyncio.gather(
+                pump(process.stdout, stdout_tail),
+                pump(process.stderr, stderr_tail),
+            )
+            await process.wait()
+        except asyncio.CancelledError:
+            await terminate_process_group(process, RENDER_KILL_GRACE)
+            raise
+        wall = time.perf_counter() - timer
         
+        report = _read_json(report_path)
+        usage = ResourceUsage.from_report(wall, report)
         if process.returncode == 0:
-            return [
-                types.TextContent(
-                    type="text",
-                    text=(
-                        f"✅ Animation rendered successfully!\n\n"
-                        f"📄 Script: {script_path}\n"
-                        f"🎬 Quality: {quality}\n"
-                        f"📁 Output dir: {output_dir_str or 'default'}\n\n"
-                        f"📋 Output:\n{stdout.decode('utf-8')[:500]}{'...' if len(stdout.decode('utf-8')) > 500 else ''}\n\n"
-                        f"Use 'find_videos' tool to locate generated videos."
-                    )
-                )
-            ]
+            return "\n".join(stdout_tail), usage
         else:
-            raise RenderError(f"Rendering failed: {stderr.decode('utf-8')}")
+            stderr_text = "\n".join(stderr_tail)
+            breach = classify_breach(
+                render_limits,
+                (report or {}).get("exit_code", process.returncode),
+                stderr_text,
+                cgroup.oom_kills() if cgroup is not None else 0,
+                _cpu_time(usage),
+            )
+            details = _failure_details(log, stderr_text)
+            if breach:
+                raise RenderLimitError(f"Render stopped: {breach}\n{details}")
+            raise RenderError(f"Rendering failed: {details}")
             
     except Exception as e:
         if isinstance(e, RenderError):
             raise
         raise RenderError(f"Render execution error: {str(e)}")
+    finally:
+        report_path.unlink(missing_ok=True)
+        if cgroup is not None:
+            await asyncio.to_thread(cgroup.remove)
+
+
+def _failure_details(log: Optional[RenderLog], output: str) -> str:
+    """Describe a failed render by the error summary of its log, or by its output without one."""
+    if log is None:
+        return output
+    return f"{log.summary.text()}\n\n📜 Full log: {log.id} (use 'get_render_log' to read it)"
+
+
+def _cpu_time(usage: ResourceUsage) -> Optional[float]:
+    """Return the total CPU seconds of a render, or None if unknown."""
+    if usage.user_cpu is None:
+        return None
+    return usage.user_cpu + (usage.sys_cpu or 0)
+
+
+def _render_timeout(arguments: Dict[str, Any]) -> Optional[float]:
+    """Return the timeout of a render request in seconds, or None if unlimited."""
+    timeout = arguments.get("timeout", RENDER_TIMEOUT)
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout < 0:
+        raise ValueError(f"timeout must be a non-negative number of seconds, got {timeout!r}")
+    return float(timeout) or None
+
+
+def _remove_partial_outputs(
+    media_dir: Path, script_path: Path, quality: str, scenes: Sequence[str], since: float
+) -> int:
+    """
+    Delete the files a stopped render wrote since ``since``.
+    
+    A killed render can leave a truncated partial movie behind, which Manim
+    would later reuse as if it were complete, so nothing it wrote is kept.
+    Only the stopped render's own scenes and quality are touched: renders of
+    other scenes of the same script may be writing next to them.
+    
+    Returns:
+        The number of files removed
+    """
+    script_stem = script_path.stem
+    quality_dir = media_dir / "videos" / script_stem / QUALITY_DIRS.get(quality, QUALITY_DIRS["medium"])
+    images_dir = media_dir / "images" / script_stem
+    candidates: List[Path] = []
+    for scene in scenes or _discover_scenes_in(script_path):
+        partial_dir = quality_dir / "partial_movie_files" / scene
+        if partial_dir.is_dir():
+            candidates.extend(partial_dir.rglob("*"))
+        for directory in (quality_dir, images_dir):
+            if directory.is_dir():
+                candidates.extend(
+                    path for path in directory.iterdir()
+                    if path.name.split(".", 1)[0] == scene or path.name.startswith(f"{scene}_ManimCE")
+                )
+    
+    removed = 0
+    for path in candidates:
+        try:
+            if path.is_file() and path.stat().st_mtime >= since:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _read_json(path: Path) -> Optional[Dict[str, Any]]:
+    """Return the JSON object in ``path``, or None if it is missing or malformed."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+async def _render_with_pool(
+    script_path: Path,
+    media_dir: Path,
+    quality: str,
+    preview: bool,
+    scenes: List[str],
+    animation_range: Optional[Sequence[Optional[int]]] = None,
+    progress: Optional[ProgressCallback] = None,
+    save_last_frame: bool = False,
+    log: Optional[RenderLog] = None,
+) -> Tuple[str, ResourceUsage]:
+    """Render on a warm worker from the pool and return its log output and resource usage."""
+    job = {
+        "script": str(script_path),
+        "cwd": str(script_path.parent),
+        "media_dir": str(media_dir),
+        "quality": quality if quality in QUALITY_FLAGS else "medium",
+        "preview": preview,
+        "scenes": scenes,
+        "animation_range": animation_range,
+        "save_last_frame": save_last_frame,
+    }
+    forwarder = ProgressForwarder(progress) if progress else None
+    
+    async def on_line(line: str) -> None:
+        if log is not None:
+            log.write(line)
+        if forwarder is not None:
+            await forwarder.feed(line)
+    
+    timer = time.perf_counter()
+    try:
+        reply, output = await worker_pool.render(job, on_line)
+    except WorkerPoolError as e:
+        breach = classify_breach(render_limits, output=str(e))
+        if breach:
+            raise RenderLimitError(f"Render stopped: {breach}\n{e}")
+        raise RenderError(f"Render execution error: {str(e)}")
+    if not reply.get("ok"):
+        error = str(reply.get("traceback") or reply.get("error"))
+        if log is not None:
+            for line in error.splitlines():
+                log.write(line)
+        breach = classify_breach(render_limits, output=error)
+        details = _failure_details(log, error)
+        if breach:
+            raise RenderLimitError(f"Render stopped: {breach}\n{details}")
+        raise RenderError(f"Rendering failed: {details}")
+    return output, ResourceUsage.from_report(time.perf_counter() - timer, reply.get("rusage"))
+
+
+def _render_record(
+    script_path: Path, quality: str, backend: str, usage: ResourceUsage, outputs: Sequence[Path]
+) -> RenderRecord:
+    """Build the accounting record of a finished render, measuring its outputs."""
+    output_bytes = 0
+    frames = 0
+    fps = int(QUALITY_DIRS.get(quality, "720p30").split("p")[1])
+    for video in outputs:
+        try:
+            output_bytes += video.stat().st_size
+        except OSError:
+            continue
+        # Manim renders at a constant frame rate, so the duration gives the frame count
+        duration = mp4_duration(video)
+        if duration is not None:
+            frames += round(duration * fps)
+    return RenderRecord(
+        script=str(script_path),
+        quality=quality,
+        backend=backend,
+        usage=usage,
+        output_bytes=output_bytes,
+        frames=frames or None,
+    )
+
+
+def _format_usage(record: RenderRecord) -> str:
+    """Format a render's CPU and memory use for tool output (empty if unknown)."""
+    usage = record.usage
+    if usage.user_cpu is None:
+        return ""
+    line = f"🧮 CPU: {usage.user_cpu:.2f}s user, {usage.sys_cpu:.2f}s sys"
+    if usage.peak_rss_bytes:
+        line += f"; peak RSS {usage.peak_rss_bytes / 1024 / 1024:.0f} MB (largest process)"
+    if record.frames:
+        line += f"; {record.frames} frames"
+    return line + "\n"
+
+
+def _request_session() -> Optional[Any]:
+    """Return the MCP session of the current request, if any."""
+    try:
+        return server.request_context.session
+    except LookupError:
+        return None
+
+
+def _session_workspace_prefix(session: Optional[Any] = None) -> Optional[str]:
+    """
+    Return the workspace name prefix of a client session (default: the current one).
+    
+    Returns None when sessions are not isolated or outside a request, in
+    which case every path is available.
+    """
+    if not SESSION_ISOLATION:
+        return None
+    session = session or _request_session()
+    if session is None:
+        return None
+    key = _session_keys.get(session)
+    if key is None:
+        key = _session_keys[session] = uuid.uuid4().hex[:8]
+    return f"{WORKSPACE_PREFIX}{key}_"
+
+
+def _is_client_path(path: Path, session: Optional[Any] = None) -> bool:
+    """Return whether a client session (default: the current one) may use ``path``."""
+    prefix = _session_workspace_prefix(session)
+    if prefix is None:
+        return True
+    try:
+        relative = path.resolve().relative_to(BASE_DIR.resolve())
+    except ValueError:
+        return False
+    return bool(relative.parts) and relative.parts[0].startswith(prefix)
+
+
+def _client_path(path_str: str, argument: str) -> Path:
+    """
+    Resolve a path argument of the current client.
+    
+    Raises:
+        ValueError: If sessions are isolated and the path is outside the
+            workspaces this session created
+    """
+    path = Path(path_str).expanduser().resolve()
+    if not _is_client_path(path):
+        raise ValueError(f"{argument} is outside this session's workspaces: {path}")
+    return path
+
+
+def _request_progress_callback() -> Optional[ProgressCallback]:
+    """Return a callback sending MCP progress notifications for the current request."""
+    try:
+        ctx = server.request_context
+    except LookupError:
+        return None
+    token = ctx.meta.progressToken if ctx.meta else None
+    if token is None:
+        return None
+    
+    async def notify(value: float, message: str) -> None:
+        await ctx.session.send_progress_notification(
+            progress_token=token,
+            progress=value,
+            message=message,
+            related_request_id=str(ctx.request_id),
+        )
+    
+    return notify
+
+
+def _collect_render_outputs(
+    media_dir: Path, script_stem: str, since: float, scenes: Sequence[str] = ()
+) -> List[Path]:
+    """Return the final videos Manim wrote for a script (and scenes) since ``since``."""
+    videos_dir = media_dir / "videos" / script_stem
+    if not videos_dir.is_dir():
+        return []
+    return [
+        path for path in videos_dir.rglob("*.mp4")
+        if "partial_movie_files" not in path.parts
+        and path.stat().st_mtime >= since
+        and (not scenes or path.stem in scenes)
+    ]
+
+
+def _discover_scenes_in(script_path: Path) -> List[str]:
+    """Return the scenes defined in a script, or an empty list if it does not parse."""
+    try:
+        return discover_scenes(script_path.read_text(encoding="utf-8"))
+    except SyntaxError:
+        return []
+
+
+def _media_dir_for(script_path: Path, output_dir_str: Optional[str]) -> Path:
+    """Return the media directory a render of ``script_path`` writes to."""
+    if output_dir_str:
+        return _client_path(output_dir_str, "output_dir")
+    # Manim writes to ./media relative to its working directory
+    return script_path.parent / "media"
+
+
+async def _store_in_cache(
+    cache_key: str, media_dir: Path, script_stem: str, outputs: Sequence[Path]
+) -> str:
+    """Store a finished render in the cache and describe it; a cache failure never fails the render."""
+    try:
+        await asyncio.to_thread(render_cache.store, cache_key, media_dir, script_stem, outputs)
+    except OSError as e:
+        logger.warning("Cannot store render %s in the cache: %s", cache_key[:12], e)
+        return f"♻️ Cache: miss, not stored ({_format_cache_counters()})\n"
+    return f"♻️ Cache: miss ({_format_cache_counters()})\n"
+
+
+async def _serve_from_cache(
+    cache_key: str,
+    script_path: Path,
+    media_dir: Path,
+    quality: str,
+    output_dir_str: Optional[str],
+    arguments: Optional[Dict[str, Any]] = None,
+) -> Optional[List[types.TextContent]]:
+    """
+    Materialize a cached render into ``media_dir`` and describe it, or return None on a miss.
+    
+    Encoding options in ``arguments`` are applied to the materialized videos.
+    """
+    cached_files = await asyncio.to_thread(
+        render_cache.fetch, cache_key, media_dir, script_path.stem
+    )
+    if not cached_files:
+        return None
+    await _catalog_videos(cached_files, script_path)
+    encode_text = await _encode_outputs(arguments or {}, cached_files, script_path)
+    if encode_text:
+        encode_text = f"\n\n{encode_text}"
+    video_list = "\n".join(f"- {video}" for video in cached_files)
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"✅ Animation served from render cache!\n\n"
+                f"📄 Script: {script_path}\n"
+                f"🎬 Quality: {quality}\n"
+                f"📁 Output dir: {output_dir_str or 'default'}\n"
+                f"♻️ Cache: hit ({_format_cache_counters()})\n\n"
+                f"📹 Videos:\n{video_list}"
+                f"{encode_text}"
+            )
+        )
+    ]
+
+
+def _encoder_profile_for(arguments: Dict[str, Any]) -> Optional[EncoderProfile]:
+    """
+    Return the encoder profile a render request asks for, or None to keep Manim's MP4.
+    
+    Raises:
+        ValueError: If the format or profile is unknown or they do not match
+    """
+    profile = resolve_profile(arguments.get("output_format"), arguments.get("encoder_profile"))
+    if profile is None and (arguments.get("crf") is not None or arguments.get("encoder_preset")):
+        # Rate or speed overrides alone re-encode Manim's MP4 with x264
+        profile = ENCODER_PROFILES["h264_balanced"]
+    return profile
+
+
+async def _encode_outputs(
+    arguments: Dict[str, Any], videos: Sequence[Path], script_path: Path
+) -> str:
+    """Encode rendered videos as requested and describe the results (empty if nothing to do)."""
+    profile = _encoder_profile_for(arguments)
+    if profile is None or not videos:
+        return ""
+    
+    lines = []
+    encoded = []
+    for video in videos:
+        try:
+            result = await encode_video(
+                video,
+                profile,
+                FFMPEG_EXECUTABLE,
+                crf=arguments.get("crf"),
+                preset=arguments.get("encoder_preset"),
+                threads=render_limits.ffmpeg_threads,
+            )
+        except (OSError, RuntimeError) as e:
+            raise RenderError(f"Encoding failed: {str(e)}")
+        files = f", {result.files} frames" if profile.output_format == "png" else ""
+        lines.append(
+            f"- {result.output} ({result.bytes / 1024:.1f} KB{files}, encoded in {result.seconds:.2f}s)"
+        )
+        if profile.output_format != "png":
+            encoded.append(result.output)
+    await _catalog_videos(encoded, script_path)
+    return f"🎞️ Encoded with {profile.name} ({profile.output_format}):\n" + "\n".join(lines)
+
+
+async def _catalog_videos(videos: Sequence[Path], script_path: Path) -> None:
+    """Record rendered videos in the catalog and tell resource listeners; a catalog failure never fails the render."""
+    if not videos:
+        return
+    try:
+        script_hash = content_hash(script_path.read_bytes())
+        for video in videos:
+            await asyncio.to_thread(video_catalog.record, video, script_hash=script_hash)
+    except (OSError, sqlite3.Error):
+        return
+    await _notify_resources(videos)
+
+
+def _format_cache_counters() -> str:
+    """Format the render cache hit/miss counters for tool output."""
+    stats = render_cache.stats()
+    return f"hits={stats['hits']}, misses={stats['misses']}"
+
+
+async def _handle_submit_render(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle background render submission."""
+    script_path_str = str(_resolve_script_path(arguments))
+    job = _submit_background_render({"preview": False, **arguments}, description=script_path_str)
+    
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"✅ Render job submitted!\n\n"
+                f"🆔 Job id: {job.id}\n"
+                f"📄 Script: {script_path_str}\n"
+                f"📊 State: {job.state.value}\n\n"
+                f"Use 'get_render_status' or 'get_render_result' with this job id."
+            )
+        )
+    ]
+
+
+def _submit_background_render(
+    arguments: Dict[str, Any],
+    description: str,
+    on_done: Optional[Callable[[RenderJob], Awaitable[None]]] = None,
+) -> RenderJob:
+    """
+    Queue a render as a job that outlives the current request.
+    
+    Progress is recorded on the job record for ``get_render_status``;
+    ``on_done`` is awaited once the render finishes, successfully or not.
+    """
+    render_args = dict(arguments)
+    priority = int(render_args.pop("priority", 0))
+    
+    async def record_progress(value: float, message: str) -> None:
+        job.progress = message
+    
+    factory, needs_slot = _plan_render(render_args, record_progress, priority)
+    job = render_scheduler.submit(
+        factory,
+        priority=priority,
+        description=description,
+        needs_slot=needs_slot,
+        paths=_render_paths(render_args),
+    )
+    if on_done is not None:
+        async def wait_and_notify() -> None:
+            await job.done.wait()
+            await on_done(job)
+        
+        task = asyncio.ensure_future(wait_and_notify())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    return job
+
+
+async def _handle_render_batch(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """
+    Handle a batch of renders fanned out over scripts, scenes and qualities.
+    
+    Every script x scene x quality combination is its own scheduler job, so
+    the batch runs as wide as the scheduler allows. The whole matrix is
+    validated before any job is queued. One failed render does not stop the
+    others; cancelling the request cancels every job of the batch.
+    """
+    items = _plan_batch(arguments)
+    priority = int(arguments.get("priority", 0))
+    progress = _request_progress_callback()
+    
+    timer = time.perf_counter()
+    jobs = [
+        render_scheduler.submit(
+            lambda item=item: _render_animation(item["arguments"]),
+            priority=priority,
+            description=f"{item['script']}::{item['scene']} ({item['quality']})",
+            paths=_render_paths(item["arguments"]),
+        )
+        for item in items
+    ]
+    finished = 0
+    
+    async def wait_for(job: RenderJob) -> None:
+        nonlocal finished
+        await job.done.wait()
+        finished += 1
+        if progress is not None:
+            try:
+                await progress(
+                    finished,
+                    f"{finished}/{len(jobs)} renders finished; {job.description}: {job.state.value}",
+                )
+            except Exception:
+                # A disconnected client does not stop the batch
+                pass
+    
+    try:
+        await asyncio.gather(*(wait_for(job) for job in jobs))
+    except asyncio.CancelledError:
+        for job in jobs:
+            render_scheduler.cancel(job.id)
+        raise
+    elapsed = time.perf_counter() - timer
+    
+    results = []
+    for item, job in zip(items, jobs):
+        outputs = _batch_outputs(item) if job.state is JobState.SUCCEEDED else []
+        results.append({
+            "script": str(item["script"]),
+            "scene": item["scene"],
+            "quality": item["quality"],
+            "job_id": job.id,
+            "status": job.state.value,
+            "queued_seconds": round((job.started_at or job.finished_at) - job.submitted_at, 3),
+            "render_seconds": round(job.finished_at - job.started_at, 3) if job.started_at else None,
+            "outputs": [str(path) for path in outputs],
+            "error": job.error,
+        })
+    counts = {state.value: sum(job.state is state for job in jobs) for state in JobState if state.finished}
+    summary = {"total": len(jobs), **counts, "wall_seconds": round(elapsed, 3), "items": results}
+    
+    icons = {"succeeded": "✅", "failed": "❌", "cancelled": "🚫"}
+    item_lines = []
+    for result in results:
+        line = f"- {icons[result['status']]} {Path(result['script']).name}::{result['scene']} ({result['quality']})"
+        if result["status"] == "succeeded":
+            line += f": {result['render_seconds']:.2f}s, " + (", ".join(result["outputs"]) or "no video found")
+        elif result["error"]:
+            line += f": {result['error']}"
+        item_lines.append(line)
+    succeeded = counts[JobState.SUCCEEDED.value]
+    header = "✅" if succeeded == len(jobs) else "❌" if succeeded == 0 else "⚠️"
+    
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"{header} Batch rendered {succeeded}/{len(jobs)} render(s)\n\n"
+                f"⏱️ Wall time: {elapsed:.2f}s "
+                f"(sum of render times: {sum(r['render_seconds'] or 0 for r in results):.2f}s)\n\n"
+                f"🎞️ Renders:\n" + "\n".join(item_lines) + "\n\n"
+                f"The next content item holds the same result as JSON."
+            )
+        ),
+        types.TextContent(type="text", text=json.dumps(summary, indent=2)),
+    ]
+
+
+def _plan_batch(arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a render_batch request into one render per script, scene and quality.
+    
+    Identical combinations are rendered once, since they would write the same files.
+    
+    Raises:
+        ValueError: If the batch is empty or too large, or names an unknown
+            script, scene or quality
+    """
+    entries = arguments.get("items")
+    if not entries:
+        raise ValueError("Missing required argument: items")
+    options = {key: arguments[key] for key in BATCH_RENDER_OPTIONS if key in arguments}
+    _encoder_profile_for(options)
+    _render_timeout(options)
+    
+    items: Dict[Tuple[Path, str, str, Optional[str]], Dict[str, Any]] = {}
+    for entry in entries:
+        script_path = _resolve_script_path(entry)
+        scenes = _requested_scenes(script_path, entry.get("scenes") or arguments.get("scenes"))
+        if not scenes:
+            raise ValueError(f"No scenes found in script: {script_path}")
+        qualities = entry.get("qualities") or arguments.get("qualities") or ["medium"]
+        unknown = [quality for quality in qualities if quality not in QUALITY_FLAGS]
+        if unknown:
+            raise ValueError(
+                f"Unknown quality: {', '.join(unknown)} (available: {', '.join(QUALITY_FLAGS)})"
+            )
+        output_dir = entry.get("output_dir") or arguments.get("output_dir")
+        for scene in scenes:
+            for quality in dict.fromkeys(qualities):
+                items.setdefault((script_path, scene, quality, output_dir), {
+                    "script": script_path,
+                    "scene": scene,
+                    "quality": quality,
+                    "media_dir": _media_dir_for(script_path, output_dir),
+                    "arguments": {
+                        **options,
+                        "script_path": str(script_path),
+                        "output_dir": output_dir,
+                        "scenes": [scene],
+                        "quality": quality,
+                        "preview": False,
+                    },
+                })
+                if len(items) > BATCH_MAX_ITEMS:
+                    raise ValueError(
+                        f"Batch expands to more than {BATCH_MAX_ITEMS} renders; split it up"
+                    )
+    return list(items.values())
+
+
+def _batch_outputs(item: Dict[str, Any]) -> List[Path]:
+    """Return the delivered videos of one batch render."""
+    # Manim writes a scene at a quality to a fixed path, so the files there are this render's
+    quality_dir = item["media_dir"] / "videos" / item["script"].stem / QUALITY_DIRS[item["quality"]]
+    return sorted(
+        path for path in quality_dir.glob(f"{item['scene']}.*")
+        if path.suffix.lower() in VIDEO_SUFFIXES
+    )
+
+
+async def _handle_get_render_status(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle render job status lookup."""
+    job = _get_render_job(arguments)
+    
+    info_lines = [
+        f"🆔 Job: {job.id}",
+        f"📄 Script: {job.description}",
+        f"📊 State: {job.state.value}",
+        f"⬆️ Priority: {job.priority}",
+    ]
+    position = render_scheduler.queue_position(job.id)
+    if position is not None:
+        info_lines.append(f"⏳ Queue position: {position}")
+    if job.started_at is not None:
+        end = job.finished_at or time.time()
+        info_lines.append(f"⏱️ Running time: {end - job.started_at:.2f}s")
+    if job.progress and job.state is JobState.RUNNING:
+        info_lines.append(f"🎞️ Progress: {job.progress}")
+    if job.error:
+        info_lines.append(f"❌ Error: {job.error}")
+    
+    return [
+        types.TextContent(
+            type="text",
+            text="\n".join(info_lines)
+        )
+    ]
+
+
+async def _handle_get_render_result(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle render job result retrieval."""
+    job = _get_render_job(arguments)
+    if arguments.get("wait", False):
+        await job.done.wait()
+    
+    if job.state is JobState.SUCCEEDED:
+        return job.result
+    if job.state is JobState.FAILED:
+        return [
+            types.TextContent(
+                type="text",
+                text=f"❌ Render job {job.id} failed: {job.error}"
+            )
+        ]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"⏳ Render job {job.id} has no result yet (state: {job.state.value})"
+        )
+    ]
+
+
+async def _handle_cancel_render(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle render job cancellation."""
+    job = _get_render_job(arguments)
+    
+    if render_scheduler.cancel(job.id):
+        return [
+            types.TextContent(
+                type="text",
+                text=f"✅ Render job cancelled: {job.id}"
+            )
+        ]
+    return [
+        types.TextContent(
+            type="text",
+            text=f"⚠️ Render job {job.id} already finished (state: {job.state.value})"
+        )
+    ]
+
+
+async def _handle_get_render_log(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle reading a byte range of a render log."""
+    log_id = arguments.get("log_id")
+    if not log_id:
+        raise ValueError("Missing required argument: log_id")
+    prefix = _session_workspace_prefix()
+    if prefix is not None and render_logs.owner(log_id) != prefix:
+        raise ValueError(f"Unknown log id: {log_id}")
+    length = int(arguments.get("length", DEFAULT_READ_BYTES))
+    if length < 1:
+        raise ValueError(f"length must be positive, got {length}")
+    
+    try:
+        chunk = await asyncio.to_thread(
+            render_logs.read, log_id, int(arguments.get("offset", 0)), length
+        )
+    except KeyError:
+        raise ValueError(f"Unknown log id: {log_id}")
+    
+    end = chunk.offset + len(chunk.data)
+    more = f"; read on with offset {end}" if end < chunk.size else ""
+    rotated = (
+        "\n♻️ The log was rotated; the earliest output may have been dropped"
+        if chunk.rotated else ""
+    )
+    return [
+        types.TextContent(
+            type="text",
+            text=(
+                f"📜 Render log {log_id}\n"
+                f"📏 Bytes {chunk.offset}-{end} of {chunk.size}{more}"
+                f"{rotated}\n\n"
+                f"{chunk.data.decode('utf-8', errors='replace')}"
+            )
+        )
+    ]
+
+
+async def _handle_get_render_stats(arguments: Dict[str, Any]) -> List[types.TextContent]:
+    """Handle render resource statistics."""
+    quality = arguments.get("quality")
+    last = arguments.get("last")
+    records = render_stats.records(quality, int(last) if last else None)
+    if not records:
+        return [
+            types.TextContent(
+                type="text",
+                text=f"📈 No renders recorded yet{f' at {quality} quality' if quality else ''}."
+            )
+        ]
+    
+    def seconds(value: float) -> str:
+        return f"{value:.2f}s"
+    
+    def megabytes(value: float) -> str:
+        return f"{value / 1024 / 1024:.1f} MB"
+    
+    def count(value: float) -> str:
+        return f"{value:.0f}"
+    
+    rows = (
+        ("wall", "Wall time", seconds),
+        ("user_cpu", "User CPU", seconds),
+        ("sys_cpu", "System CPU", seconds),
+        ("peak_rss", "Peak RSS (largest process)", megabytes),
+        ("output", "Output size", megabytes),
+        ("frames", "Frames", count),
+    )
+    summary = render_stats.summarize(records)
+    info_lines = [
+        f"📈 Render stats: {len(records)} render(s){f' at {quality} quality' if quality else ''}, "
+        f"{render_stats.failures} failure(s) since start",
+        "",
+        f"{'metric':<12} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}",
+    ]
+    for name, label, fmt in rows:
+        if name in summary:
+            values = summary[name]
+            info_lines.append(
+                f"{label:<12} " + " ".join(
+                    f"{fmt(values[key]):>10}" for key in ("p50", "p90", "p99", "max")
+                )
+            )
+    
+    backends = {}
+    for record in records:
+        backends[record.backend] = backends.get(record.backend, 0) + 1
+    info_lines.append("")
+    info_lines.append("🔧 Backends: " + ", ".join(f"{name} ×{n}" for name, n in backends.items()))
+    limits = describe_limits(render_limits, cgroup=render_limits.cgroup_root is not None)
+    info_lines.append("🛡️ Limits per render: " + (", ".join(limits) if limits else "none"))
+    if render_limits.ffmpeg_threads:
+        info_lines.append(f"🎞️ Re-encodes: {render_limits.ffmpeg_threads} ffmpeg threads each")
+    if render_stats.limit_breaches:
+        info_lines.append(f"🚧 Limit breaches: {render_stats.limit_breaches} render(s) stopped")
+    if render_stats.textfile is not None:
+        info_lines.append(f"📤 Prometheus textfile: {render_stats.textfile}")
+    
+    return [
+        types.TextContent(
+            type="text",
+            text="\n".join(info_lines)
+        )
+    ]
+
+
+def _get_render_job(arguments: Dict[str, Any]) -> RenderJob:
+    """Look up the job referenced by the ``job_id`` argument."""
+    job_id = arguments.get("job_id")
+    if not job_id:
+        raise ValueError("Missing required argument: job_id")
+    job = render_scheduler.get(job_id)
+    if job is None or not all(_is_client_path(path) for path in job.paths):
+        raise ValueError(f"Unknown render job: {job_id}")
+    return job
 
 
 async def _handle_find_videos(arguments: Dict[str, Any]) -> List[types.TextContent]:
@@ -436,9 +2739,17 @@ async def _handle_find_videos(arguments: Dict[str, Any]) -> List[types.TextConte
     if not search_dir_str:
         raise ValueError("Missing required argument: search_dir")
     
-    search_dir = Path(search_dir_str).expanduser().resolve()
+    search_dir = _client_path(search_dir_str, "search_dir")
     pattern = arguments.get("pattern", "*.mp4")
     recursive = arguments.get("recursive", True)
+    scene = arguments.get("scene")
+    quality = arguments.get("quality")
+    limit = int(arguments.get("limit", 100))
+    offset = int(arguments.get("offset", 0))
+    script_hash = None
+    if arguments.get("script_id"):
+        # Videos outlive their script, so the file itself is not required
+        script_hash = _resolve_script_handle(arguments["script_id"], require_file=False).content_hash
     
     if not search_dir.exists():
         return [
@@ -449,20 +2760,42 @@ async def _handle_find_videos(arguments: Dict[str, Any]) -> List[types.TextConte
         ]
     
     try:
-        video_files = []
-        if recursive:
-            video_files = list(search_dir.rglob(pattern))
+        if Path(pattern).suffix.lower() in VIDEO_SUFFIXES and "/" not in pattern:
+            # Bring the index up to date, then answer from it (the catalog matches file names)
+            await asyncio.to_thread(video_catalog.rescan, search_dir)
+            records, total = await asyncio.to_thread(
+                video_catalog.query,
+                search_dir,
+                pattern,
+                recursive,
+                scene=scene,
+                quality=QUALITY_DIRS.get(quality, quality),
+                script_hash=script_hash,
+                limit=limit,
+                offset=offset,
+            )
+            video_lines = [_format_video_record(record) for record in records]
         else:
-            video_files = list(search_dir.glob(pattern))
+            # Other patterns (e.g. images or directories) fall back to a directory walk
+            matches = sorted(search_dir.rglob(pattern) if recursive else search_dir.glob(pattern))
+            matches = [m for m in matches if not scene or m.stem == scene]
+            total = len(matches)
+            video_lines = [f"- {video}" for video in matches[offset:offset + limit]]
         
-        if video_files:
-            video_list = "\n".join(f"- {video}" for video in video_files)
+        if video_lines:
+            video_list = "\n".join(video_lines)
+            page_note = ""
+            if offset or total > offset + len(video_lines):
+                page_note = (
+                    f"\n\n📄 Showing {offset + 1}-{offset + len(video_lines)} of {total}; "
+                    f"use 'offset' for more."
+                )
             return [
                 types.TextContent(
                     type="text",
                     text=(
-                        f"📹 Found {len(video_files)} video file(s) in {search_dir}:\n\n"
-                        f"{video_list}"
+                        f"📹 Found {total} video file(s) in {search_dir}:\n\n"
+                        f"{video_list}{page_note}"
                     )
                 )
             ]
@@ -478,13 +2811,23 @@ async def _handle_find_videos(arguments: Dict[str, Any]) -> List[types.TextConte
         raise ManimError(f"Error searching for videos: {str(e)}")
 
 
+def _format_video_record(record: VideoRecord) -> str:
+    """Format one catalog entry as a find_videos list item."""
+    details = [f"{record.size / 1024:.1f} KB"]
+    if record.quality:
+        details.append(record.quality)
+    if record.duration is not None:
+        details.append(f"{record.duration:.1f}s")
+    return f"- {record.path} ({', '.join(details)})"
+
+
 async def _handle_get_workspace_info(arguments: Dict[str, Any]) -> List[types.TextContent]:
     """Handle workspace information retrieval."""
     workspace_path_str = arguments.get("workspace_path")
     if not workspace_path_str:
         raise ValueError("Missing required argument: workspace_path")
     
-    workspace_path = Path(workspace_path_str).expanduser().resolve()
+    workspace_path = _client_path(workspace_path_str, "workspace_path")
     
     if not workspace_path.exists():
         return [
@@ -498,27 +2841,36 @@ async def _handle_get_workspace_info(arguments: Dict[str, Any]) -> List[types.Te
         info_lines = [f"📁 Workspace: {workspace_path}"]
         
         if workspace_path.is_dir():
-            # Count files by type
-            py_files = list(workspace_path.rglob("*.py"))
-            mp4_files = list(workspace_path.rglob("*.mp4"))
+            # One walk off the event loop; unchanged directories come from the cache
+            stats = await asyncio.to_thread(workspace_stats.collect, workspace_path)
+            py_count = stats.count(".py")
+            mp4_count = stats.count(".mp4")
             
             info_lines.extend([
-                f"📄 Python files: {len(py_files)}",
-                f"🎬 Video files: {len(mp4_files)}",
-                f"📊 Total size: {sum(f.stat().st_size for f in workspace_path.rglob('*') if f.is_file()) / 1024 / 1024:.2f} MB"
+                f"📄 Python files: {py_count}",
+                f"🎬 Video files: {mp4_count}",
+                f"📊 Total size: {stats.total_bytes / 1024 / 1024:.2f} MB "
+                f"({stats.files} files in {stats.directories} directories)"
             ])
+            if stats.sizes:
+                info_lines.append("📦 Largest file types: " + ", ".join(
+                    f"{suffix} {count} files, {size / 1024 / 1024:.2f} MB"
+                    for suffix, count, size in largest_types(stats)
+                ))
             
-            if py_files:
-                info_lines.append("\n📄 Python files:")
-                info_lines.extend(f"  - {f.name}" for f in py_files[:5])
-                if len(py_files) > 5:
-                    info_lines.append(f"  ... and {len(py_files) - 5} more")
-            
-            if mp4_files:
-                info_lines.append("\n🎬 Video files:")
-                info_lines.extend(f"  - {f.name}" for f in mp4_files[:5])
-                if len(mp4_files) > 5:
-                    info_lines.append(f"  ... and {len(mp4_files) - 5} more")
+            for suffix, title in ((".py", "📄 Python files:"), (".mp4", "🎬 Video files:")):
+                count = stats.count(suffix)
+                if count:
+                    names = stats.samples[suffix]
+                    info_lines.append(f"\n{title}")
+                    info_lines.extend(f"  - {name}" for name in names)
+                    if count > len(names):
+                        info_lines.append(f"  ... and {count - len(names)} more")
+        
+        if workspace_path == BASE_DIR.resolve() and workspace_gc.last_report is not None:
+            report = workspace_gc.last_report
+            swept_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report.started_at))
+            info_lines.append(f"\n🧹 Last workspace GC ({swept_at}): {report.summary()}")
         
         return [
             types.TextContent(
@@ -537,7 +2889,7 @@ async def _handle_cleanup_files(arguments: Dict[str, Any]) -> List[types.TextCon
     if not target_path_str:
         raise ValueError("Missing required argument: target_path")
     
-    target_path = Path(target_path_str).expanduser().resolve()
+    target_path = _client_path(target_path_str, "target_path")
     recursive = arguments.get("recursive", False)
     
     if not target_path.exists():
@@ -602,36 +2954,22 @@ async def _handle_execute_manim_complete(arguments: Dict[str, Any]) -> List[type
     quality = arguments.get("quality", "medium")
     
     try:
-        # Step 1: Create script
-        create_result = await _handle_create_script({
-            "code": code,
-            "script_dir": script_dir_str,
-            "script_name": script_name,
-            "validate": True
-        })
-        
-        # Extract script path from result (this is a bit hacky, but works for demo)
-        if script_dir_str:
-            script_dir = Path(script_dir_str).expanduser().resolve()
-        else:
-            # Find the created temp directory
-            work_dirs = [d for d in BASE_DIR.iterdir() if d.is_dir() and d.name.startswith("manim_work_")]
-            script_dir = max(work_dirs, key=lambda x: x.stat().st_mtime)  # Get most recent
-        
-        script_path = script_dir / f"{script_name}.py"
+        # Step 1: Create script; the handle identifies it for the later steps
+        handle = _create_script(code, script_dir_str, script_name)
         
         # Step 2: Render animation
         render_result = await _handle_render_animation({
-            "script_path": str(script_path),
+            "script_id": handle.id,
             "output_dir": output_dir_str,
             "quality": quality,
             "preview": True
         })
         
-        # Step 3: Find videos
-        search_dir = output_dir_str if output_dir_str else str(script_dir / "media")
+        # Step 3: Find videos rendered from this exact script
+        search_dir = output_dir_str if output_dir_str else str(handle.workspace / "media")
         video_result = await _handle_find_videos({
             "search_dir": search_dir,
+            "script_id": handle.id,
             "pattern": "*.mp4",
             "recursive": True
         })
@@ -639,7 +2977,10 @@ async def _handle_execute_manim_complete(arguments: Dict[str, Any]) -> List[type
         # Combine results
         combined_text = (
             "🎬 Complete Manim workflow executed successfully!\n\n"
-            "📝 Step 1 - Script Creation:\n" + create_result[0].text + "\n\n"
+            "📝 Step 1 - Script Creation:\n"
+            f"🆔 Script id: {handle.id}\n"
+            f"📄 Script path: {handle.path}\n"
+            f"#️⃣ Content hash: {handle.content_hash}\n\n"
             "🎬 Step 2 - Animation Rendering:\n" + render_result[0].text + "\n\n"
             "📹 Step 3 - Video Discovery:\n" + video_result[0].text + "\n\n"
             "Use individual tools for more granular control."
@@ -658,19 +2999,30 @@ async def _handle_execute_manim_complete(arguments: Dict[str, Any]) -> List[type
 
 async def main() -> None:
     """Main entry point for the server."""
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            InitializationOptions(
-                server_name="manim-mcp-server-refactored",
-                server_version="0.2.0",
-                capabilities=server.get_capabilities(
-                    notification_options=NotificationOptions(),
-                    experimental_capabilities={},
+    if MCP_TRANSPORT not in ("stdio", "http"):
+        raise ValueError(f"Unknown MANIM_MCP_TRANSPORT: {MCP_TRANSPORT} (expected stdio or http)")
+    gc_task = asyncio.create_task(workspace_gc.run(WORKSPACE_GC_INTERVAL))
+    try:
+        if MCP_TRANSPORT == "http":
+            from .http_transport import create_app, serve
+            await serve(create_app(server), MCP_HOST, MCP_PORT)
+            return
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                InitializationOptions(
+                    server_name="manim-mcp-server-refactored",
+                    server_version="0.2.0",
+                    capabilities=server.get_capabilities(
+                        notification_options=NotificationOptions(),
+                        experimental_capabilities={},
+                    ),
                 ),
-            ),
-        )
+            )
+    finally:
+        gc_task.cancel()
+        render_cache.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+"""
+Animation-range sharding of a single scene.
+
+A long scene is split into ranges of animation indices (Manim's
+``-n start,end``), each range is rendered by its own process, and the partial
+movies are joined with ffmpeg's concat demuxer without re-encoding.
+"""
+
+import ast
+import asyncio
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+# Scene methods that each advance Manim's animation counter by one
+_ANIMATION_METHODS = {"play", "wait", "wait_until", "pause"}
+# Statements whose bodies may run a data-dependent number of times
+_UNCOUNTABLE_NODES = (
+    ast.For, ast.AsyncFor, ast.While, ast.If, ast.Try,
+    ast.Lambda, ast.FunctionDef, ast.AsyncFunctionDef,
+    ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.IfExp,
+)
+
+AnimationRange = Tuple[int, Optional[int]]
+
+
+def _self_call(node: ast.AST) -> Optional[str]:
+    """Return ``name`` for a ``self.name(...)`` call, else None."""
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Attribute)
+        and isinstance(node.func.value, ast.Name)
+        and node.func.value.id == "self"
+    ):
+        return node.func.attr
+    return None
+
+
+def _count_in_method(
+    methods: Dict[str, ast.FunctionDef], name: str, visiting: Set[str]
+) -> Optional[int]:
+    if name in visiting:
+        return None  # recursion
+    visiting = visiting | {name}
+    count = 0
+    for stmt in methods[name].body:
+        for node in ast.walk(stmt):
+            called = _self_call(node)
+            if called is None:
+                continue
+            if called in _ANIMATION_METHODS or called in methods:
+                # Anything nested under control flow makes the count unknowable
+                if _nested_under_control_flow(stmt, node):
+                    return None
+            if called in _ANIMATION_METHODS:
+                count += 1
+            elif called in methods:
+                nested = _count_in_method(methods, called, visiting)
+                if nested is None:
+                    return None
+                count += nested
+    return count
+
+
+def _nested_under_control_flow(root: ast.AST, target: ast.AST) -> bool:
+    """Return whether ``target`` sits inside a loop/branch within ``root``."""
+    def search(node: ast.AST, guarded: bool) -> Optional[bool]:
+        if node is target:
+            return guarded
+        guarded = guarded or isinstance(node, _UNCOUNTABLE_NODES)
+        for child in ast.iter_child_nodes(node):
+            found = search(child, guarded)
+            if found is not None:
+                return found
+        return None
+
+    return bool(search(root, False))
+
+
+def estimate_animation_count(code: str, scene: str) -> Optional[int]:
+    """
+    Statically count the animations a scene plays.
+
+    Counts ``self.play``/``self.wait`` calls in ``construct`` and in the scene
+    methods it calls. Returns None when the count depends on runtime control
+    flow (loops, branches, recursion) or the scene cannot be found.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == scene:
+            methods = {
+                item.name: item for item in node.body if isinstance(item, ast.FunctionDef)
+            }
+            if "construct" not in methods:
+                return None
+            return _count_in_method(methods, "construct", set())
+    return None
+
+
+def plan_shards(animation_count: int, shards: int) -> List[AnimationRange]:
+    """
+    Split ``animation_count`` animations into at most ``shards`` ranges.
+
+    Ranges are inclusive ``(start, end)`` pairs. The last range is open-ended
+    (``end`` is None) so any animations beyond the estimate are still rendered.
+    """
+    shards = max(1, min(shards, animation_count))
+    size, extra = divmod(animation_count, shards)
+    ranges: List[AnimationRange] = []
+    start = 0
+    for index in range(shards):
+        end = start + size + (1 if index < extra else 0) - 1
+        ranges.append((start, end if index < shards - 1 else None))
+        start = end + 1
+    return ranges
+
+
+def format_range_flag(animation_range: Sequence[Optional[int]]) -> str:
+    """Format a range as the value of Manim's ``-n`` option."""
+    start, end = animation_range
+    return f"{start},{end}" if end is not None else f"{start}"
+
+
+async def concat_videos(inputs: Sequence[Path], output: Path, ffmpeg: str = "ffmpeg") -> None:
+    """
+    Join videos with ffmpeg's concat demuxer, copying streams as-is.
+
+    Raises:
+        RuntimeError: If ffmpeg fails
+    """
+    output.parent.mkdir(parents=True, exist_ok=True)
+    list_file = output.with_name(f".{output.stem}.concat.txt")
+    list_file.write_text(
+        "".join(
+            "file '{}'\n".format(str(path.resolve()).replace("'", "'\\''"))
+            for path in inputs
+        ),
+        encoding="utf-8",
+    )
+    try:
+        process = await asyncio.create_subprocess_exec(
+            ffmpeg, "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(list_file),
+            "-c", "copy", str(output),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"ffmpeg concat failed: {stderr.decode('utf-8', errors='replace')[-2000:]}"
+            )
+    finally:
+        list_file.unlink(missing_ok=True)
@@ -0,0 +1,152 @@
+"""
+AST-based security checks for Manim scripts.
+
+A single visitor pass inspects imports, calls and attribute access, so string
+literals and comments can no longer trigger false positives and aliased
+imports (``from os import system``) can no longer slip through. Blocked
+builtins are flagged wherever they are referenced, not only when called, so
+aliasing them (``e = eval``) or reaching them by string through namespaces,
+``getattr`` or subscripts is caught too. Verdicts are
+memoized by a hash of the code, so validating the same script repeatedly (as
+``execute_manim_complete`` does) costs one dictionary lookup.
+"""
+
+import ast
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Modules that give scripts access to the host system
+BLOCKED_MODULES = frozenset({
+    "os", "subprocess", "sys", "shutil", "socket", "ctypes",
+    "importlib", "builtins", "multiprocessing", "pty",
+})
+# Builtins that execute code, touch files or block on stdin (flagged wherever referenced)
+BLOCKED_CALLS = frozenset({
+    "__import__", "exec", "eval", "compile", "open", "file",
+    "input", "raw_input", "breakpoint",
+})
+# Attributes used to escape into interpreter internals
+BLOCKED_ATTRIBUTES = frozenset({
+    "__builtins__", "__globals__", "__subclasses__", "__code__",
+    "__import__", "__loader__",
+})
+
+# Builtins returning namespaces in which blocked names can be looked up by string
+NAMESPACE_CALLS = frozenset({"globals", "locals", "vars"})
+# Builtins taking an attribute name as a string; dunder names are flagged
+_ATTRIBUTE_FUNCTIONS = frozenset({"getattr", "setattr", "delattr", "hasattr"})
+
+_VERDICT_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class Finding:
+    """A single validation problem and where it occurs."""
+
+    rule: str
+    message: str
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"line {self.line}: {self.message}"
+
+
+class _SecurityVisitor(ast.NodeVisitor):
+    """Collect findings for blocked imports, calls and attributes."""
+
+    def __init__(self) -> None:
+        self.findings: List[Finding] = []
+
+    def _report(self, node: ast.AST, rule: str, message: str) -> None:
+        self.findings.append(
+            Finding(rule, message, getattr(node, "lineno", 0), getattr(node, "col_offset", 0))
+        )
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.name.split(".")[0] in BLOCKED_MODULES:
+                self._report(node, "import", f"import {alias.name}")
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        if node.level == 0 and module.split(".")[0] in BLOCKED_MODULES:
+            names = ", ".join(alias.name for alias in node.names)
+            self._report(node, "import", f"from {module} import {names}")
+        self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func = node.func
+        if not isinstance(func, ast.Name):
+            self.generic_visit(node)
+            return
+        if func.id in BLOCKED_CALLS or func.id in NAMESPACE_CALLS:
+            self._report(node, "call", f"{func.id}(")
+        elif func.id in _ATTRIBUTE_FUNCTIONS and len(node.args) > 1:
+            name = _string_constant(node.args[1])
+            if name is not None and name.startswith("__") and name.endswith("__"):
+                self._report(node, "attribute", f"{func.id}(..., {name!r})")
+        # The callee was checked above; visiting it again would report it twice
+        for child in (*node.args, *node.keywords):
+            self.visit(child)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        if node.attr in BLOCKED_ATTRIBUTES:
+            self._report(node, "attribute", f".{node.attr}")
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:
+        key = _string_constant(node.slice)
+        if key in BLOCKED_ATTRIBUTES:
+            self._report(node, "attribute", f"[{key!r}]")
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if node.id == "__builtins__":
+            self._report(node, "attribute", node.id)
+        elif isinstance(node.ctx, ast.Load) and (node.id in BLOCKED_CALLS or node.id in NAMESPACE_CALLS):
+            # A reference that is not a direct call, e.g. ``e = eval``
+            self._report(node, "name", node.id)
+
+
+def _string_constant(node: ast.AST) -> Optional[str]:
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+
+_verdicts: "OrderedDict[str, Tuple[Finding, ...]]" = OrderedDict()
+
+
+def analyze_code(code: str) -> List[Finding]:
+    """
+    Return the security findings for ``code`` (empty if it is safe).
+
+    Code that does not parse yields a single ``syntax`` finding, since it
+    cannot be checked.
+    """
+    key = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+    cached = _verdicts.get(key)
+    if cached is not None:
+        _verdicts.move_to_end(key)
+        return list(cached)
+
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        findings = [Finding("syntax", f"syntax error: {e.msg}", e.lineno or 0, e.offset or 0)]
+    else:
+        visitor = _SecurityVisitor()
+        visitor.visit(tree)
+        findings = visitor.findings
+
+    _verdicts[key] = tuple(findings)
+    if len(_verdicts) > _VERDICT_CACHE_SIZE:
+        _verdicts.popitem(last=False)
+    return findings
+
+
+def clear_verdict_cache() -> None:
+    """Forget all memoized verdicts."""
+    _verdicts.clear()
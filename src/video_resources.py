@@ -0,0 +1,94 @@
+"""
+Rendered videos exposed as MCP resources.
+
+Each video is addressed by its absolute path as ``manim://video/<path>``.
+Reads return a byte range of the file, chosen with ``?offset=&length=`` query
+parameters, so clients on another machine can fetch large videos piece by
+piece. Ranges are read with ``pread``: only the requested range is copied
+into server memory, never the whole video. Videos are not memory-mapped,
+since re-renders and encodes rewrite them in place and touching a mapping
+of a truncated file kills the process with SIGBUS.
+"""
+
+import os
+import weakref
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+VIDEO_URI_PREFIX = "manim://video"
+# RFC 6570 template advertised to clients
+VIDEO_URI_TEMPLATE = VIDEO_URI_PREFIX + "{+path}{?offset,length}"
+
+MIME_TYPES: Dict[str, str] = {
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+    ".webm": "video/webm",
+    ".gif": "image/gif",
+    ".mkv": "video/x-matroska",
+}
+
+
+def video_uri(path: Path) -> str:
+    """Return the resource URI of a video file."""
+    return VIDEO_URI_PREFIX + quote(str(path))
+
+
+def parse_video_uri(uri: str) -> Tuple[Path, int, Optional[int]]:
+    """
+    Split a video resource URI into the file path and the requested byte range.
+
+    Returns:
+        The path, the start offset and the length (None if not given)
+
+    Raises:
+        ValueError: If ``uri`` is not a video URI or its range is invalid
+    """
+    parts = urlsplit(uri)
+    if f"{parts.scheme}://{parts.netloc}" != VIDEO_URI_PREFIX or not parts.path:
+        raise ValueError(f"Not a video resource: {uri}")
+    query = parse_qs(parts.query)
+    try:
+        offset = int(query.get("offset", ["0"])[0])
+        length = int(query["length"][0]) if "length" in query else None
+    except ValueError:
+        raise ValueError(f"offset and length must be integers: {uri}")
+    if offset < 0 or (length is not None and length < 1):
+        raise ValueError(f"offset must be non-negative and length positive: {uri}")
+    return Path(unquote(parts.path)), offset, length
+
+
+def mime_type(path: Path) -> str:
+    return MIME_TYPES.get(path.suffix.lower(), "application/octet-stream")
+
+
+def read_range(path: Path, offset: int, length: int) -> bytes:
+    """Return up to ``length`` bytes of ``path`` starting at ``offset`` (empty past the end)."""
+    with open(path, "rb") as handle:
+        return os.pread(handle.fileno(), length, offset)
+
+
+class ResourceSubscriptions:
+    """
+    Client sessions interested in video resources.
+
+    Sessions that listed or subscribed to resources are told when the list
+    changes; subscribers of a URI are also told when that video is rewritten.
+    Sessions are held weakly, so disconnected clients drop out.
+    """
+
+    def __init__(self):
+        self._uris: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+
+    def listen(self, session: Any) -> None:
+        self._uris.setdefault(session, set())
+
+    def subscribe(self, session: Any, uri: str) -> None:
+        self._uris.setdefault(session, set()).add(uri)
+
+    def unsubscribe(self, session: Any, uri: str) -> None:
+        self._uris.get(session, set()).discard(uri)
+
+    def listeners(self) -> List[Tuple[Any, Set[str]]]:
+        """Return each interested session with the URIs it subscribed to."""
+        return list(self._uris.items())
@@ -0,0 +1,217 @@
+"""
+Pool of warm Manim worker processes.
+
+Each worker (see ``manim_worker.py``) pays the interpreter start-up and the
+``import manim`` cost once and then renders many jobs. Workers are spawned
+lazily, reused while idle and recycled after ``max_jobs`` renders so leaks in
+user scripts or Manim itself cannot accumulate.
+
+A job's console output travels on stderr, separately from its reply, so the
+reply can arrive before the last output lines have been read. Each job
+therefore carries an end marker that the worker prints on stderr once the job
+is over; a job is only finished when its marker has been read.
+"""
+
+import asyncio
+import json
+import sys
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .process_group import DEFAULT_KILL_GRACE, terminate_process_group
+from .progress import iter_output_lines
+
+WORKER_SCRIPT = Path(__file__).parent / "manim_worker.py"
+LineCallback = Callable[[str], Awaitable[None]]
+_LOG_LINES = 200
+_STREAM_LIMIT = 1024 * 1024
+
+
+class WorkerPoolError(RuntimeError):
+    """Raised when a worker dies or speaks an unexpected protocol."""
+    pass
+
+
+class _Worker:
+    """A single worker process and its protocol streams."""
+
+    def __init__(self, process: asyncio.subprocess.Process, kill_grace: float = DEFAULT_KILL_GRACE):
+        self.process = process
+        self.kill_grace = kill_grace
+        self.jobs_done = 0
+        self.log: Deque[str] = deque(maxlen=_LOG_LINES)
+        self.on_line: Optional[LineCallback] = None
+        # End marker of the running job and the event set once it was read
+        self._job_end: Optional[Tuple[str, asyncio.Event]] = None
+        self._drain_task = asyncio.create_task(self._drain_stderr())
+
+    @classmethod
+    async def spawn(
+        cls,
+        command: Sequence[str],
+        kill_grace: float = DEFAULT_KILL_GRACE,
+    ) -> "_Worker":
+        # A session of its own lets close() stop the ffmpeg/LaTeX children too
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_STREAM_LIMIT,
+            start_new_session=True,
+        )
+        worker = cls(process, kill_grace)
+        hello = await worker._read_message()
+        if not hello.get("ready"):
+            await worker.close()
+            raise WorkerPoolError(f"Worker failed to start: {hello}")
+        return worker
+
+    async def run(
+        self, job: Dict[str, Any], on_line: Optional[LineCallback] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """Send ``job`` and return the reply along with the job's log output."""
+        self.log.clear()
+        self.on_line = on_line
+        marker = f"manim-worker: end of job {uuid.uuid4().hex}"
+        ended = asyncio.Event()
+        self._job_end = (marker, ended)
+        if self._drain_task.done():
+            ended.set()
+        try:
+            self.process.stdin.write((json.dumps({**job, "end_marker": marker}) + "\n").encode("utf-8"))
+            await self.process.stdin.drain()
+            reply = await self._read_message()
+            self.jobs_done += 1
+            # The job's last output lines may still be in the stderr pipe
+            await ended.wait()
+        finally:
+            self.on_line = None
+            self._job_end = None
+        return reply, "\n".join(self.log)
+
+    async def close(self) -> None:
+        try:
+            await terminate_process_group(self.process, self.kill_grace)
+        finally:
+            self._drain_task.cancel()
+
+    async def _read_message(self) -> Dict[str, Any]:
+        line = await self.process.stdout.readline()
+        if not line:
+            raise WorkerPoolError(
+                "Worker exited unexpectedly:\n" + "\n".join(self.log)
+            )
+        try:
+            return json.loads(line)
+        except ValueError:
+            raise WorkerPoolError(f"Malformed worker reply: {line[:200]!r}")
+
+    async def _drain_stderr(self) -> None:
+        try:
+            async for line in iter_output_lines(self.process.stderr):
+                job_end = self._job_end
+                if job_end is not None and line.endswith(job_end[0]):
+                    # Output without a trailing newline can share the marker's line
+                    line = line[:-len(job_end[0])]
+                    if line:
+                        await self._output(line)
+                    job_end[1].set()
+                    continue
+                await self._output(line)
+        finally:
+            # Nothing more will arrive; do not keep a job waiting for its marker
+            if self._job_end is not None:
+                self._job_end[1].set()
+
+    async def _output(self, line: str) -> None:
+        self.log.append(line)
+        if self.on_line is not None:
+            await self.on_line(line)
+
+
+class WorkerPool:
+    """
+    Bounded pool of warm Manim workers.
+
+    Args:
+        size: Maximum number of concurrent worker processes
+        max_jobs: Number of jobs after which a worker is recycled
+        command: Worker command line (defaults to running ``manim_worker.py``
+            with the current interpreter)
+        kill_grace: Seconds a worker stopped mid-render (e.g. cancelled or
+            timed out) gets between SIGTERM and SIGKILL
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_jobs: int,
+        command: Optional[Sequence[str]] = None,
+        kill_grace: float = DEFAULT_KILL_GRACE,
+    ):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.command = list(command or [sys.executable, str(WORKER_SCRIPT)])
+        self.kill_grace = kill_grace
+        self.spawned = 0
+        self.recycled = 0
+        self.jobs = 0
+        self._idle: List[_Worker] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def render(
+        self, job: Dict[str, Any], on_line: Optional[LineCallback] = None
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Run a render job on a warm worker.
+
+        Args:
+            job: Render job description sent to the worker
+            on_line: Called with each line of worker output while rendering
+
+        Returns:
+            The worker reply (``ok``, ``outputs`` or ``error``/``traceback``)
+            and the log output produced while rendering
+
+        Raises:
+            WorkerPoolError: If the worker crashed while rendering
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        async with self._slots:
+            worker = self._idle.pop() if self._idle else await self._spawn()
+            try:
+                reply, log = await worker.run(job, on_line)
+            except BaseException:
+                # The worker's state is unknown (crash or cancellation)
+                await worker.close()
+                raise
+            self.jobs += 1
+            if worker.jobs_done >= self.max_jobs:
+                self.recycled += 1
+                await worker.close()
+            else:
+                self._idle.append(worker)
+            return reply, log
+
+    async def close(self) -> None:
+        """Terminate all idle workers."""
+        while self._idle:
+            await self._idle.pop().close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "spawned": self.spawned,
+            "recycled": self.recycled,
+            "jobs": self.jobs,
+        }
+
+    async def _spawn(self) -> _Worker:
+        worker = await _Worker.spawn(self.command, self.kill_grace)
+        self.spawned += 1
+        return worker
@@ -0,0 +1,193 @@
+"""
+Background garbage collection of render workspaces.
+
+``create_script`` without a ``script_dir`` creates a ``manim_work_<id>``
+directory under the server's base directory. The collector periodically
+removes these workspaces once they exceed a maximum age, then removes the
+least recently used ones until their total size fits a byte budget. Only
+directories with the workspace prefix are considered, so the render caches
+and catalog living beside them are never touched.
+
+A workspace's last use is its directory mtime, which the server bumps with
+:func:`touch_workspace` whenever a render uses it. Workspaces with a queued or
+running render are skipped. The busy check and an atomic rename out of the
+base directory happen together on the event loop, so a render cannot start in
+a workspace between the check and its removal; the slow recursive delete then
+runs in a worker thread.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Iterable, List, Optional, Tuple
+
+WORKSPACE_PREFIX = "manim_work_"
+_TRASH_DIR = ".gc_trash"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepReport:
+    """What one collection sweep found and removed."""
+
+    started_at: float
+    workspaces: int = 0
+    total_bytes: int = 0
+    removed: List[Tuple[str, int, str]] = field(default_factory=list)
+    skipped_busy: int = 0
+
+    @property
+    def freed_bytes(self) -> int:
+        return sum(size for _, size, _ in self.removed)
+
+    def summary(self) -> str:
+        expired = sum(1 for _, _, reason in self.removed if reason == "expired")
+        return (
+            f"removed {len(self.removed)} of {self.workspaces} workspaces "
+            f"({expired} expired, {len(self.removed) - expired} over budget), "
+            f"freed {self.freed_bytes / 1024 / 1024:.2f} MB, "
+            f"skipped {self.skipped_busy} busy"
+        )
+
+
+def touch_workspace(path: Path) -> None:
+    """Mark a workspace as just used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class WorkspaceGC:
+    """
+    Enforce a size budget and maximum age on the workspaces in ``base_dir``.
+
+    Args:
+        base_dir: Directory holding the workspaces
+        max_bytes: Total size budget for all workspaces (0 disables it)
+        max_age: Seconds since last use after which a workspace is removed
+            (0 disables it)
+        measure: Returns the size in bytes of a workspace; called in a worker thread
+        busy_paths: Returns the paths in use by queued or running renders
+        history: Number of sweep reports kept
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        max_bytes: int,
+        max_age: float,
+        measure: Callable[[Path], int],
+        busy_paths: Callable[[], Iterable[Path]],
+        history: int = 20,
+    ):
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._measure = measure
+        self._busy_paths = busy_paths
+        self.reports: Deque[SweepReport] = deque(maxlen=history)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or self.max_age > 0
+
+    async def sweep(self) -> SweepReport:
+        """Run one collection pass and return its report."""
+        report = SweepReport(started_at=time.time())
+        workspaces = await asyncio.to_thread(self._scan)
+        report.workspaces = len(workspaces)
+        report.total_bytes = sum(size for _, _, size in workspaces)
+
+        # Decide and detach on the event loop, where renders are submitted
+        busy = set(self._busy_paths())
+        remaining = report.total_bytes
+        detached: List[Path] = []
+        for last_used, workspace, size in sorted(workspaces):
+            if self.max_age > 0 and report.started_at - last_used > self.max_age:
+                reason = "expired"
+            elif self.max_bytes > 0 and remaining > self.max_bytes:
+                reason = "budget"
+            else:
+                continue
+            if self._is_busy(workspace, busy):
+                report.skipped_busy += 1
+                continue
+            trash = self._detach(workspace)
+            if trash is None:
+                continue
+            detached.append(trash)
+            remaining -= size
+            report.removed.append((workspace.name, size, reason))
+
+        if detached:
+            await asyncio.to_thread(self._delete, detached)
+        self.reports.append(report)
+        if report.removed or report.skipped_busy:
+            logger.info("Workspace GC: %s", report.summary())
+        return report
+
+    async def run(self, interval: float) -> None:
+        """Sweep every ``interval`` seconds until cancelled."""
+        if not self.enabled:
+            return
+        while True:
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Workspace GC sweep failed")
+            await asyncio.sleep(interval)
+
+    @property
+    def last_report(self) -> Optional[SweepReport]:
+        return self.reports[-1] if self.reports else None
+
+    def _scan(self) -> List[Tuple[float, Path, int]]:
+        """Return ``(last_used, path, size)`` for every workspace."""
+        workspaces = []
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except FileNotFoundError:
+            return workspaces
+        # Finish deleting anything an interrupted sweep left behind
+        trash = self.base_dir / _TRASH_DIR
+        if trash.is_dir():
+            shutil.rmtree(trash, ignore_errors=True)
+        for entry in entries:
+            if not entry.name.startswith(WORKSPACE_PREFIX):
+                continue
+            try:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                last_used = entry.stat(follow_symlinks=False).st_mtime
+                size = self._measure(Path(entry.path))
+            except OSError:
+                continue
+            workspaces.append((last_used, Path(entry.path), size))
+        return workspaces
+
+    @staticmethod
+    def _is_busy(workspace: Path, busy: Iterable[Path]) -> bool:
+        return any(path == workspace or workspace in path.parents for path in busy)
+
+    def _detach(self, workspace: Path) -> Optional[Path]:
+        """Move a workspace out of reach of new renders; return its new location."""
+        trash = self.base_dir / _TRASH_DIR / f"{workspace.name}.{uuid.uuid4().hex[:8]}"
+        try:
+            trash.parent.mkdir(exist_ok=True)
+            os.rename(workspace, trash)
+        except OSError:
+            return None
+        return trash
+
+    @staticmethod
+    def _delete(paths: List[Path]) -> None:
+        for path in paths:
+            shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,155 @@
+"""
+Single-pass workspace statistics with a per-directory summary cache.
+
+Each directory is summarized from one ``os.scandir`` listing: file counts and
+bytes per suffix, a few example file names, and its subdirectories. Summaries
+are cached keyed by the directory's mtime, which changes whenever an entry is
+added, removed or renamed, so walking an unchanged workspace again costs one
+``stat`` per directory. Files rewritten in place keep their old size until
+their directory changes.
+
+Hard-linked files (partial movies seeded from the shared cache, or one
+render's outputs linked into several scenes) are charged once per inode, so a
+workspace is never billed several times for the same bytes.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Example file names kept per suffix
+SAMPLE_NAMES = 5
+
+
+@dataclass
+class DirectorySummary:
+    """The direct contents of one directory."""
+
+    mtime_ns: int
+    subdirs: List[str]
+    counts: Dict[str, int] = field(default_factory=dict)
+    sizes: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[str]] = field(default_factory=dict)
+    # Files with several hard links: (st_dev, st_ino) -> (suffix, size), left out of ``sizes``
+    links: Dict[Tuple[int, int], Tuple[str, int]] = field(default_factory=dict)
+
+
+@dataclass
+class WorkspaceStats:
+    """Totals for a directory tree."""
+
+    directories: int = 0
+    files: int = 0
+    total_bytes: int = 0
+    counts: Dict[str, int] = field(default_factory=dict)
+    sizes: Dict[str, int] = field(default_factory=dict)
+    samples: Dict[str, List[str]] = field(default_factory=dict)
+    scanned_directories: int = 0
+
+    def count(self, suffix: str) -> int:
+        return self.counts.get(suffix, 0)
+
+
+def summarize_directory(path: str, mtime_ns: int) -> DirectorySummary:
+    """List ``path`` once and summarize its files by suffix."""
+    summary = DirectorySummary(mtime_ns=mtime_ns, subdirs=[])
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    summary.subdirs.append(entry.name)
+                    continue
+                stat = entry.stat()
+            except OSError:
+                # Broken symlink or entry removed while listing
+                continue
+            suffix = os.path.splitext(entry.name)[1].lower()
+            summary.counts[suffix] = summary.counts.get(suffix, 0) + 1
+            if stat.st_nlink > 1:
+                summary.links[(stat.st_dev, stat.st_ino)] = (suffix, stat.st_size)
+            else:
+                summary.sizes[suffix] = summary.sizes.get(suffix, 0) + stat.st_size
+            names = summary.samples.setdefault(suffix, [])
+            if len(names) < SAMPLE_NAMES:
+                names.append(entry.name)
+    return summary
+
+
+class WorkspaceStatsCache:
+    """
+    Compute :class:`WorkspaceStats` for directory trees, reusing cached summaries.
+
+    Args:
+        max_dirs: Number of directory summaries kept (least recently used are dropped)
+    """
+
+    def __init__(self, max_dirs: int = 10000):
+        self.max_dirs = max_dirs
+        self._summaries: "OrderedDict[str, DirectorySummary]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def collect(self, root: Path) -> WorkspaceStats:
+        """Walk ``root`` once and return its totals."""
+        stats = WorkspaceStats()
+        linked: Dict[Tuple[int, int], Tuple[str, int]] = {}
+        stack = [str(root)]
+        while stack:
+            directory = stack.pop()
+            summary = self._summary(directory, stats)
+            if summary is None:
+                continue
+            stats.directories += 1
+            for suffix, count in summary.counts.items():
+                stats.counts[suffix] = stats.counts.get(suffix, 0) + count
+                stats.files += count
+            for suffix, size in summary.sizes.items():
+                stats.sizes[suffix] = stats.sizes.get(suffix, 0) + size
+                stats.total_bytes += size
+            for suffix, names in summary.samples.items():
+                kept = stats.samples.setdefault(suffix, [])
+                kept.extend(names[:SAMPLE_NAMES - len(kept)])
+            linked.update(summary.links)
+            stack.extend(os.path.join(directory, name) for name in reversed(summary.subdirs))
+        for suffix, size in linked.values():
+            stats.sizes[suffix] = stats.sizes.get(suffix, 0) + size
+            stats.total_bytes += size
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._summaries.clear()
+
+    def _summary(self, directory: str, stats: WorkspaceStats) -> Optional[DirectorySummary]:
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+        with self._lock:
+            cached = self._summaries.get(directory)
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                self._summaries.move_to_end(directory)
+                return cached
+        try:
+            summary = summarize_directory(directory, mtime_ns)
+        except OSError:
+            return None
+        stats.scanned_directories += 1
+        with self._lock:
+            self._summaries[directory] = summary
+            self._summaries.move_to_end(directory)
+            while len(self._summaries) > self.max_dirs:
+                self._summaries.popitem(last=False)
+        return summary
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"directories": len(self._summaries), "max_directories": self.max_dirs}
+
+
+def largest_types(stats: WorkspaceStats, limit: int = 3) -> List[Tuple[str, int, int]]:
+    """Return ``(suffix, count, bytes)`` for the suffixes taking the most space."""
+    ranked = sorted(stats.sizes.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(suffix or "(none)", stats.counts[suffix], size) for suffix, size in ranked]
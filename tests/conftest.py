@@ -0,0 +1,167 @@
+"""Shared fixtures for the Manim MCP server tests."""
+
+import sys
+import textwrap
+from unittest.mock import patch
+
+import pytest
+
+from src import server
+from src.catalog import VideoCatalog
+from src.partial_cache import PartialMovieCache
+from src.render_cache import RenderCache
+from src.render_logs import RenderLogStore
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path):
+    """Keep tests away from the server's real caches, catalog and logs under BASE_DIR (caches disabled by default)."""
+    catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+    with patch.object(server, "render_cache", RenderCache(tmp_path / "render_cache", 0)), \
+            patch.object(server, "partial_cache", PartialMovieCache(tmp_path / "partial_cache", 0)), \
+            patch.object(server, "render_logs", RenderLogStore(tmp_path / "render_logs", 1024 * 1024, 2, 100)), \
+            patch.object(server, "video_catalog", catalog):
+        yield
+    catalog.close()
+
+# Minimal stand-in for the manim CLI: records each call and writes one video
+# per requested scene (or "Demo") where Manim would put it.
+STUB_MANIM = textwrap.dedent(
+    """
+    import os
+    import struct
+    import subprocess
+    import sys
+    import time
+    import zlib
+    from pathlib import Path
+
+    args = sys.argv[1:]
+    media_dir = Path("media")
+    if "--media_dir" in args:
+        i = args.index("--media_dir")
+        media_dir = Path(args[i + 1])
+        del args[i:i + 2]
+    animation_range = "all"
+    if "-n" in args:
+        i = args.index("-n")
+        animation_range = args[i + 1]
+        del args[i:i + 2]
+    positional = [a for a in args if not a.startswith("-")]
+    script = Path(positional[0])
+    scenes = positional[1:] or ["Demo"]
+
+    with open(script.parent / "calls.txt", "a") as calls:
+        calls.write(" ".join(sys.argv[1:]) + "\\n")
+    if "Broken" in scenes:
+        print("Traceback: scene Broken failed", file=sys.stderr)
+        sys.exit(1)
+    if "BadTex" in scenes:
+        # A LaTeX failure at the end of a lot of output
+        for index in range(5000):
+            print(f"tex log line {index}", file=sys.stderr)
+        print("! Undefined control sequence.", file=sys.stderr)
+        print("Traceback (most recent call last):", file=sys.stderr)
+        print('  File "scene.py", line 3, in construct', file=sys.stderr)
+        print("ValueError: latex error converting to dvi", file=sys.stderr)
+        sys.exit(1)
+    if "Hang" in scenes:
+        # A runaway render: a half-written partial movie and an ffmpeg-like
+        # child that never finish
+        partial_dir = media_dir / "videos" / script.stem / "720p30" / "partial_movie_files" / "Hang"
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        (partial_dir / "truncated.mp4").write_text("half a movie")
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+        (script.parent / "hang_pids.txt").write_text(f"{os.getpid()} {child.pid}")
+        time.sleep(600)
+    if "Spin" in scenes:
+        # Burns CPU until a CPU time limit stops it
+        while True:
+            pass
+    if "Hog" in scenes:
+        # Allocates far more memory than any test limit allows
+        hog = bytearray(2 * 1024 ** 3)
+    quality_dir = {"-ql": "480p15", "-qh": "1080p60", "-qp": "1440p60"}.get(
+        next((a for a in args if a.startswith("-q")), ""), "720p30"
+    )
+    if "-s" in args:
+        # Save a tiny PNG frame instead of a video
+        width, height = {"480p15": (8, 4), "1080p60": (32, 18)}.get(quality_dir, (16, 9))
+        chunk = lambda kind, data: (
+            struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+        )
+        rows = b"".join(b"\\x00" + b"\\x80" * width * 3 for _ in range(height))
+        png = (
+            b"\\x89PNG\\r\\n\\x1a\\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows))
+            + chunk(b"IEND", b"")
+        )
+        for scene in scenes:
+            image = media_dir / "images" / script.stem / f"{scene}_ManimCE_v0.18.0.png"
+            image.parent.mkdir(parents=True, exist_ok=True)
+            image.write_bytes(png)
+        sys.exit(0)
+    # Each "self.play(...)" line is one animation, cached by a hash of its text
+    plays = [line.strip() for line in script.read_text().splitlines() if "self.play(" in line]
+    for scene in scenes:
+        partial_dir = media_dir / "videos" / script.stem / quality_dir / "partial_movie_files" / scene
+        partial_dir.mkdir(parents=True, exist_ok=True)
+        partials = []
+        for index, play in enumerate(plays):
+            partial = partial_dir / f"{zlib.crc32(play.encode())}.mp4"
+            if not partial.exists():
+                print(f"Animation {index}: {play}:  100%|#| 15/15 [00:00]", file=sys.stderr)
+                partial.write_text(play)
+            partials.append(f"file 'file:{partial.resolve().as_posix()}'")
+        (partial_dir / "partial_movie_file_list.txt").write_text("\\n".join(partials))
+        video = media_dir / "videos" / script.stem / quality_dir / f"{scene}.mp4"
+        video.write_text(f"{scene}[{animation_range}]")
+    """
+)
+
+
+@pytest.fixture
+def stub_manim(tmp_path):
+    """Path to an executable that behaves like a (very fast) manim CLI."""
+    stub = tmp_path / "manim_stub.py"
+    stub.write_text(STUB_MANIM)
+    executable = tmp_path / "manim"
+    executable.write_text(f'#!/bin/sh\nexec {sys.executable} {stub} "$@"\n')
+    executable.chmod(0o755)
+    return str(executable)
+
+
+# Stand-in for ffmpeg: joins files for the concat demuxer, and otherwise
+# "encodes" by recording the source and the output options
+STUB_FFMPEG = textwrap.dedent(
+    """
+    import sys
+    from pathlib import Path
+
+    args = sys.argv[1:]
+    source = Path(args[args.index("-i") + 1])
+    output = args[-1]
+    if "concat" in args:
+        listing = source.read_text().splitlines()
+        inputs = [line[len("file '"):-1] for line in listing]
+        Path(output).write_text("+".join(Path(p).read_text() for p in inputs))
+    elif "%" in output:
+        for frame in range(3):
+            Path(output % frame).write_text(f"frame {frame} of {source.read_text()}")
+    else:
+        options = " ".join(args[args.index("-i") + 2:-1])
+        Path(output).write_text(f"{source.read_text()} | {options}")
+    """
+)
+
+
+@pytest.fixture
+def stub_ffmpeg(tmp_path):
+    """Path to an executable that concatenates and "encodes" files like ffmpeg."""
+    stub = tmp_path / "ffmpeg_stub.py"
+    stub.write_text(STUB_FFMPEG)
+    executable = tmp_path / "ffmpeg"
+    executable.write_text(f'#!/bin/sh\nexec {sys.executable} {stub} "$@"\n')
+    executable.chmod(0o755)
+    return str(executable)
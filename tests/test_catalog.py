@@ -0,0 +1,163 @@
+"""Tests for the SQLite video catalog."""
+
+import os
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.catalog import VideoCatalog, mp4_duration
+
+
+def _box(kind, payload):
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _write_mp4(path, seconds, timescale=1000):
+    mvhd = bytes(4) + struct.pack(">IIII", 0, 0, timescale, int(seconds * timescale)) + bytes(80)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(_box(b"ftyp", b"isom") + _box(b"mdat", bytes(64)) + _box(b"moov", _box(b"mvhd", mvhd)))
+
+
+class TestVideoCatalog:
+    """Test indexing, incremental rescans and queries."""
+
+    def test_mp4_duration_reads_movie_header(self, tmp_path):
+        _write_mp4(tmp_path / "a.mp4", 2.5)
+        (tmp_path / "b.mp4").write_text("not a movie")
+
+        assert mp4_duration(tmp_path / "a.mp4") == 2.5
+        assert mp4_duration(tmp_path / "b.mp4") is None
+
+    def test_rescan_is_incremental(self, tmp_path):
+        catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+        root = tmp_path / "media"
+        quality_dir = root / "videos" / "scene" / "720p30"
+        _write_mp4(quality_dir / "Intro.mp4", 1.0)
+        _write_mp4(quality_dir / "partial_movie_files" / "Intro" / "123.mp4", 0.5)
+
+        first = catalog.rescan(root)
+        assert first["added"] == 1
+        assert catalog.rescan(root) == {"listed_dirs": 0, "added": 0, "removed": 0}
+
+        (quality_dir / "Intro.mp4").unlink()
+        _write_mp4(quality_dir / "Outro.mp4", 3.0)
+        assert catalog.rescan(root) == {"listed_dirs": 1, "added": 1, "removed": 1}
+
+        records, total = catalog.query(root)
+        assert total == 1
+        assert (records[0].scene, records[0].quality, records[0].duration) == ("Outro", "720p30", 3.0)
+
+    def test_rescan_forgets_deleted_directories(self, tmp_path):
+        catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+        root = tmp_path / "media"
+        _write_mp4(root / "old" / "480p15" / "A.mp4", 1.0)
+        catalog.rescan(root)
+
+        for path in sorted((root / "old").rglob("*"), reverse=True):
+            path.unlink() if path.is_file() else path.rmdir()
+        (root / "old").rmdir()
+
+        assert catalog.rescan(root)["removed"] == 1
+        assert catalog.query(root)[1] == 0
+
+    def test_query_filters_and_pages(self, tmp_path):
+        catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+        root = tmp_path / "media"
+        for quality in ("480p15", "1080p60"):
+            for scene in ("A", "B", "C"):
+                video = root / quality / f"{scene}.mp4"
+                _write_mp4(video, 1.0)
+                catalog.record(video, script_hash="abc")
+
+        assert catalog.query(root, quality="480p15")[1] == 3
+        assert catalog.query(root, scene="B")[1] == 2
+        assert catalog.query(root, pattern="[AB].mp4", quality="1080p60")[1] == 2
+        assert catalog.query(root / "480p15", recursive=False)[1] == 3
+        assert catalog.query(tmp_path / "elsewhere")[1] == 0
+
+        page_one, total = catalog.query(root, limit=4)
+        page_two, _ = catalog.query(root, limit=4, offset=4)
+        assert total == 6
+        assert len(page_one) == 4 and len(page_two) == 2
+        assert not {r.path for r in page_one} & {r.path for r in page_two}
+
+    def test_videos_rewritten_in_place_are_refreshed(self, tmp_path):
+        catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+        root = tmp_path / "media"
+        video = root / "720p30" / "Intro.mp4"
+        gone = root / "720p30" / "Outro.mp4"
+        _write_mp4(video, 1.0)
+        _write_mp4(gone, 1.0)
+        catalog.rescan(root)
+
+        # A re-render rewrites the file without changing its directory
+        directory_mtime = os.stat(video.parent).st_mtime_ns
+        _write_mp4(video, 4.0)
+        os.utime(video, (time.time() + 5, time.time() + 5))
+        gone.write_bytes(b"")
+        gone.unlink()
+        os.utime(video.parent, ns=(directory_mtime, directory_mtime))
+
+        catalog.rescan(root)
+        records, total = catalog.query(root)
+        assert [(r.scene, r.duration) for r in records] == [("Intro", 4.0)] and total == 1
+        assert catalog.get(video).duration == 4.0
+
+    def test_get_and_recent_by_path_prefix(self, tmp_path):
+        catalog = VideoCatalog(tmp_path / "catalog.sqlite3")
+        videos = [tmp_path / name / "Demo.mp4" for name in ("work_a1", "work_a2", "work_b1")]
+        for video in videos:
+            _write_mp4(video, 1.0)
+            catalog.record(video)
+
+        assert catalog.get(videos[0]).path == str(videos[0])
+        assert catalog.get(tmp_path / "missing.mp4") is None
+        assert {r.path for r in catalog.recent(str(tmp_path / "work_a"))} == {str(v) for v in videos[:2]}
+        assert len(catalog.recent()) == 3 and len(catalog.recent(limit=1)) == 1
+
+
+    def test_importing_the_server_creates_no_files(self, tmp_path):
+        media_dir = tmp_path / "media"
+        subprocess.run(
+            [sys.executable, "-c", "import src.server"],
+            cwd=Path(server.__file__).parent.parent,
+            env={**os.environ, "MANIM_MEDIA_DIR": str(media_dir)},
+            check=True,
+        )
+        assert list(media_dir.iterdir()) == []
+
+
+class TestFindVideosFromCatalog:
+    """Test that renders are cataloged and find_videos answers from the index."""
+
+    @pytest.mark.asyncio
+    async def test_rendered_scenes_are_listed_with_filters(self, tmp_path, stub_manim):
+        script = tmp_path / "work" / "scene.py"
+        script.parent.mkdir()
+        script.write_text("class Intro(Scene): pass\nclass Outro(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            await server._render_animation(
+                {"script_path": str(script), "preview": False, "quality": "low", "scenes": ["Intro", "Outro"]}
+            )
+        records, _ = server.video_catalog.query(tmp_path)
+        assert {r.scene for r in records} == {"Intro", "Outro"}
+        assert all(r.script_hash for r in records)
+
+        result = await server._handle_find_videos(
+            {"search_dir": str(tmp_path), "quality": "low", "scene": "Outro"}
+        )
+        assert "Found 1 video file(s)" in result[0].text
+        assert "Outro.mp4" in result[0].text and "480p15" in result[0].text
+
+        paged = await server._handle_find_videos({"search_dir": str(tmp_path), "limit": 1})
+        assert "Showing 1-1 of 2" in paged[0].text
+
+        by_directory = await server._handle_find_videos({"search_dir": str(tmp_path), "pattern": "480p15/I*.mp4"})
+        assert "Found 1 video file(s)" in by_directory[0].text and "Intro.mp4" in by_directory[0].text
@@ -0,0 +1,119 @@
+"""Tests for encoder profiles and output formats."""
+
+import asyncio
+import sys
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.encoding import (
+    ENCODER_PROFILES,
+    build_ffmpeg_command,
+    encode_video,
+    output_path_for,
+    resolve_profile,
+)
+
+
+class TestProfiles:
+    """Test profile resolution and ffmpeg command construction."""
+
+    def test_resolve_profile(self):
+        assert resolve_profile() is None
+        assert resolve_profile("mp4") is None
+        assert resolve_profile("webm").name == "vp9"
+        assert resolve_profile(profile_name="h264_small").output_format == "mp4"
+        with pytest.raises(ValueError, match="Unknown encoder profile"):
+            resolve_profile(profile_name="h263")
+        with pytest.raises(ValueError, match="produces webm, not gif"):
+            resolve_profile("gif", "vp9")
+        with pytest.raises(ValueError, match="Unsupported output format"):
+            resolve_profile("avi")
+
+    def test_x264_command_with_overrides(self, tmp_path):
+        profile = ENCODER_PROFILES["h264_small"]
+        command = build_ffmpeg_command(
+            tmp_path / "a.mp4", tmp_path / "b.mp4", profile, crf=20, preset="fast", threads=2
+        )
+        joined = " ".join(command)
+        assert "-c:v libx264 -crf 20 -preset fast -pix_fmt yuv420p" in joined
+        assert "-threads 2" in joined and "+faststart" in joined
+
+    def test_gif_uses_generated_palette(self, tmp_path):
+        command = build_ffmpeg_command(tmp_path / "a.mp4", tmp_path / "a.gif", ENCODER_PROFILES["gif"])
+        graph = command[command.index("-filter_complex") + 1]
+        assert graph.startswith("[0:v]fps=15,scale=480:-1")
+        assert "palettegen" in graph and "paletteuse" in graph
+        assert "-c:v" not in command
+
+    def test_output_paths_sit_next_to_the_video(self, tmp_path):
+        video = tmp_path / "Intro.mp4"
+        assert output_path_for(video, ENCODER_PROFILES["vp9"]) == tmp_path / "Intro.vp9.webm"
+        assert output_path_for(video, ENCODER_PROFILES["png"]) == tmp_path / "Intro_frames" / "frame_%05d.png"
+
+    @pytest.mark.asyncio
+    async def test_png_sequence_counts_frames(self, tmp_path, stub_ffmpeg):
+        video = tmp_path / "Intro.mp4"
+        video.write_text("movie")
+        result = await encode_video(video, ENCODER_PROFILES["png"], stub_ffmpeg)
+
+        assert result.output == tmp_path / "Intro_frames"
+        assert result.files == 3 and result.bytes > 0
+
+
+    @pytest.mark.asyncio
+    async def test_cancelled_encode_reaps_ffmpeg(self, tmp_path):
+        video = tmp_path / "Intro.mp4"
+        video.write_text("movie")
+        hanging = tmp_path / "ffmpeg"
+        hanging.write_text(f'#!/bin/sh\nexec {sys.executable} -c "import time; time.sleep(60)"\n')
+        hanging.chmod(0o755)
+        processes = []
+        spawn = asyncio.create_subprocess_exec
+
+        async def record(*args, **kwargs):
+            processes.append(await spawn(*args, **kwargs))
+            return processes[-1]
+
+        with patch("src.encoding.asyncio.create_subprocess_exec", record):
+            task = asyncio.create_task(encode_video(video, ENCODER_PROFILES["vp9"], str(hanging)))
+            while not processes:
+                await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        assert processes[0].returncode is not None
+
+class TestRenderWithEncoding:
+    """Test encoding options on the render tools."""
+
+    @pytest.mark.asyncio
+    async def test_render_to_webm(self, tmp_path, stub_manim, stub_ffmpeg):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "FFMPEG_EXECUTABLE", stub_ffmpeg):
+            result = await server._handle_render_animation(
+                {"script_path": str(script), "preview": False, "output_format": "webm", "crf": 40}
+            )
+
+        webm = script.parent / "media" / "videos" / "scene" / "720p30" / "Demo.vp9.webm"
+        assert f"Encoded with vp9 (webm):\n- {webm}" in result[0].text
+        assert "-c:v libvpx-vp9 -crf 40" in webm.read_text()
+        records, _ = server.video_catalog.query(tmp_path, pattern="*.webm")
+        assert [(r.path, r.scene) for r in records] == [(str(webm), "Demo")]
+
+    @pytest.mark.asyncio
+    async def test_mismatched_options_are_rejected_before_rendering(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            with pytest.raises(ValueError, match="produces mp4"):
+                await server._handle_render_animation(
+                    {"script_path": str(script), "output_format": "gif", "encoder_profile": "h264_fast"}
+                )
+        assert not (tmp_path / "calls.txt").exists()
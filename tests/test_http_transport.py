@@ -0,0 +1,101 @@
+"""Tests for the HTTP transports and per-session workspace isolation."""
+
+import asyncio
+import re
+
+import pytest
+import uvicorn
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+from unittest.mock import patch
+
+from src import server
+from src.http_transport import create_app
+
+
+class _Session:
+    """Stands in for an MCP server session."""
+
+
+def _created(text: str):
+    return re.search(r"Script id: (\S+)", text).group(1), re.search(r"Directory: (.+)", text).group(1).strip()
+
+
+class TestSessionIsolation:
+    """Test that isolated sessions only reach their own workspaces."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_cannot_reach_each_other(self, tmp_path, stub_manim):
+        alice, bob = _Session(), _Session()
+        current = {"session": alice}
+        code = "from manim import *\n\nclass Demo(Scene):\n    pass\n"
+
+        with patch.object(server, "BASE_DIR", tmp_path), \
+                patch.object(server, "SESSION_ISOLATION", True), \
+                patch.object(server, "ALLOW_UNVALIDATED_SCRIPTS", False), \
+                patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "_request_session", lambda: current["session"]):
+            script_id, workspace = _created((await server._handle_create_script({"code": code}))[0].text)
+            rendered = await server._handle_render_animation({"script_id": script_id, "preview": False})
+
+            current["session"] = bob
+            with pytest.raises(ValueError, match="Unknown script id"):
+                await server._handle_render_animation({"script_id": script_id})
+            with pytest.raises(ValueError, match="outside this session's workspaces"):
+                await server._handle_cleanup_files({"target_path": workspace, "recursive": True})
+            with pytest.raises(ValueError, match="outside this session's workspaces"):
+                await server._handle_find_videos({"search_dir": str(tmp_path)})
+            with pytest.raises(ValueError, match="outside this session's workspaces"):
+                await server._handle_create_script({"code": code, "script_dir": str(tmp_path.parent)})
+            with pytest.raises(ValueError, match="validate: false is not allowed"):
+                await server._handle_create_script({"code": code, "validate": False})
+            for script_name in ("../../escaped", "/tmp/escaped", "..", f"../{workspace.rsplit('/', 1)[1]}/stolen"):
+                with pytest.raises(ValueError, match="script_name must be a file name"):
+                    await server._handle_create_script({"code": code, "script_name": script_name})
+            _, bob_workspace = _created((await server._handle_create_script({"code": code}))[0].text)
+            with pytest.raises(ValueError, match="Unknown script id"):
+                await server._handle_find_videos({"search_dir": bob_workspace, "script_id": script_id})
+
+            current["session"] = alice
+            info = await server._handle_get_workspace_info({"workspace_path": workspace})
+
+        assert "✅ Animation rendered successfully!" in rendered[0].text
+        assert "📁 Workspace:" in info[0].text
+        assert workspace != bob_workspace
+        assert all(path.startswith(str(tmp_path / "manim_work_")) for path in (workspace, bob_workspace))
+
+
+class TestHTTPTransport:
+    """Test several clients sharing one server over streamable HTTP and SSE."""
+
+    @pytest.mark.asyncio
+    async def test_clients_share_one_server(self, tmp_path):
+        config = uvicorn.Config(create_app(server.server), host="127.0.0.1", port=0, log_level="warning")
+        http = uvicorn.Server(config)
+
+        with patch.object(server, "BASE_DIR", tmp_path), patch.object(server, "SESSION_ISOLATION", True):
+            serving = asyncio.create_task(http.serve())
+            while not http.started:
+                await asyncio.sleep(0.01)
+            port = http.servers[0].sockets[0].getsockname()[1]
+            code = "from manim import *\n\nclass Demo(Scene):\n    pass\n"
+            try:
+                async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp") as (read, write, _), \
+                        ClientSession(read, write) as first, \
+                        sse_client(f"http://127.0.0.1:{port}/sse") as (sse_read, sse_write), \
+                        ClientSession(sse_read, sse_write) as second:
+                    await first.initialize()
+                    await second.initialize()
+                    tools = await second.list_tools()
+                    created = await first.call_tool("create_script", {"code": code})
+                    _, workspace = _created(created.content[0].text)
+                    own = await first.call_tool("get_workspace_info", {"workspace_path": workspace})
+                    other = await second.call_tool("get_workspace_info", {"workspace_path": workspace})
+            finally:
+                http.should_exit = True
+                await serving
+
+        assert "render_animation" in {tool.name for tool in tools.tools}
+        assert "scene.py" in own.content[0].text
+        assert "outside this session's workspaces" in other.content[0].text
@@ -0,0 +1,165 @@
+"""Tests for the shared partial movie cache."""
+
+import os
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from src import server
+from src.partial_cache import PartialMovieCache, animation_reuse, link_partial_movies, partial_movie_dir
+
+SCRIPT_A = """
+class Demo(Scene):
+    def construct(self):
+        self.play(Create(Circle()))
+        self.play(Write(Text("a")))
+"""
+
+SCRIPT_B = """
+class Demo(Scene):
+    def construct(self):
+        self.play(Create(Circle()))
+        self.play(Write(Text("b")))
+"""
+
+
+def _partials(media_dir, stem):
+    return media_dir / "videos" / stem / "720p30" / "partial_movie_files" / "Demo"
+
+
+class TestPartialMovieCache:
+    """Test seeding, harvesting and eviction."""
+
+    def test_harvest_publishes_and_seed_links(self, tmp_path):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=1024)
+        partial_dir = _partials(tmp_path / "a", "scene")
+        seeded = cache.seed(tmp_path / "a", "scene", "medium", ["Demo"])
+        # Manim renders one cached and one uncached animation
+        partial_dir.mkdir(parents=True)
+        (partial_dir / "111.mp4").write_text("x" * 10)
+        (partial_dir / "uncached_00000.mp4").write_text("y")
+        (partial_dir / "partial_movie_file_list.txt").write_text(
+            f"file 'file:{partial_dir}/111.mp4'\nfile 'file:{partial_dir}/uncached_00000.mp4'\n"
+        )
+
+        report = cache.harvest(tmp_path / "a", "scene", seeded)
+        assert (report.reused, report.rendered, report.published) == (0, 1, 1)
+        assert (tmp_path / "pool" / "720p30" / "111.mp4").exists()
+
+        seeded = cache.seed(tmp_path / "b", "other", "medium", ["Demo"])
+        assert (_partials(tmp_path / "b", "other") / "111.mp4").read_text() == "x" * 10
+        assert seeded.seeded[_partials(tmp_path / "b", "other")] == {"111"}
+
+    def test_seed_links_only_the_scenes_hashes_and_harvest_drops_unused_links(self, tmp_path):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=1024)
+        pool = tmp_path / "pool" / "720p30"
+        pool.mkdir(parents=True)
+        for partial in ("111", "222", "333"):
+            (pool / f"{partial}.mp4").write_text(partial)
+        cache._remember(pool, "Demo", {"111", "222"})
+        cache._remember(pool, "Other", {"333"})
+        partial_dir = _partials(tmp_path / "a", "scene")
+        partial_dir.mkdir(parents=True)
+        (partial_dir / "444.mp4").write_text("already rendered here")
+
+        report = cache.seed(tmp_path / "a", "scene", "medium", ["Demo"])
+        assert sorted(p.stem for p in partial_dir.glob("*.mp4")) == ["111", "222", "444"]
+
+        # Manim uses one seeded and one pre-existing animation
+        (partial_dir / "partial_movie_file_list.txt").write_text(
+            f"file 'file:{partial_dir}/111.mp4'\nfile 'file:{partial_dir}/444.mp4'\n"
+        )
+        report = cache.harvest(tmp_path / "a", "scene", report)
+        assert (report.reused, report.rendered, report.published) == (1, 0, 1)
+        assert sorted(p.stem for p in partial_dir.glob("*.mp4")) == ["111", "444"]
+        assert cache._scene_hashes(pool, "Demo") == {"111", "222", "444"}
+
+    def test_harvest_without_file_list_drops_seeded_links(self, tmp_path):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=1024)
+        pool = tmp_path / "pool" / "720p30"
+        pool.mkdir(parents=True)
+        (pool / "111.mp4").write_text("111")
+        cache._remember(pool, "Demo", {"111"})
+        partial_dir = _partials(tmp_path / "a", "scene")
+
+        # The render fails before Manim writes its file list
+        seeded = cache.seed(tmp_path / "a", "scene", "medium", ["Demo"])
+        assert [p.stem for p in partial_dir.glob("*.mp4")] == ["111"]
+        report = cache.harvest(tmp_path / "a", "scene", seeded)
+        assert report.reused == 0
+        assert list(partial_dir.glob("*.mp4")) == []
+
+    def test_concurrent_remember_keeps_every_hash(self, tmp_path):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=1024)
+        pool = tmp_path / "pool" / "720p30"
+        pool.mkdir(parents=True)
+        hashes = [str(n) for n in range(16)]
+        for partial in hashes:
+            (pool / f"{partial}.mp4").write_text(partial)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda partial: cache._remember(pool, "Demo", {partial}), hashes))
+        assert cache._scene_hashes(pool, "Demo") == set(hashes)
+
+    def test_publish_skips_entries_locked_by_another_render(self, tmp_path):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=1024)
+        partial = tmp_path / "222.mp4"
+        partial.write_text("data")
+        entry = tmp_path / "pool" / "720p30" / "222.mp4"
+        entry.parent.mkdir(parents=True)
+        entry.with_name("222.mp4.lock").touch()
+
+        assert cache._publish(partial, entry) is False
+        assert not entry.exists()
+
+    def test_eviction_removes_least_recently_used(self, tmp_path):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=25)
+        pool = tmp_path / "pool" / "720p30"
+        pool.mkdir(parents=True)
+        for age, name in enumerate(("new", "mid", "old")):
+            entry = pool / f"{name}.mp4"
+            entry.write_text("x" * 10)
+            os.utime(entry, (1000 - age, 1000 - age))
+
+        assert cache.evict() == 10
+        assert sorted(p.stem for p in pool.iterdir()) == ["mid", "new"]
+
+    def test_link_partial_movies_and_animation_reuse(self, tmp_path):
+        source = partial_movie_dir(tmp_path, "scene", "medium", "Demo")
+        target = partial_movie_dir(tmp_path, "scene_r2", "medium", "Demo")
+        source.mkdir(parents=True)
+        (source / "111.mp4").write_text("x")
+        (source / "uncached_00000.mp4").write_text("y")
+
+        assert link_partial_movies(source, target) == 1
+        assert link_partial_movies(source, target) == 0
+        assert partial_movie_dir(tmp_path, "scene", "8k", "Demo") is None
+
+        (target / "222.mp4").write_text("z")
+        (target / "partial_movie_file_list.txt").write_text(
+            f"file 'file:{target}/222.mp4'\nfile 'file:{target}/111.mp4'\n"
+        )
+        assert animation_reuse(target, {"111"}) == ([1], [0])
+
+
+class TestSharedPartialsAcrossWorkspaces:
+    """Test that renders in different workspaces share animations."""
+
+    @pytest.mark.asyncio
+    async def test_second_workspace_reuses_shared_animation(self, tmp_path, stub_manim):
+        cache = PartialMovieCache(tmp_path / "pool", max_bytes=1024 * 1024)
+        results = []
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "partial_cache", cache):
+            for workspace, code in (("one", SCRIPT_A), ("two", SCRIPT_B)):
+                script = tmp_path / workspace / "scene.py"
+                script.parent.mkdir()
+                script.write_text(code)
+                results.append(await server._handle_render_animation(
+                    {"script_path": str(script), "preview": False}
+                ))
+
+        assert "0 reused from shared cache, 2 rendered" in results[0][0].text
+        assert "1 reused from shared cache, 1 rendered" in results[1][0].text
+        assert cache.stats()["entries"] == 3
@@ -0,0 +1,79 @@
+"""Tests for inline frame previews."""
+
+import base64
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.preview import encode_preview, png_dimensions
+
+# 1x1 RGB PNG
+TINY_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAIAAACQd1PeAAAADElEQVR4nGNgYGAAAAAEAAH2FzhVAAAAAElFTkSuQmCC"
+)
+
+
+class TestEncodePreview:
+    """Test image encoding for inline previews."""
+
+    def test_png_dimensions(self):
+        assert png_dimensions(TINY_PNG) == (1, 1)
+        assert png_dimensions(b"not a png") is None
+
+    def test_unsupported_format_is_rejected(self, tmp_path):
+        frame = tmp_path / "frame.png"
+        frame.write_bytes(TINY_PNG)
+        with pytest.raises(ValueError, match="Unsupported preview format"):
+            encode_preview(frame, image_format="bmp")
+
+    def test_without_pillow_the_png_is_returned_unchanged(self, tmp_path):
+        frame = tmp_path / "frame.png"
+        frame.write_bytes(TINY_PNG)
+        with patch("src.preview.Image", None):
+            image = encode_preview(frame, max_size=16)
+        assert (image.data, image.mime_type, image.size) == (TINY_PNG, "image/png", (1, 1))
+
+    def test_large_frames_are_downscaled(self, tmp_path):
+        Image = pytest.importorskip("PIL.Image")
+        frame = tmp_path / "frame.png"
+        Image.new("RGB", (1920, 1080), "navy").save(frame)
+
+        image = encode_preview(frame, max_size=480, image_format="jpeg")
+        assert image.size == (480, 270)
+        assert image.mime_type == "image/jpeg"
+        assert len(image.data) < image.original_bytes
+
+
+class TestRenderPreviewFrame:
+    """Test the render_preview_frame tool and the render_animation option."""
+
+    @pytest.mark.asyncio
+    async def test_returns_image_content(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Intro(Scene): pass\nclass Outro(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            result = await server._handle_render_preview_frame({"script_path": str(script)})
+
+        text, image = result
+        assert "Scene: Intro (last frame)" in text.text
+        assert image.type == "image"
+        assert image.mimeType in ("image/jpeg", "image/png")
+        assert base64.b64decode(image.data)
+        calls = (tmp_path / "calls.txt").read_text()
+        assert "-ql -s" in calls and "Intro" in calls
+
+    @pytest.mark.asyncio
+    async def test_render_animation_frame_only_at_animation_index(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            result = await server._handle_render_animation(
+                {"script_path": str(script), "frame_only": True, "animation_index": 2, "quality": "high"}
+            )
+
+        assert "end of animation 2" in result[0].text
+        assert result[1].type == "image"
+        assert "-qh -n 0,2 -s" in (tmp_path / "calls.txt").read_text()
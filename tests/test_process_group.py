@@ -0,0 +1,156 @@
+"""Tests for render timeouts and process tree termination."""
+
+import asyncio
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.process_group import terminate_process_group
+from src.render_stats import RenderStats
+from src.scheduler import JobState, RenderScheduler
+
+# Ignores SIGTERM and starts a child that would outlive it
+STUBBORN = textwrap.dedent(
+    """
+    import signal, subprocess, sys, time
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(600)"])
+    print(child.pid, flush=True)
+    time.sleep(600)
+    """
+)
+
+
+def _alive(pid: int) -> bool:
+    """Return whether a process is running (zombies awaiting a reaper count as dead)."""
+    try:
+        state = Path(f"/proc/{pid}/stat").read_text().rsplit(")", 1)[1].split()[0]
+    except OSError:
+        return False
+    return state != "Z"
+
+
+async def _wait_for_file(path: Path, timeout: float = 10) -> str:
+    for _ in range(int(timeout / 0.05)):
+        if path.exists() and path.read_text():
+            return path.read_text()
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"{path} was never written")
+
+
+class TestTerminateProcessGroup:
+    """Test SIGTERM to SIGKILL escalation across a process group."""
+
+    @pytest.mark.asyncio
+    async def test_escalates_to_sigkill_and_reaches_children(self):
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", STUBBORN,
+            stdout=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        child_pid = int(await process.stdout.readline())
+
+        await terminate_process_group(process, grace=0.2)
+
+        assert process.returncode == -9
+        await asyncio.sleep(0.1)
+        assert not _alive(child_pid)
+
+    @pytest.mark.asyncio
+    async def test_reaches_children_of_an_exited_leader(self):
+        orphaning = (
+            "import subprocess, sys; "
+            "print(subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(600)']).pid)"
+        )
+        process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", orphaning,
+            stdout=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        child_pid = int(await process.stdout.readline())
+        # The child holds the pipe, so process.wait() would not return yet
+        while process.returncode is None:
+            await asyncio.sleep(0.05)
+
+        await terminate_process_group(process, grace=0.2)
+
+        await asyncio.sleep(0.1)
+        assert not _alive(child_pid)
+
+
+class TestRenderTimeouts:
+    """Test that timed-out and cancelled renders leave nothing behind."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_kills_render_tree_and_removes_partials(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Hang(Scene): pass\n")
+        stats = RenderStats()
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "RENDER_KILL_GRACE", 0.5), \
+                patch.object(server, "render_stats", stats):
+            with pytest.raises(server.RenderTimeoutError, match="timed out after 1s"):
+                await server._render_animation(
+                    {"script_path": str(script), "preview": False, "scenes": ["Hang"], "timeout": 1}
+                )
+
+        pids = [int(pid) for pid in (tmp_path / "hang_pids.txt").read_text().split()]
+        await asyncio.sleep(0.1)
+        assert not any(_alive(pid) for pid in pids)
+        assert not list((tmp_path / "media").rglob("*.mp4"))
+        assert stats.failures == 1
+
+    @pytest.mark.asyncio
+    async def test_multi_scene_timeout_keeps_the_other_scenes_outputs(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text(
+            "class Demo(Scene):\n    def construct(self):\n        self.play(Create(Circle()))\n"
+            "class Hang(Scene): pass\n"
+        )
+
+        # Both scenes render at once, so Demo's outputs are newer than the start of Hang's render
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "RENDER_KILL_GRACE", 0.5), \
+                patch.object(server, "render_scheduler", RenderScheduler(concurrency=2)):
+            result = await server._handle_render_animation(
+                {"script_path": str(script), "preview": False, "scenes": ["Demo", "Hang"], "timeout": 2}
+            )
+
+        quality_dir = tmp_path / "media" / "videos" / "scene" / "720p30"
+        assert "✅ Demo" in result[0].text and "❌ Hang" in result[0].text
+        assert (quality_dir / "Demo.mp4").exists()
+        assert list((quality_dir / "partial_movie_files" / "Demo").glob("*.mp4"))
+        assert not (quality_dir / "partial_movie_files" / "Hang" / "truncated.mp4").exists()
+
+    @pytest.mark.asyncio
+    async def test_cancel_render_frees_the_slot(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Hang(Scene): pass\n")
+        scheduler = RenderScheduler(concurrency=1)
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "RENDER_KILL_GRACE", 0.5), \
+                patch.object(server, "render_scheduler", scheduler):
+            job = server._submit_background_render(
+                {"script_path": str(script), "preview": False, "scenes": ["Hang"]}, "hang"
+            )
+            pids = [int(pid) for pid in (await _wait_for_file(tmp_path / "hang_pids.txt")).split()]
+            result = await server._handle_cancel_render({"job_id": job.id})
+            await asyncio.wait_for(job.done.wait(), 10)
+
+        assert "cancelled" in result[0].text
+        assert job.state is JobState.CANCELLED
+        assert scheduler.stats()["running"] == 0
+        assert not any(_alive(pid) for pid in pids)
+        assert not list((tmp_path / "media").rglob("truncated.mp4"))
+
+    def test_invalid_timeout_is_rejected(self):
+        with pytest.raises(ValueError, match="non-negative"):
+            server._render_timeout({"timeout": -1})
+        assert server._render_timeout({"timeout": 0}) is None
+        assert server._render_timeout({}) == server.RENDER_TIMEOUT
@@ -0,0 +1,75 @@
+"""Tests for incremental render output parsing."""
+
+import asyncio
+
+import pytest
+
+from src.progress import ProgressForwarder, iter_output_lines, parse_progress
+
+
+def _reader(data: bytes) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+class TestParseProgress:
+    """Test parsing of Manim's tqdm progress bars."""
+
+    def test_progress_bar_line(self):
+        line = "Animation 3: Create(Circle):  45%|####5     | 27/60 [00:00<00:00, 85.12it/s]"
+        update = parse_progress(line)
+        assert (update.animation, update.name) == (3, "Create(Circle)")
+        assert (update.frames_done, update.frames_total) == (27, 60)
+        assert update.progress == pytest.approx(3.45)
+
+    def test_other_output_is_ignored(self):
+        assert parse_progress("INFO     Animation 0 : Partial movie file written") is None
+
+
+class TestIterOutputLines:
+    """Test incremental line splitting."""
+
+    @pytest.mark.asyncio
+    async def test_splits_on_carriage_returns(self):
+        reader = _reader(b"first\r\nbar 1/2\rbar 2/2\nlast")
+        lines = [line async for line in iter_output_lines(reader)]
+        assert lines == ["first", "bar 1/2", "bar 2/2", "last"]
+
+    @pytest.mark.asyncio
+    async def test_long_lines_are_chunked(self):
+        reader = _reader(b"x" * 25 + b"\n")
+        lines = [line async for line in iter_output_lines(reader, max_line=10)]
+        assert [len(line) for line in lines] == [10, 10, 5]
+
+
+class TestProgressForwarder:
+    """Test throttled progress forwarding."""
+
+    @pytest.mark.asyncio
+    async def test_throttles_within_an_animation(self):
+        sent = []
+
+        async def callback(progress, message):
+            sent.append(progress)
+
+        forwarder = ProgressForwarder(callback, min_interval=60)
+        for animation in (0, 1):
+            for frame in range(1, 11):
+                await forwarder.feed(f"Animation {animation}: Wait:  {frame * 10}%|#| {frame}/10 [00:00]")
+
+        assert sent == pytest.approx([0.1, 1.0, 1.1, 2.0])
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_disables_forwarding(self):
+        calls = []
+
+        async def callback(progress, message):
+            calls.append(message)
+            raise ConnectionError("client gone")
+
+        forwarder = ProgressForwarder(callback, min_interval=0)
+        await forwarder.feed("Animation 0: Wait:  10%|#| 1/10 [00:00]")
+        await forwarder.feed("Animation 1: Wait:  10%|#| 1/10 [00:00]")
+        assert len(calls) == 1
@@ -0,0 +1,135 @@
+"""Tests for the content-addressed render cache."""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from src import server
+from src.render_cache import RenderCache, make_cache_key
+
+
+def _write_video(media_dir: Path, stem: str, name: str, size: int) -> Path:
+    video = media_dir / "videos" / stem / "720p30" / name
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_bytes(b"\0" * size)
+    return video
+
+
+class TestCacheKey:
+    """Test cache key derivation."""
+
+    def test_key_depends_on_all_inputs(self):
+        base = make_cache_key(b"code", "medium", ["-qm"], version="0.18.0")
+        assert base == make_cache_key(b"code", "medium", ["-qm"], version="0.18.0")
+        assert base != make_cache_key(b"code2", "medium", ["-qm"], version="0.18.0")
+        assert base != make_cache_key(b"code", "high", ["-qh"], version="0.18.0")
+        assert base != make_cache_key(b"code", "medium", ["-qm"], version="0.19.0")
+
+
+class TestRenderCache:
+    """Test storing, materializing and evicting cache entries."""
+
+    def test_store_and_materialize_under_new_script_name(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        video = _write_video(tmp_path / "a", "scene", "Demo.mp4", 10)
+
+        assert cache.lookup("k1") is False
+        assert cache.store("k1", tmp_path / "a", "scene", [video])
+        assert cache.lookup("k1") is True
+
+        outputs = cache.materialize("k1", tmp_path / "b", "other")
+        assert outputs == [tmp_path / "b" / "videos" / "other" / "720p30" / "Demo.mp4"]
+        assert outputs[0].read_bytes() == video.read_bytes()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_index_persists_across_instances(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        cache.store("k1", tmp_path, "scene", [_write_video(tmp_path, "scene", "A.mp4", 10)])
+
+        reopened = RenderCache(tmp_path / "cache", max_bytes=1024)
+        assert reopened.lookup("k1") is True
+
+    def test_rewriting_a_materialized_file_leaves_the_entry_intact(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        video = _write_video(tmp_path / "a", "scene", "Demo.mp4", 10)
+        cache.store("k1", tmp_path / "a", "scene", [video])
+
+        output = cache.materialize("k1", tmp_path / "b", "scene")[0]
+        with open(output, "r+b") as handle:
+            # A re-render of edited code overwrites the output in place
+            handle.write(b"new video!")
+
+        assert cache.materialize("k1", tmp_path / "c", "scene")[0].read_bytes() == video.read_bytes()
+        assert cache.materialize("k1", tmp_path / "b", "scene")[0].read_bytes() == video.read_bytes()
+
+    def test_hits_do_not_rewrite_the_index_each_time(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        cache.store("k1", tmp_path, "scene", [_write_video(tmp_path, "scene", "A.mp4", 10)])
+        index = tmp_path / "cache" / "index.json"
+        saved = index.read_text()
+
+        cache.lookup("k1")
+        assert index.read_text() == saved
+        cache.flush()
+        assert index.read_text() != saved
+
+    def test_lru_eviction_respects_budget(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=25)
+        for key in ("k1", "k2"):
+            cache.store(key, tmp_path, "scene", [_write_video(tmp_path, "scene", f"{key}.mp4", 10)])
+        cache.lookup("k1")  # k2 is now least recently used
+        cache.store("k3", tmp_path, "scene", [_write_video(tmp_path, "scene", "k3.mp4", 10)])
+
+        assert cache.stats()["entries"] == 2
+        assert cache.stats()["bytes"] <= 25
+        assert cache.lookup("k2") is False
+        assert cache.lookup("k1") is True
+
+    def test_oversized_outputs_are_not_stored(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=5)
+        video = _write_video(tmp_path, "scene", "Big.mp4", 10)
+        assert cache.store("k1", tmp_path, "scene", [video]) is False
+
+    def test_concurrent_stores_of_one_key(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        video = _write_video(tmp_path, "scene", "A.mp4", 10)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(
+                lambda _: cache.store("k1", tmp_path, "scene", [video]), range(8)
+            ))
+        assert all(results)
+        assert cache.lookup("k1") is True
+        assert [p.name for p in (tmp_path / "cache").iterdir() if p.name.startswith(".k1")] == []
+
+    def test_fetch_counts_an_evicted_entry_as_a_miss(self, tmp_path):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024)
+        cache.store("k1", tmp_path, "scene", [_write_video(tmp_path, "scene", "A.mp4", 10)])
+
+        assert cache.fetch("k1", tmp_path / "b", "scene") is not None
+        with patch.object(cache, "_copy_out", side_effect=FileNotFoundError):
+            # Evicted by another render after the hit was counted
+            assert cache.fetch("k1", tmp_path / "b", "scene") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+
+class TestRenderAnimationCache:
+    """Test that render_animation reuses cached renders."""
+
+    @pytest.mark.asyncio
+    async def test_identical_render_hits_cache(self, tmp_path, stub_manim):
+        cache = RenderCache(tmp_path / "cache", max_bytes=1024 * 1024)
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_cache", cache):
+            for workspace in ("one", "two"):
+                script = tmp_path / workspace / "scene.py"
+                script.parent.mkdir()
+                script.write_text("from manim import *\n")
+                result = await server._handle_render_animation(
+                    {"script_path": str(script), "preview": False}
+                )
+
+        assert "served from render cache" in result[0].text
+        assert not (tmp_path / "two" / "calls.txt").exists()
+        assert (tmp_path / "two" / "media" / "videos" / "scene" / "720p30" / "Demo.mp4").exists()
+        assert (cache.hits, cache.misses) == (1, 1)
@@ -0,0 +1,116 @@
+"""Tests for per-render resource limits."""
+
+import signal
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.render_limits import RenderCgroup, RenderLimits, classify_breach, describe
+from src.render_stats import RenderStats
+
+
+class TestClassifyBreach:
+    """Test how render failures are attributed to limits."""
+
+    def test_breaches_are_recognized(self):
+        limits = RenderLimits(memory_bytes=512 * 1024 * 1024, cpu_seconds=60)
+        assert "OOM killer" in classify_breach(limits, -signal.SIGKILL, oom_kills=1)
+        assert classify_breach(limits, -signal.SIGXCPU) == "CPU time limit of 60s exceeded"
+        assert "CPU time" in classify_breach(limits, -signal.SIGKILL, cpu_time=65.0)
+        assert "512 MB exceeded (allocation failed)" in classify_breach(
+            limits, 1, "Traceback (most recent call last):\nMemoryError"
+        )
+
+    def test_other_failures_are_not_breaches(self):
+        limits = RenderLimits(memory_bytes=512 * 1024 * 1024, cpu_seconds=60)
+        assert classify_breach(limits, 1, "NameError: name 'Circel' is not defined") is None
+        assert classify_breach(limits, -signal.SIGKILL, cpu_time=3.0) is None
+        assert classify_breach(RenderLimits(), -signal.SIGXCPU, "MemoryError") is None
+
+    def test_describe(self):
+        limits = RenderLimits(memory_bytes=1024 ** 3, cpu_quota=1.5, ffmpeg_threads=2)
+        assert describe(limits) == ["memory 1024 MB"]
+        assert "1.5 CPU cores" in describe(limits, cgroup=True)
+
+
+class TestExecOptions:
+    """Test that rusage_exec.py applies the limits to the command it runs."""
+
+    def test_rlimits_reach_the_command(self, tmp_path):
+        limits = RenderLimits(memory_bytes=1024 ** 3, cpu_seconds=60)
+        show = (
+            "import resource; "
+            "print(resource.getrlimit(resource.RLIMIT_AS), resource.getrlimit(resource.RLIMIT_CPU))"
+        )
+        for report in (str(tmp_path / "report.json"), "-"):
+            output = subprocess.check_output([
+                sys.executable, str(server.RUSAGE_EXEC_SCRIPT), report,
+                *limits.exec_options(), "--", sys.executable, "-c", show,
+            ], text=True)
+            assert output.strip() == f"({1024 ** 3}, {1024 ** 3}) (60, 65)"
+
+    def test_workers_get_no_cpu_limit(self):
+        limits = RenderLimits(memory_bytes=1024, cpu_seconds=60)
+        assert limits.exec_options(cpu=False) == ["--memory", "1024"]
+        assert RenderLimits().exec_options() == []
+
+
+class TestRenderCgroup:
+    """Test cgroup v2 setup against a directory laid out like cgroupfs."""
+
+    def test_limits_are_written(self, tmp_path):
+        (tmp_path / "cgroup.subtree_control").write_text("cpu io memory pids\n")
+        cgroup = RenderCgroup.create(tmp_path, memory_bytes=256 * 1024 * 1024, cpu_quota=1.5)
+
+        assert (cgroup.path / "memory.max").read_text() == str(256 * 1024 * 1024)
+        assert (cgroup.path / "cpu.max").read_text() == "150000 100000"
+        (cgroup.path / "memory.events").write_text("low 0\nhigh 0\nmax 4\noom 1\noom_kill 1\n")
+        assert cgroup.oom_kills() == 1
+
+    def test_unavailable_without_delegated_controllers(self, tmp_path):
+        (tmp_path / "cgroup.subtree_control").write_text("pids\n")
+        assert RenderCgroup.create(tmp_path, memory_bytes=1024) is None
+        assert RenderCgroup.create(tmp_path / "missing", memory_bytes=1024) is None
+
+
+class TestLimitedRenders:
+    """Test that rlimits stop renders and are reported as limit breaches."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "scene, limits, message",
+        [
+            ("Spin", RenderLimits(cpu_seconds=1), "CPU time limit of 1s exceeded"),
+            ("Hog", RenderLimits(memory_bytes=512 * 1024 * 1024), "memory limit of 512 MB exceeded"),
+        ],
+    )
+    async def test_breach_raises_render_limit_error(self, tmp_path, stub_manim, scene, limits, message):
+        script = tmp_path / "scene.py"
+        script.write_text(f"class {scene}(Scene): pass\n")
+        stats = RenderStats()
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_limits", limits), \
+                patch.object(server, "render_stats", stats):
+            with pytest.raises(server.RenderLimitError, match=message):
+                await server._render_animation(
+                    {"script_path": str(script), "preview": False, "scenes": [scene]}
+                )
+
+        assert stats.failures == 1 and stats.limit_breaches == 1
+        assert 'manim_render_limit_breaches_total{quality="medium"} 1' in stats.prometheus_text()
+
+    @pytest.mark.asyncio
+    async def test_render_within_limits_succeeds(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+        limits = RenderLimits(memory_bytes=1024 ** 3, cpu_seconds=30)
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_limits", limits):
+            result = await server._handle_render_animation({"script_path": str(script), "preview": False})
+
+        assert "✅ Animation rendered successfully!" in result[0].text
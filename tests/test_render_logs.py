@@ -0,0 +1,123 @@
+"""Tests for rotating render logs and error summaries."""
+
+import re
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.render_logs import ErrorSummary, RenderLogStore
+
+
+def _summarize(lines):
+    summary = ErrorSummary()
+    for line in lines:
+        summary.feed(line)
+    return summary.text()
+
+
+class TestErrorSummary:
+    """Test extracting the first traceback and the LaTeX error line."""
+
+    def test_first_traceback_and_latex_error(self):
+        text = _summarize([
+            "Rendering Formula...",
+            "! Missing $ inserted.",
+            "Traceback (most recent call last):",
+            '  File "scene.py", line 5, in construct',
+            "    self.play(Write(tex))",
+            "ValueError: latex error converting to dvi",
+            "",
+            "During handling of the above exception, another exception occurred:",
+            "Traceback (most recent call last):",
+            "RuntimeError: cleanup failed",
+        ])
+
+        assert text == (
+            "LaTeX error: ! Missing $ inserted.\n\n"
+            "Traceback (most recent call last):\n"
+            '  File "scene.py", line 5, in construct\n'
+            "    self.play(Write(tex))\n"
+            "ValueError: latex error converting to dvi"
+        )
+
+    def test_rich_traceback_keeps_frames_nearest_the_error(self):
+        body = [f"│ frame {index} │" for index in range(100)]
+        text = _summarize([
+            "╭──── Traceback (most recent call last) ────╮", *body, "╰───────────╯", "KeyError: 'x'",
+        ])
+
+        lines = text.splitlines()
+        assert lines[1] == "  ... (71 lines omitted)"
+        assert lines[2] == "│ frame 71 │"
+        assert lines[-2:] == ["╰───────────╯", "KeyError: 'x'"]
+
+    def test_falls_back_to_the_last_lines(self):
+        text = _summarize([f"line {index}" for index in range(100)])
+
+        assert text.splitlines() == [f"line {index}" for index in range(80, 100)]
+
+
+class TestRenderLogStore:
+    """Test rotation, ranged reads and retention."""
+
+    def test_rotation_bounds_the_log_and_reads_span_segments(self, tmp_path):
+        store = RenderLogStore(tmp_path, max_bytes=100, backups=2, max_logs=10)
+        log = store.open()
+        for index in range(50):
+            log.write(f"line {index:03d}")  # 9 bytes with the newline
+        log.close()
+
+        whole = store.read(log.id, 0, 10_000)
+        assert whole.rotated
+        assert whole.size <= 300
+        assert whole.data.decode().endswith("line 049\n")
+        assert log.bytes_written == 450
+
+        middle = store.read(log.id, 95, 18)
+        assert middle.data == whole.data[95:113]
+        assert store.read(log.id, -9).data == b"line 049\n"
+
+    def test_keeps_only_recent_logs(self, tmp_path):
+        store = RenderLogStore(tmp_path, max_bytes=1000, backups=1, max_logs=2)
+        ids = []
+        for _ in range(3):
+            log = store.open(owner="session")
+            log.write("output")
+            log.close()
+            ids.append(log.id)
+
+        assert sorted(path.stem for path in tmp_path.glob("*.log")) == sorted(ids[1:])
+        with pytest.raises(KeyError):
+            store.read(ids[0])
+        with pytest.raises(KeyError):
+            store.read("../" + ids[2])
+        assert store.owner(ids[2]) == "session"
+
+
+class TestRenderLogTool:
+    """Test failed renders reporting a summary and a readable log."""
+
+    @pytest.mark.asyncio
+    async def test_failure_reports_summary_not_the_whole_output(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class BadTex(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_logs", RenderLogStore(tmp_path / "logs", 16 * 1024, 1, 10)):
+            with pytest.raises(server.RenderError) as failure:
+                await server._handle_render_animation(
+                    {"script_path": str(script), "scenes": ["BadTex"], "preview": False}
+                )
+            log_id = re.search(r"Full log: (\w+)", str(failure.value)).group(1)
+            end = await server._handle_get_render_log({"log_id": log_id, "offset": -100})
+            start = await server._handle_get_render_log({"log_id": log_id, "length": 20})
+
+        message = str(failure.value)
+        assert len(message) < 1000
+        assert "LaTeX error: ! Undefined control sequence." in message
+        assert "ValueError: latex error converting to dvi" in message
+        assert "tex log line" not in message
+        assert end[0].text.endswith("ValueError: latex error converting to dvi\n")
+        assert "The log was rotated" in end[0].text
+        assert "Bytes 0-20 of" in start[0].text and "read on with offset 20" in start[0].text
@@ -0,0 +1,104 @@
+"""Tests for per-render resource accounting."""
+
+import json
+import subprocess
+import sys
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.render_stats import RenderRecord, RenderStats, ResourceUsage, percentile
+
+
+def _record(wall, quality="medium", user_cpu=None, rss=None):
+    return RenderRecord(
+        script="scene.py",
+        quality=quality,
+        backend="manim subprocess",
+        usage=ResourceUsage(wall, user_cpu, 0.1 if user_cpu is not None else None, rss),
+        output_bytes=1000,
+        frames=30,
+    )
+
+
+class TestRenderStats:
+    """Test the ring buffer, percentiles and Prometheus export."""
+
+    def test_percentile_interpolates(self):
+        assert percentile([1, 2, 3, 4], 0.5) == 2.5
+        assert percentile([5], 0.99) == 5
+        assert percentile(range(1, 101), 0.9) == pytest.approx(90.1)
+
+    def test_ring_buffer_and_summary(self):
+        stats = RenderStats(history=3)
+        for wall in (10, 1, 2, 3):
+            stats.record(_record(wall))
+
+        records = stats.records()
+        assert [r.usage.wall for r in records] == [1, 2, 3]
+        summary = stats.summarize(records)
+        assert summary["wall"]["p50"] == 2 and summary["wall"]["max"] == 3
+        assert "user_cpu" not in summary  # no record reported CPU time
+        assert [r.usage.wall for r in stats.records(last=2)] == [2, 3]
+
+    def test_prometheus_textfile(self, tmp_path):
+        textfile = tmp_path / "manim.prom"
+        stats = RenderStats(textfile=textfile)
+        stats.record(_record(2.0, "low", user_cpu=1.5, rss=100 * 1024 * 1024))
+        stats.record(_record(4.0, "high", user_cpu=3.0))
+        stats.record_failure("high")
+
+        text = textfile.read_text()
+        assert 'manim_renders_total{quality="low"} 1' in text
+        assert 'manim_render_failures_total{quality="high"} 1' in text
+        assert 'manim_render_wall_seconds{quality="high",quantile="0.5"} 4' in text
+        assert 'manim_render_user_cpu_seconds_sum{quality="low"} 1.5' in text
+        # Each metric family is declared once, with all qualities grouped under it
+        assert text.count("# TYPE manim_render_wall_seconds summary") == 1
+        families = [line.split("{")[0].removesuffix("_sum").removesuffix("_count")
+                    for line in text.splitlines() if not line.startswith("#")]
+        changes = [f for i, f in enumerate(families) if i == 0 or f != families[i - 1]]
+        assert len(changes) == len(set(families))
+
+
+class TestRusageExec:
+    """Test the rusage-reporting launcher."""
+
+    def test_reports_usage_and_exit_status(self, tmp_path):
+        report = tmp_path / "report.json"
+        burn = "sum(range(2_000_000)); raise SystemExit(3)"
+        code = subprocess.call(
+            [sys.executable, str(server.RUSAGE_EXEC_SCRIPT), str(report), "--", sys.executable, "-c", burn]
+        )
+
+        usage = json.loads(report.read_text())
+        assert code == 3 and usage["exit_code"] == 3
+        assert usage["user_cpu"] > 0 and usage["peak_rss_bytes"] > 1024 * 1024
+
+
+class TestGetRenderStats:
+    """Test that renders are accounted and summarized by the tool."""
+
+    @pytest.mark.asyncio
+    async def test_render_is_recorded(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+        stats = RenderStats()
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_stats", stats):
+            result = await server._handle_render_animation({"script_path": str(script), "preview": False})
+            with pytest.raises(Exception):
+                await server._render_animation(
+                    {"script_path": str(script), "preview": False, "scenes": ["Broken"], "use_cache": False}
+                )
+            summary = await server._handle_get_render_stats({"quality": "medium"})
+
+        assert "🧮 CPU:" in result[0].text
+        [record] = stats.records()
+        assert record.usage.user_cpu is not None and record.usage.peak_rss_bytes > 0
+        assert record.output_bytes == len("Demo[all]")
+        text = summary[0].text
+        assert "1 render(s) at medium quality, 1 failure(s)" in text
+        assert "Wall time" in text and "Peak RSS" in text
@@ -0,0 +1,97 @@
+"""Tests for scene discovery and parallel multi-scene rendering."""
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.render_cache import RenderCache
+from src.scenes import discover_scenes
+
+MULTI_SCENE_CODE = """
+from manim import *
+import manim
+
+class Helper:
+    pass
+
+class Intro(Scene):
+    def construct(self):
+        self.wait()
+
+class Base(manim.MovingCameraScene):
+    pass
+
+class Derived(Base):
+    pass
+
+class Box(Helper):
+    pass
+"""
+
+
+class TestDiscoverScenes:
+    """Test AST-based scene discovery."""
+
+    def test_finds_direct_and_indirect_scenes(self):
+        assert discover_scenes(MULTI_SCENE_CODE) == ["Intro", "Base", "Derived"]
+
+    def test_nested_classes_are_ignored(self):
+        code = "def f():\n    class Inner(Scene):\n        pass\n"
+        assert discover_scenes(code) == []
+
+    def test_syntax_error_propagates(self):
+        with pytest.raises(SyntaxError):
+            discover_scenes("class Broken(Scene)")
+
+
+class TestParallelSceneRendering:
+    """Test fan-out of multi-scene scripts into per-scene renders."""
+
+    @pytest.fixture
+    def render_env(self, tmp_path, stub_manim):
+        cache = RenderCache(tmp_path / "cache", max_bytes=0)
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_cache", cache):
+            yield tmp_path
+
+    @pytest.mark.asyncio
+    async def test_each_scene_renders_separately(self, render_env):
+        script = render_env / "scene.py"
+        script.write_text(MULTI_SCENE_CODE)
+
+        result = await server._handle_render_animation(
+            {"script_path": str(script), "preview": False}
+        )
+
+        calls = (render_env / "calls.txt").read_text().splitlines()
+        assert sorted(call.split()[-1] for call in calls) == ["Base", "Derived", "Intro"]
+        assert "Rendered 3/3 scene(s)" in result[0].text
+        for scene in ("Intro", "Base", "Derived"):
+            video = render_env / "media" / "videos" / "scene" / "720p30" / f"{scene}.mp4"
+            assert f"   - {video}" in result[0].text
+        assert result[0].text.count("📜 Log:") == 3
+        for scene in ("Intro", "Base", "Derived"):
+            assert (render_env / "media" / "videos" / "scene" / "720p30" / f"{scene}.mp4").exists()
+
+    @pytest.mark.asyncio
+    async def test_scene_subset_and_partial_failure(self, render_env):
+        script = render_env / "scene.py"
+        script.write_text(MULTI_SCENE_CODE + "\nclass Broken(Scene):\n    pass\n")
+
+        result = await server._handle_render_animation(
+            {"script_path": str(script), "preview": False, "scenes": ["Intro", "Broken"]}
+        )
+
+        assert "Rendered 1/2 scene(s)" in result[0].text
+        assert "❌ Broken" in result[0].text
+        assert len((render_env / "calls.txt").read_text().splitlines()) == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_scene_is_rejected(self, render_env):
+        script = render_env / "scene.py"
+        script.write_text(MULTI_SCENE_CODE)
+
+        with pytest.raises(ValueError, match="Missing"):
+            await server._handle_render_animation(
+                {"script_path": str(script), "scenes": ["Missing"]}
+            )
@@ -0,0 +1,197 @@
+"""Tests for the render job scheduler."""
+
+import asyncio
+import json
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from src import server
+from src.scheduler import JobState, RenderScheduler
+
+
+class TestRenderScheduler:
+    """Test queueing, concurrency limits and cancellation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_priority_order(self):
+        scheduler = RenderScheduler(concurrency=1)
+        release = asyncio.Event()
+        order = []
+
+        async def blocker():
+            await release.wait()
+
+        async def record(name):
+            order.append(name)
+
+        scheduler.submit(blocker)
+        low = scheduler.submit(lambda: record("low"))
+        first_high = scheduler.submit(lambda: record("high-1"), priority=5)
+        second_high = scheduler.submit(lambda: record("high-2"), priority=5)
+
+        assert scheduler.stats()["running"] == 1
+        assert scheduler.queue_position(first_high.id) == 1
+        assert scheduler.queue_position(low.id) == 3
+
+        release.set()
+        await asyncio.gather(low.done.wait(), second_high.done.wait())
+        assert order == ["high-1", "high-2", "low"]
+
+    @pytest.mark.asyncio
+    async def test_records_survive_completion(self):
+        scheduler = RenderScheduler(concurrency=2)
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        ok = scheduler.submit(lambda: asyncio.sleep(0, result="done"))
+        bad = scheduler.submit(fail)
+        await asyncio.gather(ok.done.wait(), bad.done.wait())
+
+        assert scheduler.get(ok.id).state is JobState.SUCCEEDED
+        assert scheduler.get(ok.id).result == "done"
+        assert scheduler.get(bad.id).state is JobState.FAILED
+        assert scheduler.get(bad.id).error == "boom"
+
+    @pytest.mark.asyncio
+    async def test_cancel_queued_and_running_jobs(self):
+        scheduler = RenderScheduler(concurrency=1)
+        running = scheduler.submit(lambda: asyncio.sleep(60))
+        queued = scheduler.submit(lambda: asyncio.sleep(0))
+        await asyncio.sleep(0)
+
+        assert scheduler.cancel(queued.id)
+        assert scheduler.cancel(running.id)
+        await running.done.wait()
+
+        assert queued.state is JobState.CANCELLED
+        assert running.state is JobState.CANCELLED
+        assert scheduler.cancel(running.id) is False
+        assert scheduler.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_run_reraises_job_exception(self):
+        scheduler = RenderScheduler(concurrency=1)
+
+        async def fail():
+            raise ValueError("bad script")
+
+        with pytest.raises(ValueError, match="bad script"):
+            await scheduler.run(fail)
+
+    @pytest.mark.asyncio
+    async def test_finished_records_are_bounded(self):
+        scheduler = RenderScheduler(concurrency=4, max_records=2)
+        jobs = [scheduler.submit(lambda: asyncio.sleep(0)) for _ in range(4)]
+        await asyncio.gather(*(job.done.wait() for job in jobs))
+
+        assert scheduler.get(jobs[0].id) is None
+        assert scheduler.get(jobs[-1].id) is not None
+
+    @pytest.mark.asyncio
+    async def test_slotless_coordinator_does_not_deadlock(self):
+        scheduler = RenderScheduler(concurrency=1)
+
+        async def coordinator():
+            return await asyncio.gather(
+                scheduler.run(lambda: asyncio.sleep(0, result=1)),
+                scheduler.run(lambda: asyncio.sleep(0, result=2)),
+            )
+
+        result = await asyncio.wait_for(scheduler.run(coordinator, needs_slot=False), 5)
+        assert result == [1, 2]
+
+
+class TestProgressiveRendering:
+    """Test the low-quality proxy and background upgrade."""
+
+    @pytest.mark.asyncio
+    async def test_proxy_returns_first_and_upgrade_notifies(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+        session = AsyncMock()
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_scheduler", RenderScheduler(concurrency=2)), \
+                patch.object(server, "_request_session", lambda: session):
+            result = await server._handle_render_animation(
+                {"script_path": str(script), "quality": "production", "progressive": True}
+            )
+            text = result[0].text
+            assert "Quality: low" in text
+            job_id = text.split("Upgrade job: ")[1].split(" ")[0]
+
+            upgraded = await server._handle_get_render_result({"job_id": job_id, "wait": True})
+            for _ in range(100):
+                if session.send_log_message.await_count:
+                    break
+                await asyncio.sleep(0.01)
+
+        assert "Quality: production" in upgraded[0].text
+        videos = script.parent / "media" / "videos" / "scene"
+        assert (videos / "480p15" / "Demo.mp4").exists()
+        assert (videos / "1440p60" / "Demo.mp4").exists()
+        data = session.send_log_message.await_args.kwargs["data"]
+        assert data["event"] == "render_upgraded" and data["job_id"] == job_id
+        assert data["videos"] == [str(videos / "1440p60" / "Demo.mp4")]
+
+
+class TestRenderBatch:
+    """Test the scripts x scenes x qualities batch tool."""
+
+    @pytest.mark.asyncio
+    async def test_matrix_fans_out_and_reports_each_render(self, tmp_path, stub_manim):
+        first = tmp_path / "first" / "scene.py"
+        second = tmp_path / "second" / "broken.py"
+        for script in (first, second):
+            script.parent.mkdir()
+        first.write_text("class Intro(Scene): pass\nclass Outro(Scene): pass\n")
+        second.write_text("class Broken(Scene): pass\n")
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_scheduler", RenderScheduler(concurrency=4)):
+            result = await server._handle_render_batch({
+                "items": [
+                    {"script_path": str(first)},
+                    {"script_path": str(second), "qualities": ["low"]},
+                    {"script_path": str(first), "scenes": ["Intro"]},
+                ],
+                "qualities": ["low", "high"],
+            })
+
+        summary = json.loads(result[1].text)
+        assert "⚠️ Batch rendered 4/5 render(s)" in result[0].text
+        assert (summary["total"], summary["succeeded"], summary["failed"]) == (5, 4, 1)
+        rendered = {(item["scene"], item["quality"]): item for item in summary["items"]}
+        assert set(rendered) == {
+            ("Intro", "low"), ("Intro", "high"), ("Outro", "low"), ("Outro", "high"), ("Broken", "low"),
+        }
+        videos = first.parent / "media" / "videos" / "scene"
+        assert rendered["Outro", "high"]["outputs"] == [str(videos / "1080p60" / "Outro.mp4")]
+        assert rendered["Broken", "low"]["status"] == "failed"
+        assert "scene Broken failed" in rendered["Broken", "low"]["error"]
+        assert all(item["render_seconds"] is not None for item in summary["items"])
+
+    @pytest.mark.asyncio
+    async def test_invalid_matrix_queues_nothing(self, tmp_path):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+        scheduler = RenderScheduler(concurrency=1)
+
+        with patch.object(server, "render_scheduler", scheduler):
+            with pytest.raises(ValueError, match="Unknown quality: ultra"):
+                await server._handle_render_batch(
+                    {"items": [{"script_path": str(script)}], "qualities": ["low", "ultra"]}
+                )
+            with pytest.raises(ValueError, match="Scene\\(s\\) not found"):
+                await server._handle_render_batch(
+                    {"items": [{"script_path": str(script), "scenes": ["Missing"]}]}
+                )
+            with patch.object(server, "BATCH_MAX_ITEMS", 3):
+                with pytest.raises(ValueError, match="more than 3 renders"):
+                    await server._handle_render_batch(
+                        {"items": [{"script_path": str(script)}], "qualities": list(server.QUALITY_FLAGS)}
+                    )
+
+        assert scheduler.stats() == {"concurrency": 1, **{state.value: 0 for state in JobState}}
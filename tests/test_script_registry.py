@@ -0,0 +1,145 @@
+"""Tests for script handles and their use by the workflow tools."""
+
+import asyncio
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.script_registry import ScriptRegistry, content_hash
+
+
+class TestScriptRegistry:
+    """Test handle registration and lookup."""
+
+    def test_register_and_get(self, tmp_path):
+        registry = ScriptRegistry()
+        handle = registry.register(tmp_path / "scene.py", b"code")
+
+        assert registry.get(handle.id) is handle
+        assert handle.content_hash == content_hash(b"code")
+        assert handle.workspace == tmp_path
+        assert registry.get("script_missing") is None
+
+    def test_oldest_handles_are_forgotten(self, tmp_path):
+        registry = ScriptRegistry(max_entries=2)
+        first = registry.register(tmp_path / "a.py", b"a")
+        second = registry.register(tmp_path / "b.py", b"b")
+        registry.get(first.id)
+        registry.register(tmp_path / "c.py", b"c")
+
+        assert registry.get(first.id) is first
+        assert registry.get(second.id) is None
+
+    def test_revisions_record_their_lineage(self, tmp_path):
+        registry = ScriptRegistry()
+        original = registry.register(tmp_path / "scene.py", b"v1")
+        revision = registry.register(tmp_path / "scene_r2.py", b"v2", original)
+
+        assert (revision.parent_id, revision.revision) == (original.id, 2)
+        assert revision.to_dict()["parent_id"] == original.id
+        assert registry.find(tmp_path / "scene_r2.py") is revision
+        assert registry.find(tmp_path / "other.py") is None
+
+
+class TestScriptHandleWorkflow:
+    """Test that renders and lookups resolve script handles."""
+
+    @pytest.mark.asyncio
+    async def test_render_by_script_id(self, tmp_path, stub_manim):
+        with patch.object(server, "BASE_DIR", tmp_path / "media"), \
+                patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            created = await server._handle_create_script({"code": "class Demo(Scene): pass\n"})
+            script_id = created[0].text.split("Script id: ")[1].split("\n")[0]
+            result = await server._handle_render_animation(
+                {"script_id": script_id, "preview": False}
+            )
+
+        assert "Animation rendered successfully" in result[0].text
+        with pytest.raises(ValueError, match="Unknown script id"):
+            await server._handle_render_animation({"script_id": "script_nope"})
+
+    @pytest.mark.asyncio
+    async def test_rewritten_script_is_rejected_under_its_old_id(self, tmp_path, stub_manim):
+        shared = {"script_dir": str(tmp_path / "shared"), "script_name": "scene"}
+        with patch.object(server, "BASE_DIR", tmp_path / "media"), \
+                patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            first = await server._handle_create_script({"code": "class Demo(Scene): pass\n", **shared})
+            await server._handle_create_script({"code": "class Other(Scene): pass\n", **shared})
+            script_id = first[0].text.split("Script id: ")[1].split("\n")[0]
+
+            with pytest.raises(ValueError, match="rewritten after"):
+                await server._handle_render_animation({"script_id": script_id, "preview": False})
+            found = await server._handle_find_videos({"search_dir": str(tmp_path), "script_id": script_id})
+
+        assert "No video files found" in found[0].text
+
+    @pytest.mark.asyncio
+    async def test_concurrent_complete_workflows_keep_their_own_scripts(self, tmp_path, stub_manim):
+        with patch.object(server, "BASE_DIR", tmp_path / "media"), \
+                patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            results = await asyncio.gather(*(
+                server._handle_execute_manim_complete(
+                    {"code": "class Demo(Scene): pass\n", "script_name": f"take{i}"}
+                )
+                for i in range(3)
+            ))
+
+        for i, result in enumerate(results):
+            text = result[0].text
+            workspace = text.split("Script path: ")[1].split(f"/take{i}.py")[0]
+            assert f"{workspace}/media/videos/take{i}/720p30/Demo.mp4" in text
+            assert "Found 1 video file(s)" in text
+
+    @pytest.mark.asyncio
+    async def test_revision_rerenders_only_changed_animations(self, tmp_path, stub_manim):
+        code = (
+            "class Demo(Scene):\n"
+            "    def construct(self):\n"
+            "        self.play(Create(Circle()))\n"
+            "        self.play(Write(Text('v1')))\n"
+            "        self.play(FadeOut(Circle()))\n"
+        )
+        with patch.object(server, "BASE_DIR", tmp_path / "media"), \
+                patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            created = await server._handle_create_script({"code": code})
+            parent_id = created[0].text.split("Script id: ")[1].split("\n")[0]
+            await server._handle_render_animation({"script_id": parent_id, "preview": False})
+
+            revised = await server._handle_revise_script(
+                {"script_id": parent_id, "code": code.replace("'v1'", "'v2'")}
+            )
+            revision_id = revised[0].text.split("Script id: ")[1].split("\n")[0]
+            result = await server._handle_render_animation({"script_id": revision_id, "preview": False})
+
+            with pytest.raises(ValueError, match="script_dir cannot be combined"):
+                await server._handle_create_script(
+                    {"code": code, "parent_id": parent_id, "script_dir": str(tmp_path)}
+                )
+
+        parent = server.script_registry.get(parent_id)
+        revision = server.script_registry.get(revision_id)
+        assert revision.path == parent.workspace / "scene_r2.py"
+        assert "Revision 2 of " + parent_id in revised[0].text
+        assert "Changes: +1 -1 lines" in revised[0].text
+        text = result[0].text
+        assert f"Revision 2 of {parent_id}: 2/3 animation(s) reused, 1 re-rendered" in text
+        assert "- Demo: reused 0, 2; re-rendered 1" in text
+        assert (parent.workspace / "media" / "videos" / "scene_r2" / "720p30" / "Demo.mp4").exists()
+
+    @pytest.mark.asyncio
+    async def test_sibling_revisions_are_numbered_like_their_files(self, tmp_path):
+        with patch.object(server, "BASE_DIR", tmp_path / "media"):
+            created = await server._handle_create_script({"code": "class Demo(Scene): pass\n"})
+            parent_id = created[0].text.split("Script id: ")[1].split("\n")[0]
+            revisions = await asyncio.gather(*(
+                server._handle_revise_script({"script_id": parent_id, "code": f"class Demo(Scene): x = {i}\n"})
+                for i in range(2)
+            ))
+
+        handles = sorted(
+            (server.script_registry.get(r[0].text.split("Script id: ")[1].split("\n")[0]) for r in revisions),
+            key=lambda handle: handle.revision,
+        )
+        assert [(h.revision, h.path.name) for h in handles] == [(2, "scene_r2.py"), (3, "scene_r3.py")]
+        assert "Revision 3 of " in " ".join(r[0].text for r in revisions)
@@ -1,10 +1,13 @@
 """Tests for the Manim MCP server."""
 
+import ast
+
 import pytest
 from unittest.mock import AsyncMock, patch
 from pathlib import Path
 
-from src.server import validate_manim_code, ManimExecutionError
+from src.server import validate_manim_code, ScriptValidationError
+from src.validation import analyze_code, clear_verdict_cache
 
 
 class TestCodeValidation:
@@ -33,13 +36,67 @@ class TestScene(Scene):
         ]
         
         for code in dangerous_codes:
-            with pytest.raises(ValueError):
+            with pytest.raises(ScriptValidationError):
                 validate_manim_code(code)
     
-    def test_case_insensitive_detection(self):
-        """Test that dangerous patterns are detected case-insensitively."""
-        with pytest.raises(ValueError):
+    def test_unparseable_code_rejected(self):
+        """Test that code which cannot be parsed (and so checked) is rejected."""
+        with pytest.raises(ScriptValidationError):
             validate_manim_code("IMPORT OS")
+    
+    def test_aliased_imports_rejected(self):
+        """Test that imports the substring scan missed are rejected."""
+        for code in ["from os import system", "import os.path as p", "from subprocess import run"]:
+            with pytest.raises(ScriptValidationError):
+                validate_manim_code(code)
+    
+    def test_indirect_access_to_blocked_builtins_rejected(self):
+        """Test that blocked builtins reached without a direct call are rejected."""
+        for code in [
+            'e = eval; e("1")',
+            'globals()["__builtins__"]["open"]("/etc/passwd")',
+            'getattr(Scene, "__subclasses__")()',
+            'run = [exec][0]',
+            'ns = vars',
+            'x = {}["__globals__"]',
+        ]:
+            with pytest.raises(ScriptValidationError):
+                validate_manim_code(code)
+    
+    def test_harmless_attribute_lookups_pass(self):
+        """Test that getattr with ordinary names and string-keyed dicts are allowed."""
+        code = 'color = getattr(Circle(), "color")\nconfig = {"open": 1}["open"]\n'
+        assert validate_manim_code(code) is True
+    
+    def test_patterns_in_strings_and_comments_pass(self):
+        """Test that dangerous text inside strings or comments is not a finding."""
+        code = """
+from manim import *
+
+class TestScene(Scene):
+    def construct(self):
+        # we never open( files or import os here
+        self.play(Write(Text("open('file') and eval(x)")))
+"""
+        assert validate_manim_code(code) is True
+    
+    def test_findings_are_structured(self):
+        """Test that every finding is reported with its location."""
+        code = "x = 1\nfrom os import system\nprint(().__class__.__subclasses__())\n"
+        with pytest.raises(ScriptValidationError) as excinfo:
+            validate_manim_code(code)
+        
+        findings = excinfo.value.findings
+        assert [(f.rule, f.line) for f in findings] == [("import", 2), ("attribute", 3)]
+    
+    def test_verdicts_are_memoized(self):
+        """Test that repeated validation of the same code reuses the verdict."""
+        clear_verdict_cache()
+        code = "from manim import *\n"
+        with patch("src.validation.ast.parse", wraps=ast.parse) as parse:
+            analyze_code(code)
+            analyze_code(code)
+        assert parse.call_count == 1
 
 
 class TestManimExecution:
@@ -54,4 +111,4 @@ class TestManimExecution:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__]) 
\ No newline at end of file
+    pytest.main([__file__])
@@ -0,0 +1,89 @@
+"""Tests for animation-range sharded rendering."""
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.render_cache import RenderCache
+from src.sharding import estimate_animation_count, format_range_flag, plan_shards
+
+LONG_SCENE = """
+from manim import *
+
+class Long(Scene):
+    def construct(self):
+        circle = Circle()
+        self.play(Create(circle))
+        self.intro()
+        self.wait()
+        self.play(FadeOut(circle))
+
+    def intro(self):
+        self.play(Write(Text("a")))
+        self.play(Write(Text("b")))
+"""
+
+
+class TestEstimateAnimationCount:
+    """Test static animation counting."""
+
+    def test_counts_construct_and_helper_methods(self):
+        assert estimate_animation_count(LONG_SCENE, "Long") == 5
+
+    def test_loops_make_count_unknown(self):
+        code = "class S(Scene):\n    def construct(self):\n        for _ in range(3):\n            self.wait()\n"
+        assert estimate_animation_count(code, "S") is None
+
+    def test_unknown_scene(self):
+        assert estimate_animation_count(LONG_SCENE, "Missing") is None
+
+
+class TestPlanShards:
+    """Test splitting animations into ranges."""
+
+    def test_even_split_with_open_ended_last_range(self):
+        assert plan_shards(10, 3) == [(0, 3), (4, 6), (7, None)]
+
+    def test_never_more_shards_than_animations(self):
+        assert plan_shards(2, 8) == [(0, 0), (1, None)]
+
+    def test_range_flag(self):
+        assert format_range_flag((4, 6)) == "4,6"
+        assert format_range_flag((7, None)) == "7"
+
+
+class TestShardedRender:
+    """Test the sharded render path end to end with stub executables."""
+
+    @pytest.mark.asyncio
+    async def test_shards_are_rendered_and_joined(self, tmp_path, stub_manim, stub_ffmpeg):
+        script = tmp_path / "scene.py"
+        script.write_text(LONG_SCENE)
+        cache = RenderCache(tmp_path / "cache", max_bytes=0)
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "FFMPEG_EXECUTABLE", stub_ffmpeg), \
+                patch.object(server, "render_cache", cache):
+            result = await server._handle_render_animation(
+                {"script_path": str(script), "shards": 2, "preview": False}
+            )
+
+        assert "rendered in 2 shards" in result[0].text
+        video = tmp_path / "media" / "videos" / "scene" / "720p30" / "Long.mp4"
+        assert video.read_text() == "Long[0,2]+Long[3]"
+        assert not any((tmp_path / "media" / ".shards").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_uncountable_scene_falls_back_to_single_render(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class S(Scene):\n    def construct(self):\n        while True:\n            self.wait()\n")
+        cache = RenderCache(tmp_path / "cache", max_bytes=0)
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "render_cache", cache):
+            result = await server._handle_render_animation(
+                {"script_path": str(script), "shards": 4, "preview": False}
+            )
+
+        assert "Sharding skipped" in result[0].text
+        assert (tmp_path / "media" / "videos" / "scene" / "720p30" / "S.mp4").read_text() == "S[all]"
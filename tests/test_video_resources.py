@@ -0,0 +1,96 @@
+"""Tests for rendered videos served as MCP resources."""
+
+import asyncio
+import base64
+
+import pytest
+import mcp.types as types
+from mcp.shared.memory import create_connected_server_and_client_session
+from unittest.mock import patch
+
+from src import server
+from src.video_resources import parse_video_uri, read_range, video_uri
+
+
+class TestVideoURIs:
+    """Test resource URIs and ranged reads."""
+
+    def test_uri_round_trip_with_range(self, tmp_path):
+        video = tmp_path / "my media" / "Demo.mp4"
+
+        uri = video_uri(video)
+
+        assert uri.startswith("manim://video/") and " " not in uri
+        assert parse_video_uri(uri) == (video, 0, None)
+        assert parse_video_uri(uri + "?offset=10&length=5") == (video, 10, 5)
+        for bad in ("file:///tmp/Demo.mp4", uri + "?offset=-1", uri + "?length=0", uri + "?offset=x"):
+            with pytest.raises(ValueError):
+                parse_video_uri(bad)
+
+    def test_read_range(self, tmp_path):
+        video = tmp_path / "Demo.mp4"
+        video.write_bytes(bytes(range(100)))
+        empty = tmp_path / "Empty.mp4"
+        empty.write_bytes(b"")
+
+        assert read_range(video, 10, 5) == bytes(range(10, 15))
+        assert read_range(video, 95, 50) == bytes(range(95, 100))
+        assert read_range(video, 100, 10) == b""
+        assert read_range(empty, 0, 10) == b""
+
+        # A re-render truncating the video mid-download shortens reads instead of faulting
+        with open(video, "r+b") as handle:
+            handle.truncate(20)
+        assert read_range(video, 15, 10) == bytes(range(15, 20))
+        assert read_range(video, 50, 10) == b""
+
+
+class TestResourceServer:
+    """Test listing, ranged reads and change notifications over an MCP session."""
+
+    @pytest.mark.asyncio
+    async def test_render_list_read_and_subscribe(self, tmp_path, stub_manim):
+        script = tmp_path / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+        video = tmp_path / "media" / "videos" / "scene" / "720p30" / "Demo.mp4"
+        render = {"script_path": str(script), "preview": False, "use_cache": False}
+        notifications = []
+
+        async def collect(message):
+            if isinstance(message, types.ServerNotification):
+                notifications.append(message.root)
+
+        with patch.object(server, "MANIM_EXECUTABLE", stub_manim), \
+                patch.object(server, "RESOURCE_CHUNK_BYTES", 4):
+            async with create_connected_server_and_client_session(
+                server.server, message_handler=collect
+            ) as client:
+                capabilities = client.get_server_capabilities()
+                await client.call_tool("render_animation", render)
+                listed = await client.list_resources()
+                uri = listed.resources[0].uri
+                chunks = [
+                    await client.read_resource(uri),
+                    await client.read_resource(f"{uri}?offset=4&length=100"),
+                    await client.read_resource(f"{uri}?offset=8"),
+                ]
+                await client.subscribe_resource(uri)
+                await client.call_tool("render_animation", render)
+                for _ in range(100):
+                    if any(isinstance(n, types.ResourceUpdatedNotification) for n in notifications):
+                        break
+                    await asyncio.sleep(0.01)
+                with pytest.raises(Exception, match="Unknown resource"):
+                    await client.read_resource(video_uri(script))
+
+        assert capabilities.resources.subscribe and capabilities.resources.listChanged
+        assert [resource.name for resource in listed.resources] == ["Demo.mp4"]
+        assert listed.resources[0].size == video.stat().st_size
+        assert str(uri) == video_uri(video)
+        blobs = [base64.b64decode(chunk.contents[0].blob) for chunk in chunks]
+        assert [len(blob) for blob in blobs] == [4, 4, 1]
+        assert b"".join(blobs) == video.read_bytes()
+        assert chunks[0].contents[0].mimeType == "video/mp4"
+        updated = [n for n in notifications if isinstance(n, types.ResourceUpdatedNotification)]
+        assert [str(n.params.uri) for n in updated] == [video_uri(video)]
+        assert any(isinstance(n, types.ResourceListChangedNotification) for n in notifications)
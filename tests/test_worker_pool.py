@@ -0,0 +1,83 @@
+"""Tests for the warm Manim worker pool."""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+
+from src.worker_pool import WorkerPool, WorkerPoolError
+
+# Speaks the manim_worker protocol without importing Manim
+FAKE_WORKER = textwrap.dedent(
+    """
+    import json, os, sys, time
+    print(json.dumps({"ready": True, "pid": os.getpid()}), flush=True)
+    for line in sys.stdin:
+        job = json.loads(line)
+        if job.get("crash"):
+            os._exit(1)
+        print("rendering " + job["script"], file=sys.stderr, flush=True)
+        print(json.dumps({"ok": True, "outputs": [str(os.getpid())]}), flush=True)
+        if job.get("late"):
+            # Output that reaches the pool after the reply
+            time.sleep(0.2)
+            print("finished " + job["script"], file=sys.stderr, flush=True)
+        print(job["end_marker"], file=sys.stderr, flush=True)
+    """
+)
+
+
+@pytest.fixture
+def fake_worker(tmp_path):
+    script = tmp_path / "fake_worker.py"
+    script.write_text(FAKE_WORKER)
+    return [sys.executable, str(script)]
+
+
+class TestWorkerPool:
+    """Test worker reuse, recycling and crash handling."""
+
+    @pytest.mark.asyncio
+    async def test_workers_are_reused_then_recycled(self, fake_worker):
+        pool = WorkerPool(size=1, max_jobs=2, command=fake_worker)
+        pids = []
+        for i in range(3):
+            reply, _ = await pool.render({"script": f"s{i}.py"})
+            assert reply["ok"]
+            pids.append(reply["outputs"][0])
+        await pool.close()
+
+        assert pids[0] == pids[1] != pids[2]
+        assert pool.stats()["spawned"] == 2
+        assert pool.stats()["recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_by_size(self, fake_worker):
+        pool = WorkerPool(size=2, max_jobs=100, command=fake_worker)
+        await asyncio.gather(*(pool.render({"script": f"s{i}.py"}) for i in range(6)))
+        await pool.close()
+
+        assert pool.stats()["spawned"] == 2
+        assert pool.stats()["jobs"] == 6
+
+    @pytest.mark.asyncio
+    async def test_output_after_the_reply_belongs_to_its_job(self, fake_worker):
+        pool = WorkerPool(size=1, max_jobs=10, command=fake_worker)
+        _, first_log = await pool.render({"script": "a.py", "late": True})
+        _, second_log = await pool.render({"script": "b.py"})
+        await pool.close()
+
+        assert first_log.splitlines() == ["rendering a.py", "finished a.py"]
+        assert second_log.splitlines() == ["rendering b.py"]
+
+    @pytest.mark.asyncio
+    async def test_crashed_worker_raises(self, fake_worker):
+        pool = WorkerPool(size=1, max_jobs=10, command=fake_worker)
+        with pytest.raises(WorkerPoolError):
+            await pool.render({"script": "s.py", "crash": True})
+        reply, _ = await pool.render({"script": "s.py"})
+        await pool.close()
+
+        assert reply["ok"]
+        assert pool.stats()["spawned"] == 2
@@ -0,0 +1,102 @@
+"""Tests for the background workspace garbage collector."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.scheduler import RenderScheduler
+from src.workspace_gc import WorkspaceGC
+
+
+def _workspace(base, name, size, age):
+    workspace = base / f"manim_work_{name}"
+    workspace.mkdir(parents=True)
+    (workspace / "scene.py").write_bytes(b"x" * size)
+    stamp = time.time() - age
+    os.utime(workspace, (stamp, stamp))
+    return workspace
+
+
+def _dir_size(path):
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class TestWorkspaceGC:
+    """Test TTL and budget eviction."""
+
+    @pytest.mark.asyncio
+    async def test_expired_workspaces_are_removed(self, tmp_path):
+        base = tmp_path / "media"
+        _workspace(base, "old", 10, age=7200)
+        fresh = _workspace(base, "fresh", 10, age=0)
+        (base / ".render_cache").mkdir()
+
+        gc = WorkspaceGC(base, 0, 3600, _dir_size, lambda: ())
+        report = await gc.sweep()
+
+        assert report.removed == [("manim_work_old", 10, "expired")]
+        assert sorted(p.name for p in base.iterdir()) == [".gc_trash", ".render_cache", fresh.name]
+        assert not any((base / ".gc_trash").iterdir())
+
+    @pytest.mark.asyncio
+    async def test_budget_evicts_least_recently_used_first(self, tmp_path):
+        base = tmp_path / "media"
+        for name, age in (("a", 300), ("b", 200), ("c", 100)):
+            _workspace(base, name, 100, age)
+
+        gc = WorkspaceGC(base, 150, 0, _dir_size, lambda: ())
+        report = await gc.sweep()
+
+        assert [name for name, _, _ in report.removed] == ["manim_work_a", "manim_work_b"]
+        assert report.freed_bytes == 200
+        assert (base / "manim_work_c").exists()
+        assert "freed" in report.summary()
+
+    @pytest.mark.asyncio
+    async def test_busy_workspaces_are_kept(self, tmp_path):
+        base = tmp_path / "media"
+        busy = _workspace(base, "busy", 100, age=7200)
+        _workspace(base, "idle", 100, age=7200)
+
+        gc = WorkspaceGC(base, 0, 3600, _dir_size, lambda: [busy / "media"])
+        report = await gc.sweep()
+
+        assert report.skipped_busy == 1
+        assert [name for name, _, _ in report.removed] == ["manim_work_idle"]
+        assert busy.exists()
+
+
+class TestServerWorkspaceGC:
+    """Test that in-flight renders protect their workspace."""
+
+    @pytest.mark.asyncio
+    async def test_queued_render_protects_its_workspace(self, tmp_path, stub_manim):
+        base = tmp_path / "media"
+        workspace = _workspace(base, "queued", 10, age=0)
+        script = workspace / "scene.py"
+        script.write_text("class Demo(Scene): pass\n")
+        scheduler = RenderScheduler(concurrency=1)
+        blocker = asyncio.Event()
+        scheduler.submit(blocker.wait)
+        gc = WorkspaceGC(base, 1, 0, _dir_size, scheduler.busy_paths)
+
+        with patch.object(server, "BASE_DIR", base), \
+                patch.object(server, "render_scheduler", scheduler), \
+                patch.object(server, "MANIM_EXECUTABLE", stub_manim):
+            await server._handle_submit_render({"script_path": str(script)})
+            report = await gc.sweep()
+            assert report.skipped_busy == 1 and workspace.exists()
+
+            blocker.set()
+            for _ in range(100):
+                if not scheduler.busy_paths():
+                    break
+                await asyncio.sleep(0.05)
+            report = await gc.sweep()
+
+        assert [name for name, _, _ in report.removed] == ["manim_work_queued"]
+        assert not workspace.exists()
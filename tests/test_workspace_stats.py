@@ -0,0 +1,82 @@
+"""Tests for single-pass workspace statistics."""
+
+import os
+
+import pytest
+from unittest.mock import patch
+
+from src import server
+from src.workspace_stats import WorkspaceStatsCache
+
+
+def _make_workspace(tmp_path):
+    root = tmp_path / "workspace"
+    (root / "media" / "videos").mkdir(parents=True)
+    (root / "scene.py").write_text("x" * 100)
+    (root / "helpers.py").write_text("x" * 50)
+    (root / "media" / "videos" / "Intro.mp4").write_bytes(b"v" * 1000)
+    (root / "media" / "notes").write_text("n")
+    return root
+
+
+class TestWorkspaceStatsCache:
+    """Test totals and mtime-based invalidation."""
+
+    def test_collects_counts_and_sizes_by_suffix(self, tmp_path):
+        workspace = _make_workspace(tmp_path)
+        stats = WorkspaceStatsCache().collect(workspace)
+
+        assert (stats.directories, stats.files, stats.total_bytes) == (3, 4, 1151)
+        assert stats.count(".py") == 2 and stats.sizes[".py"] == 150
+        assert stats.count(".mp4") == 1 and stats.count("") == 1
+        assert sorted(stats.samples[".py"]) == ["helpers.py", "scene.py"]
+
+    def test_unchanged_directories_are_not_relisted(self, tmp_path):
+        workspace = _make_workspace(tmp_path)
+        cache = WorkspaceStatsCache()
+        assert cache.collect(workspace).scanned_directories == 3
+
+        again = cache.collect(workspace)
+        assert again.scanned_directories == 0
+        assert again.total_bytes == 1151
+
+        (workspace / "media" / "videos" / "Outro.mp4").write_bytes(b"v" * 10)
+        changed = cache.collect(workspace)
+        assert changed.scanned_directories == 1
+        assert changed.count(".mp4") == 2 and changed.total_bytes == 1161
+
+    def test_hard_links_are_counted_once(self, tmp_path):
+        workspace = _make_workspace(tmp_path)
+        pooled = tmp_path / "pool.mp4"
+        pooled.write_bytes(b"p" * 500)
+        for scene in ("A", "B"):
+            partials = workspace / "media" / "videos" / "partial_movie_files" / scene
+            partials.mkdir(parents=True)
+            os.link(pooled, partials / "123.mp4")
+        os.link(workspace / "media" / "videos" / "Intro.mp4", workspace / "Intro.mp4")
+
+        stats = WorkspaceStatsCache().collect(workspace)
+        assert stats.count(".mp4") == 4
+        assert stats.total_bytes == 1151 + 500 and stats.sizes[".mp4"] == 1500
+
+    def test_summary_cache_is_bounded(self, tmp_path):
+        workspace = _make_workspace(tmp_path)
+        cache = WorkspaceStatsCache(max_dirs=2)
+        cache.collect(workspace)
+        assert cache.stats()["directories"] == 2
+
+
+class TestGetWorkspaceInfo:
+    """Test the get_workspace_info tool output."""
+
+    @pytest.mark.asyncio
+    async def test_reports_counts_and_samples(self, tmp_path):
+        workspace = _make_workspace(tmp_path)
+        with patch.object(server, "workspace_stats", WorkspaceStatsCache()):
+            result = await server._handle_get_workspace_info({"workspace_path": str(workspace)})
+
+        text = result[0].text
+        assert "📄 Python files: 2" in text
+        assert "🎬 Video files: 1" in text
+        assert "4 files in 3 directories" in text
+        assert "  - Intro.mp4" in text